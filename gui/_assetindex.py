@@ -0,0 +1,106 @@
+import os
+import time
+import urllib.parse
+
+class AssetIndex:
+    # file names in and around a bundle, so resolving an asset src is a dict lookup instead of probing the disk
+    # results (including misses) are cached, everything is rebuilt when one of the scanned folders changes
+    REFRESH_INTERVAL = 1.0 # seconds between folder mtime checks
+    MAX_DEPTH = 3 # how deep the recursive fallback looks inside the bundle
+
+    def __init__(self, path):
+        self.path = path
+        self._checked = 0.0
+        self.build()
+
+    def build(self):
+        parent = os.path.dirname(self.path)
+        assets = os.path.join(self.path, "assets")
+        parent_assets = os.path.join(parent, "assets")
+        self._mtimes = {} # folder -> mtime when it was scanned, None if it didn't exist
+        self._resolved = {} # src -> path or None
+
+        listings = {folder: self.scan(folder) for folder in (assets, self.path, parent, parent_assets)}
+        # same search order the old probes used: exact names first, then case-insensitive
+        self._exact = [listings[folder] for folder in (assets, self.path, parent, parent_assets)]
+        self._lowered = [{name.lower(): filepath for name, filepath in reversed(list(listings[folder].items()))}
+                         for folder in (assets, parent_assets, self.path, parent)]
+
+        # every file under the bundle by relative path, and by lowercased name for the last resort lookup
+        self._relpaths = {}
+        self._recursive = {}
+        if os.path.isdir(self.path):
+            for folder, dirs, files in os.walk(self.path):
+                depth = os.path.relpath(folder, self.path).count(os.sep) + (folder != self.path)
+                if depth >= self.MAX_DEPTH:
+                    dirs[:] = []
+                self._mtimes[folder] = self.mtime(folder)
+                for name in files:
+                    filepath = os.path.join(folder, name)
+                    self._relpaths[os.path.normpath(os.path.relpath(filepath, self.path))] = filepath
+                    self._recursive.setdefault(name.lower(), filepath)
+        self._checked = time.monotonic()
+
+    def scan(self, folder):
+        self._mtimes[folder] = self.mtime(folder)
+        files = {}
+        if os.path.isdir(folder):
+            with os.scandir(folder) as it:
+                for entry in it:
+                    if entry.is_file():
+                        files[entry.name] = entry.path
+        return files
+
+    def mtime(self, folder):
+        try:
+            return os.stat(folder).st_mtime_ns
+        except OSError:
+            return None
+
+    def refresh(self):
+        # throttled, so a render asking for hundreds of assets costs one round of stats at most
+        now = time.monotonic()
+        if now - self._checked < self.REFRESH_INTERVAL:
+            return
+        self._checked = now
+        for folder, mtime in self._mtimes.items():
+            if self.mtime(folder) != mtime:
+                self.build()
+                return
+
+    def invalidate(self):
+        # something outside changed the folders (see the bundle watcher), rescan on the next lookup
+        self._checked = 0.0
+        self._mtimes = {folder: -1 for folder in self._mtimes}
+
+    def find(self, src_path):
+        self.refresh()
+        if src_path not in self._resolved:
+            self._resolved[src_path] = self.lookup(src_path)
+        return self._resolved[src_path]
+
+    def lookup(self, src_path):
+        src_path = urllib.parse.unquote(src_path)
+
+        if os.path.isabs(src_path):
+            if os.path.exists(src_path):
+                return src_path
+        else:
+            relpath = os.path.normpath(src_path)
+            if relpath in self._relpaths:
+                return self._relpaths[relpath]
+            if relpath.startswith(os.pardir):
+                # outside the bundle, not indexed
+                candidate = os.path.join(self.path, relpath)
+                if os.path.exists(candidate):
+                    return candidate
+
+        filename = os.path.basename(src_path)
+        for files in self._exact:
+            if filename in files:
+                return files[filename]
+        lowered = filename.lower()
+        for files in self._lowered:
+            if lowered in files:
+                return files[lowered]
+        return self._recursive.get(lowered)
@@ -1,24 +1,38 @@
 import sys
-from PySide6.QtGui import QImage, QPixmap
+from PySide6.QtCore import QSize
+from PySide6.QtGui import QImage, QImageReader, QPixmap
 import os
 
+from ._assetindex import AssetIndex
+from ._pixmapcache import PixmapCache
+
 class Assets:
-    def __init__(self):
+    # longest side of a decoded preview image, bigger assets are scaled down while decoding
+    PREVIEW_MAX_SIZE = 2048
+
+    def __init__(self, diskcache=None, cachedImages=None):
         self.cafilepath = ""
-        self.cachedImages = {}
+        self.cachedImages = cachedImages if cachedImages is not None else PixmapCache()
+        self.level = 0 # mip level matching the current view scale, see PixmapCache.levelForScale
         self.missing_assets = set()
+        self.diskcache = diskcache # ImageCache, decoded images survive reopening the bundle/app
+        self.assetIndex = None # AssetIndex of cafilepath, built on the first lookup
+        self.appPaths = {} # src -> path (or None) for srcs that may be files shipped with the app
 
         if hasattr(sys, '_MEIPASS'):
             self.app_base_path = sys._MEIPASS
         else:
             self.app_base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
 
-    def loadImage(self, src_path):
+    def loadImage(self, src_path, level=None):
         if not src_path:
             return None
+        if level is None:
+            level = self.level
         
-        if src_path in self.cachedImages:
-            return self.cachedImages[src_path]
+        pixmap = self.cachedImages.get(src_path, level)
+        if pixmap is not None:
+            return pixmap
         
         asset_path = self.findAssetPath(src_path)
 
@@ -32,108 +46,73 @@ class Assets:
             return None
         
         try:
-            img = QImage(asset_path)
+            img = self.decodeImage(asset_path, PixmapCache.levelScale(level))
             if img.isNull():
                 print(f"Failed to load image: {asset_path}")
                 return None
             
             pixmap = QPixmap.fromImage(img)
-            self.cachedImages[src_path] = pixmap
+            self.cachedImages.put(src_path, level, pixmap)
             print(f"Loaded image successfully: {asset_path}")
             return pixmap
         except Exception as e:
             print(f"Error loading image {asset_path}: {e}")
             return None
 
+    def decodeImage(self, asset_path, scale=1.0):
+        # preview sized QImage, straight from the disk cache when this version of the file was decoded before
+        # thread safe, ImageLoader calls it from the pool and hands the image to the gui thread as is
+        if self.diskcache is not None:
+            img = self.diskcache.load(asset_path, scale)
+            if img is not None:
+                return img
+
+        reader = QImageReader(asset_path)
+        size = self.previewSize(reader.size(), scale)
+        if size is not None:
+            # decoders like jpeg can skip most of the work when asked for a smaller image
+            reader.setScaledSize(size)
+        img = reader.read()
+        if not img.isNull() and self.diskcache is not None:
+            self.diskcache.store(asset_path, scale, img)
+        return img
+
+    def previewSize(self, size, scale=1.0):
+        # None when the image can be decoded at its own size
+        if not size.isValid():
+            return None
+        factor = min(scale, self.PREVIEW_MAX_SIZE / max(size.width(), size.height(), 1))
+        if factor >= 1:
+            return None
+        return QSize(max(1, round(size.width() * factor)), max(1, round(size.height() * factor)))
+
     def findAssetPath(self, src_path):
         if not src_path:
             return None
         
         if src_path.startswith("themes/") or src_path.startswith("icons/") or src_path.startswith("assets/"):
-            app_level_path = os.path.join(self.app_base_path, src_path)
-            if os.path.exists(app_level_path):
-                return app_level_path
-            
-            bundled_assets_path = os.path.join(self.app_base_path, "assets", src_path)
-            if os.path.exists(bundled_assets_path):
-                 return bundled_assets_path
+            # app files don't change while running, so these are only probed once per src
+            if src_path not in self.appPaths:
+                self.appPaths[src_path] = self.findAppPath(src_path)
+            if self.appPaths[src_path]:
+                return self.appPaths[src_path]
 
-            if src_path.startswith(":/"):
-                 return src_path
-            
         if not self.cafilepath:
             return None
-            
-        try:
-            import urllib.parse
-            decoded_path = urllib.parse.unquote(src_path)
-            if decoded_path != src_path:
-                src_path = decoded_path
-        except:
-            pass
-        
-        if os.path.isabs(src_path) and os.path.exists(src_path):
+
+        if self.assetIndex is None or self.assetIndex.path != self.cafilepath:
+            self.assetIndex = AssetIndex(self.cafilepath)
+        return self.assetIndex.find(src_path)
+
+    def findAppPath(self, src_path):
+        app_level_path = os.path.join(self.app_base_path, src_path)
+        if os.path.exists(app_level_path):
+            return app_level_path
+
+        bundled_assets_path = os.path.join(self.app_base_path, "assets", src_path)
+        if os.path.exists(bundled_assets_path):
+            return bundled_assets_path
+
+        if src_path.startswith(":/"):
             return src_path
-        
-        base_path = os.path.join(self.cafilepath, src_path)
-        if os.path.exists(base_path):
-            return base_path
-        
-        assets_path = os.path.join(self.cafilepath, "assets", os.path.basename(src_path))
-        if os.path.exists(assets_path):
-            return assets_path
-        
-        direct_path = os.path.join(self.cafilepath, os.path.basename(src_path))
-        if os.path.exists(direct_path):
-            return direct_path
-        
-        parent_path = os.path.join(os.path.dirname(self.cafilepath), os.path.basename(src_path))
-        if os.path.exists(parent_path):
-            return parent_path
-        
-        parent_assets_path = os.path.join(os.path.dirname(self.cafilepath), "assets", os.path.basename(src_path))
-        if os.path.exists(parent_assets_path):
-            return parent_assets_path
-        
-        filename = os.path.basename(src_path)
-        assets_dir = os.path.join(self.cafilepath, "assets")
-        if os.path.exists(assets_dir) and os.path.isdir(assets_dir):
-            for file in os.listdir(assets_dir):
-                if file.lower() == filename.lower():
-                    return os.path.join(assets_dir, file)
-                
-        parent_assets_dir = os.path.join(os.path.dirname(self.cafilepath), "assets")
-        if os.path.exists(parent_assets_dir) and os.path.isdir(parent_assets_dir):
-            for file in os.listdir(parent_assets_dir):
-                if file.lower() == filename.lower():
-                    return os.path.join(parent_assets_dir, file)
-                
-        if os.path.isdir(self.cafilepath):
-            for file in os.listdir(self.cafilepath):
-                if os.path.isfile(os.path.join(self.cafilepath, file)) and file.lower() == filename.lower():
-                    return os.path.join(self.cafilepath, file)
-                
-        parent_dir = os.path.dirname(self.cafilepath)
-        if os.path.exists(parent_dir) and os.path.isdir(parent_dir):
-            for file in os.listdir(parent_dir):
-                if os.path.isfile(os.path.join(parent_dir, file)) and file.lower() == filename.lower():
-                    return os.path.join(parent_dir, file)
-        
-        return self.findAssetRecursive(self.cafilepath, filename, max_depth=3)
-    
-    def findAssetRecursive(self, directory, filename, max_depth=3, current_depth=0):
-        if current_depth > max_depth or not os.path.exists(directory) or not os.path.isdir(directory):
-            return None
-        
-        for file in os.listdir(directory):
-            full_path = os.path.join(directory, file)
-            
-            if os.path.isfile(full_path) and file.lower() == filename.lower():
-                return full_path
-            
-            if os.path.isdir(full_path):
-                result = self.findAssetRecursive(full_path, filename, max_depth, current_depth + 1)
-                if result:
-                    return result
-        
-        return None
\ No newline at end of file
+        return None
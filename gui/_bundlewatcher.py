@@ -0,0 +1,106 @@
+import os
+
+from PySide6.QtCore import QObject, QFileSystemWatcher, QTimer, Signal
+
+class BundleWatcher(QObject):
+    # watches the open bundle for changes made by other programs (re-exported assets, a caml edited by hand)
+    # bursts of events are batched, an export rewriting fifty frames ends up as one assetsChanged
+    assetsChanged = Signal(list) # absolute paths of asset files that were added, modified or removed
+    camlChanged = Signal(str) # the caml (or index.xml) of the bundle
+    DELAY = 250 # ms to wait for the burst to end
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self.onFileChanged)
+        self.watcher.directoryChanged.connect(self.onDirectoryChanged)
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(self.DELAY)
+        self.timer.timeout.connect(self.flush)
+        self.path = None
+        self.assetspath = None
+        self.documents = set() # caml + index.xml
+        self.snapshots = {} # folder -> {name: (size, mtime)}, directoryChanged doesn't say what changed
+        self.changed = set()
+
+    def watch(self, path, camlname):
+        self.stop()
+        self.path = os.path.abspath(path)
+        self.assetspath = os.path.join(self.path, "assets")
+        self.documents = {os.path.join(self.path, camlname), os.path.join(self.path, "index.xml")}
+        files = [filepath for filepath in self.documents if os.path.isfile(filepath)]
+        for folder in (self.path, self.assetspath):
+            if os.path.isdir(folder):
+                self.snapshots[folder] = self.snapshot(folder)
+                self.watcher.addPath(folder)
+        # the folder only reports added/removed/renamed files, files overwritten in place need their own watch
+        files += [os.path.join(self.assetspath, name) for name in self.snapshots.get(self.assetspath, {})]
+        if files:
+            self.watcher.addPaths(files)
+
+    def stop(self):
+        self.timer.stop()
+        for paths in (self.watcher.files(), self.watcher.directories()):
+            if paths:
+                self.watcher.removePaths(paths)
+        self.path = None
+        self.assetspath = None
+        self.documents = set()
+        self.snapshots = {}
+        self.changed = set()
+
+    def snapshot(self, folder):
+        files = {}
+        try:
+            with os.scandir(folder) as it:
+                for entry in it:
+                    if entry.is_file():
+                        st = entry.stat()
+                        files[entry.name] = (st.st_size, st.st_mtime_ns)
+        except OSError:
+            pass
+        return files
+
+    def onFileChanged(self, path):
+        self.changed.add(os.path.abspath(path))
+        self.timer.start()
+
+    def onDirectoryChanged(self, folder):
+        folder = os.path.abspath(folder)
+        if folder == self.path and not os.path.isdir(self.assetspath) and self.assetspath in self.snapshots:
+            # the whole assets folder went away
+            self.changed.update(os.path.join(self.assetspath, name) for name in self.snapshots.pop(self.assetspath))
+        elif folder == self.path and os.path.isdir(self.assetspath) and self.assetspath not in self.snapshots:
+            # assets folder (re)created
+            self.snapshots[self.assetspath] = {}
+            self.watcher.addPath(self.assetspath)
+            self.onDirectoryChanged(self.assetspath)
+
+        old = self.snapshots.get(folder)
+        if old is None:
+            return
+        new = self.snapshot(folder)
+        for name in old.keys() | new.keys():
+            if old.get(name) != new.get(name):
+                self.changed.add(os.path.join(folder, name))
+        self.snapshots[folder] = new
+        self.timer.start()
+
+    def flush(self):
+        changed, self.changed = self.changed, set()
+        # files replaced by a rename (most editors and exporters save that way) drop out of the watch list
+        watched = set(self.watcher.files())
+        readd = [filepath for filepath in changed
+                 if filepath not in watched and os.path.isfile(filepath)
+                 and (filepath in self.documents or os.path.dirname(filepath) == self.assetspath)]
+        if readd:
+            self.watcher.addPaths(readd)
+
+        assets = sorted(filepath for filepath in changed if os.path.dirname(filepath) == self.assetspath)
+        if assets:
+            self.assetsChanged.emit(assets)
+        for filepath in sorted(changed & self.documents):
+            if os.path.isfile(filepath):
+                self.camlChanged.emit(filepath)
+                break
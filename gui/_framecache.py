@@ -0,0 +1,80 @@
+import hashlib
+import math
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+
+from lib.ca_elements.animation import CAAnimationEvaluator
+
+class FrameCache:
+    # evaluated animation values per frame ({layer id: {keyPath: value}}), so scrubbing back and forth
+    # and every loop after the first while playing is a lookup instead of interpolating again
+    # frames are keyed by a hash of the animations' content, edits that don't touch animations keep them
+    FPS = 60
+    MAX_FRAMES = 3600
+
+    def __init__(self, fps=FPS, max_frames=MAX_FRAMES):
+        self.fps = fps
+        self.max_frames = max_frames
+        self.evaluator = CAAnimationEvaluator()
+        self.key = None
+        self._frames = OrderedDict() # (key, fps, frame number) -> snapshot
+
+    def setdocument(self, rootlayer, state=None, transition=None):
+        # the layer tree's animations plus the ones the previewed state adds, and the springs of a previewed
+        # transition as (target id, animation, keyPath, fromValue, toValue)
+        # returns False when those are the same as last time (the cached frames stay valid)
+        animations = [] # (target id, animation, keyPath, fromValue, toValue)
+        stack = [rootlayer]
+        while stack:
+            layer = stack.pop()
+            for animation in getattr(layer, 'animations', None) or []:
+                animations.append((layer.id, animation, None, None, None))
+            stack.extend(layer.sublayers[id] for id in reversed(layer._sublayerorder) if id in layer.sublayers)
+        for element in getattr(state, 'elements', None) or []:
+            if element.__class__.__name__ == "LKStateAddAnimation":
+                for animation in element.animations:
+                    animations.append((element.targetId, animation, element.keyPath, None, None))
+        animations.extend(transition or [])
+
+        digest = hashlib.sha1()
+        for target, animation, keyPath, fromValue, toValue in animations:
+            digest.update(f"{target}|{keyPath}|{fromValue!r}|{toValue!r}|".encode("utf-8"))
+            digest.update(ET.tostring(animation.create()))
+        key = digest.hexdigest()
+        if key == self.key:
+            return False
+
+        self.key = key
+        self.evaluator = CAAnimationEvaluator()
+        for target, animation, keyPath, fromValue, toValue in animations:
+            self.evaluator.add(target, animation, keyPath, fromValue, toValue)
+        return True
+
+    def frame(self, t):
+        return max(0, int(round(t * self.fps)))
+
+    def snapshot(self, t):
+        # values at the frame nearest to t, the returned dict is shared and must not be changed
+        key = (self.key, self.fps, self.frame(t))
+        if key in self._frames:
+            self._frames.move_to_end(key)
+            return self._frames[key]
+        snapshot = self.evaluator.evaluate(key[2] / self.fps)
+        self._frames[key] = snapshot
+        if len(self._frames) > self.max_frames:
+            self._frames.popitem(last=False)
+        return snapshot
+
+    def length(self):
+        # seconds the timeline should cover, animations repeating forever count with one iteration
+        ends = []
+        for _, track in self.evaluator.tracks:
+            timing = track.timing
+            end = timing.end()
+            if math.isinf(end):
+                end = timing.beginTime + timing.duration / (abs(timing.speed) or 1.0)
+            ends.append(end)
+        return max(ends, default=0.0)
+
+    def clear(self):
+        self._frames.clear()
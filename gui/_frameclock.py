@@ -0,0 +1,87 @@
+from PySide6.QtCore import QObject, QTimer, QElapsedTimer, Qt, Signal
+
+class FrameClock(QObject):
+    # one timer for the whole preview, every tick the clock time is handed to all drivers in one go
+    # (instead of every animation running, and drifting on, a timer of its own)
+    # time is in seconds, it only moves while playing and can be set directly for scrubbing
+    ticked = Signal(float) # clock time, emitted after the drivers ran
+    INTERVAL = 16 # ms, ~60 fps
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.setInterval(self.INTERVAL)
+        self.timer.timeout.connect(self.tick)
+        self.elapsed = QElapsedTimer()
+        self.time = 0.0
+        self.speed = 1.0
+        self.until = None # playback pauses when it gets here, see play()
+        self.drivers = [] # callables taking the clock time
+        self._base = 0.0 # clock time when elapsed was last restarted
+
+    def addDriver(self, driver):
+        if driver not in self.drivers:
+            self.drivers.append(driver)
+
+    def removeDriver(self, driver):
+        if driver in self.drivers:
+            self.drivers.remove(driver)
+
+    def isPlaying(self):
+        return self.timer.isActive()
+
+    def current(self):
+        if not self.isPlaying():
+            return self.time
+        return max(0.0, self._base + self.elapsed.nsecsElapsed() / 1e9 * self.speed)
+
+    def play(self, until=None):
+        # until: pause exactly at that time instead of running on
+        self.until = until
+        if self.isPlaying():
+            return
+        self._base = self.time
+        self.elapsed.start()
+        self.timer.start()
+
+    def pause(self):
+        if self.isPlaying():
+            self.time = self.current()
+            self.timer.stop()
+        self.until = None
+        self.apply()
+
+    def pauseAt(self, t):
+        # stop and show time t
+        self.timer.stop()
+        self.until = None
+        self.seek(t)
+
+    def seek(self, t):
+        self.time = max(0.0, t)
+        if self.isPlaying():
+            self._base = self.time
+            self.elapsed.restart()
+        self.apply()
+
+    def setSpeed(self, speed):
+        if self.isPlaying():
+            # continue from where we are now, at the new rate
+            self._base = self.current()
+            self.elapsed.restart()
+        self.speed = speed
+
+    def tick(self):
+        t = self.current()
+        if self.until is not None and (t - self.until) * self.speed >= 0:
+            t = self.until
+            self.timer.stop()
+            self.until = None
+        self.time = t
+        self.apply()
+
+    def apply(self):
+        for driver in list(self.drivers):
+            driver(self.time)
+        self.ticked.emit(self.time)
@@ -0,0 +1,51 @@
+class FrameSequence:
+    # the CGImage frames of one contents animation (what micasa's exportAsAnimation writes) as a ring buffer:
+    # the frame on screen and the next `ahead` ones are decoded in the background, the rest is dropped again,
+    # so a sequence never holds more than ahead + 1 pixmaps however long it is
+    # frames stay out of the PixmapCache, a sequence going round would push every still image out of it
+    AHEAD = 12
+
+    def __init__(self, srcs, request, level=0, ahead=AHEAD):
+        self.srcs = srcs # in frame order, a src can show up more than once
+        self.request = request # request(src, level) -> False if the asset can't be found, the pixmap comes back through store()
+        self.level = level
+        self.ahead = max(0, ahead)
+        self.size = None # (width, height) of a frame at level 0, known after the first decode
+        self.current = None # src of the frame on screen, None while the layer shows its own contents
+        self.frames = {} # src -> QPixmap, only for the window
+        self.window = set()
+        self.missing = set()
+        self._positions = {}
+        for position, src in enumerate(srcs):
+            self._positions.setdefault(src, position)
+
+    def show(self, src):
+        # the pixmap of frame src, None while it is still being decoded (the last one should stay up then)
+        # moves the window to src and queues whatever in it isn't decoded yet
+        self.current = src
+        position = self._positions.get(src, 0)
+        count = len(self.srcs)
+        window = [self.srcs[(position + i) % count] for i in range(min(self.ahead + 1, count))]
+        self.window = set(window)
+        for old in [old for old in self.frames if old not in self.window]:
+            del self.frames[old]
+        for wanted in window:
+            if wanted not in self.frames and wanted not in self.missing:
+                if not self.request(wanted, self.level):
+                    self.missing.add(wanted)
+        return self.frames.get(src)
+
+    def store(self, src, level, pixmap):
+        # False when the frame isn't wanted anymore (the window moved on, or the level changed)
+        if level != self.level or src not in self.window:
+            return False
+        self.frames[src] = pixmap
+        return True
+
+    def setlevel(self, level):
+        if level == self.level:
+            return
+        self.level = level
+        self.frames.clear()
+        if self.current is not None:
+            self.show(self.current)
@@ -0,0 +1,134 @@
+import hashlib
+import os
+import struct
+import threading
+
+from PySide6.QtGui import QImage
+
+class ImageCache:
+    # decoded, preview sized images kept on disk as raw ARGB32 pixels so reopening a bundle skips decoding
+    # entries are keyed by source path + mtime + size + scale, so an edited asset just gets a new entry
+    # the least recently used entries are deleted once the folder grows past max_bytes
+    # safe to use from the decoding threads, the size bookkeeping is behind a lock
+    HEADER = struct.Struct("<4sIII") # magic, width, height, bytes per line
+    MAGIC = b"OPIC"
+    FORMAT = QImage.Format_ARGB32_Premultiplied
+
+    def __init__(self, directory, max_bytes=512 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.RLock()
+        os.makedirs(self.directory, exist_ok=True)
+        self._total = sum(entry.stat().st_size for entry in os.scandir(self.directory) if entry.is_file() and entry.name.endswith(".raw"))
+
+    def key(self, path, scale):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        ident = f"{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}|{scale:g}"
+        return hashlib.sha1(ident.encode("utf-8")).hexdigest()
+
+    def entrypath(self, key):
+        return os.path.join(self.directory, key + ".raw")
+
+    def load(self, path, scale=1.0):
+        # QImage read straight into its own pixel buffer, so it can be handed to any thread as is
+        # None when there is no entry for this version of the file
+        key = self.key(path, scale)
+        if key is None:
+            return None
+        entry = self.entrypath(key)
+        try:
+            with open(entry, "rb") as f:
+                image = self.imagefrom(f)
+        except OSError:
+            return None
+        if image is None:
+            with self._lock:
+                self.remove(key)
+            return None
+
+        # mtime doubles as the last use time for eviction
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        return image
+
+    def imagefrom(self, f):
+        header = f.read(self.HEADER.size)
+        if len(header) < self.HEADER.size:
+            return None
+        magic, width, height, bpl = self.HEADER.unpack(header)
+        if magic != self.MAGIC:
+            return None
+        image = QImage(width, height, self.FORMAT)
+        if image.isNull() or image.bytesPerLine() != bpl:
+            return None
+        if f.readinto(image.bits()) != bpl * height:
+            return None
+        return image
+
+    def store(self, path, scale, image):
+        key = self.key(path, scale)
+        if key is None or image.isNull():
+            return
+        if image.format() != self.FORMAT:
+            image = image.convertToFormat(self.FORMAT)
+
+        entry = self.entrypath(key)
+        # per process and thread, two decoders (or two headless render jobs) can store the same file
+        tmp = f"{entry}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(self.HEADER.pack(self.MAGIC, image.width(), image.height(), image.bytesPerLine()))
+                f.write(image.constBits()[:image.bytesPerLine() * image.height()])
+            os.replace(tmp, entry)
+        except OSError as e:
+            print(f"Could not write image cache entry for {path}: {e}")
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return
+        with self._lock:
+            self._total += os.path.getsize(entry)
+            if self._total > self.max_bytes:
+                self.evict()
+
+    def evict(self):
+        # oldest first until we're back under 90% of the cap, so every store doesn't evict again
+        # called with the lock held
+        entries = []
+        # only finished entries, a .tmp is another decoder's store still being written
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(".raw"):
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.name[:-len(".raw")]))
+        entries.sort()
+        self._total = sum(size for _, size, _ in entries)
+        for _, _, key in entries:
+            if self._total <= self.max_bytes * 0.9:
+                break
+            self.remove(key)
+
+    def remove(self, key):
+        filepath = self.entrypath(key)
+        try:
+            size = os.path.getsize(filepath)
+            os.remove(filepath)
+            self._total -= size
+        except OSError:
+            pass
+
+    def clear(self):
+        with self._lock:
+            for entry in os.scandir(self.directory):
+                if entry.is_file() and entry.name.endswith(".raw"):
+                    try:
+                        os.remove(entry.path)
+                    except OSError:
+                        pass
+            self._total = 0
@@ -0,0 +1,78 @@
+import os
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+from PySide6.QtGui import QImage
+
+from ._pixmapcache import PixmapCache
+
+class DecodeTask(QRunnable):
+    def __init__(self, loader, src, level, asset_path, generation):
+        super().__init__()
+        self.loader = loader
+        self.src = src
+        self.level = level
+        self.asset_path = asset_path
+        self.generation = generation
+
+    def run(self):
+        # QImage (unlike QPixmap) can be created off the gui thread
+        try:
+            img = self.loader.assets.decodeImage(self.asset_path, PixmapCache.levelScale(self.level))
+        except Exception as e:
+            print(f"Error loading image {self.asset_path}: {e}")
+            img = QImage()
+        try:
+            self.loader._done.emit(self.src, self.level, img, self.generation)
+        except RuntimeError:
+            pass # the loader was deleted while this was decoding (window closed, app quitting)
+
+class ImageLoader(QObject):
+    # decodes assets on a thread pool, decoded(src, level, image) is emitted on the gui thread
+    # a null image means the file couldn't be decoded
+    decoded = Signal(str, int, QImage)
+    _done = Signal(str, int, QImage, int)
+
+    def __init__(self, assets):
+        super().__init__()
+        self.assets = assets
+        # a pool of its own, reset() clears every queued task in it and must not drop another loader's
+        self.pool = QThreadPool(self)
+        self.pending = set() # (src, level) queued or decoding
+        self.generation = 0 # bumped by reset(), results from before that are dropped
+        self._done.connect(self._finished)
+
+    def request(self, src, level):
+        # False when the asset can't be found (it is added to missing_assets), True once a decode is queued
+        if (src, level) in self.pending:
+            return True
+        asset_path = self.assets.findAssetPath(src)
+        if not asset_path or not os.path.exists(asset_path):
+            print(f"Could not find asset: {src}")
+            self.assets.missing_assets.add(src)
+            return False
+        self.pending.add((src, level))
+        self.pool.start(DecodeTask(self, src, level, asset_path, self.generation))
+        return True
+
+    def reload(self, src, level):
+        # the file changed on disk, decode it again even if a decode of the old version is still queued
+        self.pending.discard((src, level))
+        return self.request(src, level)
+
+    def prefetch(self, srcs, level):
+        # queue everything that isn't decoded yet, so it is (mostly) ready by the time the preview asks
+        for src in srcs:
+            if self.assets.cachedImages.get(src, level) is None and src not in self.assets.missing_assets:
+                self.request(src, level)
+
+    def reset(self):
+        # a different bundle is being opened, queued decodes of the old one aren't needed anymore
+        self.pool.clear()
+        self.pending.clear()
+        self.generation += 1
+
+    def _finished(self, src, level, image, generation):
+        if generation != self.generation:
+            return
+        self.pending.discard((src, level))
+        self.decoded.emit(src, level, image)
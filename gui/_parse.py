@@ -1,27 +1,65 @@
+from collections import OrderedDict
+
 from PySide6.QtGui import QTransform, QColor
 
 class Parse:
+    # parsed values are kept per input string, posters reuse the same few transforms/colors everywhere
+    CACHE_SIZE = 512
+
     def __init__(self):
-        pass
+        self._transforms = OrderedDict()
+        self._colors = OrderedDict()
+
+    def cached(self, cache, key, parse):
+        # small LRU, the oldest entry goes once CACHE_SIZE is reached
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+        value = parse(key)
+        cache[key] = value
+        if len(cache) > self.CACHE_SIZE:
+            cache.popitem(last=False)
+        return value
+
+    def numbers(self, value_str):
+        # "1 0 0 1 10 20" -> [1.0, 0.0, 0.0, 1.0, 10.0, 20.0], None if it isn't a list of numbers
+        try:
+            return [float(part) for part in value_str.split()]
+        except ValueError:
+            return None
 
     # TRANSFORMS
     def parseTransform(self, transform_str) -> QTransform:
-        transform = QTransform()
         if not transform_str:
+            return QTransform()
+        # callers get their own copy, the cached one must never be modified
+        return QTransform(self.cached(self._transforms, transform_str, self._parseTransform))
+
+    def _parseTransform(self, transform_str) -> QTransform:
+        transform = QTransform()
+
+        matrix = self.numbers(transform_str)
+        if matrix is not None:
+            if len(matrix) == 6:
+                # "m11 m12 m21 m22 dx dy", what onItemMoved writes
+                return QTransform(*matrix)
+            if len(matrix) == 16:
+                # CATransform3D, only the 2d part can be shown in the preview
+                return QTransform(matrix[0], matrix[1], matrix[4], matrix[5], matrix[12], matrix[13])
             return transform
-            
+
         try:
             if "scale" in transform_str:
                 scale_parts = transform_str.split("scale(")[1].split(")")[0].split(",")
                 scale_x = float(scale_parts[0].strip())
                 scale_y = float(scale_parts[1].strip())
                 transform.scale(scale_x, scale_y)
-                
+
             if "rotate" in transform_str:
                 rotation_str = transform_str.split("rotate(")[1].split("deg")[0].strip()
                 rotation_angle = float(rotation_str)
                 transform.rotate(rotation_angle)
-                
+
             if "translate" in transform_str:
                 translate_parts = transform_str.split("translate(")[1].split(")")[0].split(",")
                 translate_x = float(translate_parts[0].strip())
@@ -29,18 +67,20 @@ class Parse:
                 transform.translate(translate_x, translate_y)
         except:
             pass
-            
+
         return transform
-    
+
     # COLORS
     def parseColor(self, color_str) -> QColor:
         if not color_str:
             return None
-            
+        return QColor(self.cached(self._colors, color_str, self._parseColor))
+
+    def _parseColor(self, color_str) -> QColor:
         try:
             if color_str.lower() in ["black", "white", "red", "green", "blue", "yellow"]:
                 return QColor(color_str)
-                
+
             if color_str.startswith("rgb("):
                 rgb = color_str.replace("rgb(", "").replace(")", "").split(",")
                 if len(rgb) >= 3:
@@ -48,7 +88,7 @@ class Parse:
                     g = int(rgb[1].strip())
                     b = int(rgb[2].strip())
                     return QColor(r, g, b)
-                    
+
             if color_str.startswith("rgba("):
                 rgba = color_str.replace("rgba(", "").replace(")", "").split(",")
                 if len(rgba) >= 4:
@@ -57,10 +97,22 @@ class Parse:
                     b = int(rgba[2].strip())
                     a = int(float(rgba[3].strip()) * 255)
                     return QColor(r, g, b, a)
-                    
+
             if color_str.startswith("#"):
                 return QColor(color_str)
+
+            # "r g b [a]", 0-1 floats from the color dialog/caml or 0-255 values like "255 255 255"
+            components = self.numbers(color_str)
+            if components is not None and len(components) in (3, 4):
+                rgb = components[:3]
+                scale = 255.0 if max(rgb) > 1 else 1.0
+                r, g, b = (min(max(c / scale, 0.0), 1.0) for c in rgb)
+                a = 1.0
+                if len(components) == 4:
+                    a = components[3] if components[3] <= 1 else components[3] / 255.0
+                    a = min(max(a, 0.0), 1.0)
+                return QColor.fromRgbF(r, g, b, a)
         except:
             pass
-            
-        return QColor(150, 150, 150, 100)
\ No newline at end of file
+
+        return QColor(150, 150, 150, 100)
@@ -0,0 +1,66 @@
+from collections import OrderedDict
+
+class PixmapCache:
+    # decoded pixmaps by (src, level), level n is the preview image scaled by 1/2**n
+    # least recently used pixmaps are dropped once their total size passes max_bytes
+    # (items in the scene keep their own reference, so this bounds what the cache holds on to, not the scene)
+    MAX_LEVEL = 3
+
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.used = 0
+        self._pixmaps = OrderedDict() # (src, level) -> QPixmap
+        self._levels = {} # src -> set of levels cached for it
+
+    @classmethod
+    def levelForScale(cls, scale):
+        # smallest image that still has at least one pixel per device pixel at this view scale
+        level = 0
+        while level < cls.MAX_LEVEL and scale <= 0.5 ** (level + 1):
+            level += 1
+        return level
+
+    @staticmethod
+    def levelScale(level):
+        return 0.5 ** level
+
+    def cost(self, pixmap):
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+    def get(self, src, level=0):
+        key = (src, level)
+        if key not in self._pixmaps:
+            return None
+        self._pixmaps.move_to_end(key)
+        return self._pixmaps[key]
+
+    def put(self, src, level, pixmap):
+        key = (src, level)
+        if key in self._pixmaps:
+            self.used -= self.cost(self._pixmaps.pop(key))
+        self._pixmaps[key] = pixmap
+        self._levels.setdefault(src, set()).add(level)
+        self.used += self.cost(pixmap)
+        # always keep the newest one, even if it alone is over budget
+        while self.used > self.max_bytes and len(self._pixmaps) > 1:
+            (oldsrc, oldlevel), old = self._pixmaps.popitem(last=False)
+            self.used -= self.cost(old)
+            self._levels[oldsrc].discard(oldlevel)
+            if not self._levels[oldsrc]:
+                del self._levels[oldsrc]
+
+    def remove(self, src):
+        # every level of one asset
+        for level in self._levels.pop(src, ()):
+            self.used -= self.cost(self._pixmaps.pop((src, level)))
+
+    def clear(self):
+        self._pixmaps.clear()
+        self._levels.clear()
+        self.used = 0
+
+    def __contains__(self, src):
+        return src in self._levels
+
+    def __len__(self):
+        return len(self._pixmaps)
@@ -37,7 +37,15 @@ class ConfigManager:
                 "exe_path": "",
                 "open_after_export": False
             },
-            "language": "en_US"
+            "language": "en_US",
+            "cache": {
+                "image_cache_mb": 512,
+                "pixmap_memory_mb": 256,
+                "sequence_frames_ahead": 12
+            },
+            "watch": {
+                "reload_caml": True
+            }
         }
         self.config: Dict[str, Any] = {}
         self.ensure_config_dir()
@@ -222,6 +230,45 @@ class ConfigManager:
         self.config["ui"]["filename_display_mode"] = value
         self.save_config()
 
+    def get_image_cache_dir(self) -> str:
+        return os.path.join(self.config_dir, "image-cache")
+
+    def get_image_cache_size_mb(self) -> int:
+        return self.config.get("cache", {}).get("image_cache_mb", 512)
+
+    def set_image_cache_size_mb(self, size_mb: int) -> None:
+        if "cache" not in self.config:
+            self.config["cache"] = {}
+        self.config["cache"]["image_cache_mb"] = size_mb
+        self.save_config()
+
+    def get_pixmap_memory_mb(self) -> int:
+        return self.config.get("cache", {}).get("pixmap_memory_mb", 256)
+
+    def set_pixmap_memory_mb(self, size_mb: int) -> None:
+        if "cache" not in self.config:
+            self.config["cache"] = {}
+        self.config["cache"]["pixmap_memory_mb"] = size_mb
+        self.save_config()
+
+    def get_sequence_frames_ahead(self) -> int:
+        return self.config.get("cache", {}).get("sequence_frames_ahead", 12)
+
+    def set_sequence_frames_ahead(self, frames: int) -> None:
+        if "cache" not in self.config:
+            self.config["cache"] = {}
+        self.config["cache"]["sequence_frames_ahead"] = frames
+        self.save_config()
+
+    def get_reload_caml_on_change(self) -> bool:
+        return self.config.get("watch", {}).get("reload_caml", True)
+
+    def set_reload_caml_on_change(self, enabled: bool) -> None:
+        if "watch" not in self.config:
+            self.config["watch"] = {}
+        self.config["watch"]["reload_caml"] = enabled
+        self.save_config()
+
     def get_config(self, key: str, default: Any = None) -> Any:
         return self.config.get(key, default)
 
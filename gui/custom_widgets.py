@@ -1,5 +1,5 @@
 from PySide6.QtCore import Qt, QPointF, QRectF, Signal, QObject, QTimer, QEvent
-from PySide6.QtGui import QColor, QPen, QBrush, QTransform, QCursor, QPainterPath, QPainter
+from PySide6.QtGui import QColor, QPen, QBrush, QTransform, QCursor, QPainterPath, QPainter, QPixmap
 from PySide6.QtWidgets import QGraphicsView, QGraphicsScene, QGraphicsRectItem, QGraphicsEllipseItem, QGraphicsItem, QGraphicsPathItem, QApplication, QStyleOptionGraphicsItem, QWidget, QGraphicsTextItem
 import math
 import platform
@@ -88,7 +88,7 @@ class EditableGraphicsItem(QObject):
             layer_id = self.item.data(0)
             main_window = next((w for w in QApplication.topLevelWidgets() if 'MainWindow' in str(type(w))), None)
             if main_window and hasattr(main_window, 'cafile'):
-                layer = main_window.cafile.rootlayer.findlayer(layer_id)
+                layer = main_window.cafile.findlayer(layer_id)
                 if layer and hasattr(layer, 'name'):
                     self.layerNameItem = QGraphicsTextItem(layer.name)
                     self.layerNameItem.setParentItem(self.item)
@@ -378,6 +378,7 @@ class CheckerboardGraphicsScene(QGraphicsScene):
         self.backgroundColor1 = QColor(200, 200, 200)
         self.backgroundColor2 = QColor(230, 230, 230)
         self.checkerboardSize = 20
+        self._checkerboard = None # (colors and size it was made for, texture brush)
         self.editMode = False
         self.currentEditableItem = None
         self.activeHandle = None
@@ -391,20 +392,27 @@ class CheckerboardGraphicsScene(QGraphicsScene):
         self.backgroundColor2 = color2
         self.update()
 
+    def checkerboardBrush(self):
+        """Texture brush with one 2x2 tile of the checkerboard, made again only when the colors or size change"""
+        key = (self.backgroundColor1.rgba(), self.backgroundColor2.rgba(), self.checkerboardSize)
+        if self._checkerboard is None or self._checkerboard[0] != key:
+            size = self.checkerboardSize
+            tile = QPixmap(size * 2, size * 2)
+            tile.fill(self.backgroundColor1)
+            tilePainter = QPainter(tile)
+            tilePainter.fillRect(0, 0, size, size, self.backgroundColor2)
+            tilePainter.fillRect(size, size, size, size, self.backgroundColor2)
+            tilePainter.end()
+            self._checkerboard = (key, QBrush(tile))
+        return self._checkerboard[1]
+
     def drawBackground(self, painter, rect):
         super(CheckerboardGraphicsScene, self).drawBackground(painter, rect)
         
+        # the painter is in scene coordinates, so the texture repeats from the scene origin like the squares should
         painter.save()
-        painter.fillRect(rect, self.backgroundColor1)
-        
-        left = int(rect.left()) - (int(rect.left()) % self.checkerboardSize)
-        top = int(rect.top()) - (int(rect.top()) % self.checkerboardSize)
-        
-        for x in range(left, int(rect.right()), self.checkerboardSize):
-            for y in range(top, int(rect.bottom()), self.checkerboardSize):
-                if (x // self.checkerboardSize + y // self.checkerboardSize) % 2 == 0:
-                    painter.fillRect(x, y, self.checkerboardSize, self.checkerboardSize, self.backgroundColor2)
-        
+        painter.setBrushOrigin(0, 0)
+        painter.fillRect(rect, self.checkerboardBrush())
         painter.restore()
     
     def setEditMode(self, enabled):
@@ -550,6 +558,9 @@ class CheckerboardGraphicsScene(QGraphicsScene):
         pass
 
 class CustomGraphicsView(QGraphicsView):
+    # new horizontal scale of the view, emitted after zooming
+    zoomChanged = Signal(float)
+
     def __init__(self, parent=None, min_zoom=0.05, max_zoom=10.0):
         super(CustomGraphicsView, self).__init__(parent)
         self.min_zoom = min_zoom
@@ -606,6 +617,7 @@ class CustomGraphicsView(QGraphicsView):
             self.scale(1.1, 1.1)
         else:
             self.scale(0.9, 0.9)
+        self.zoomChanged.emit(self.transform().m11())
 
     def mousePressEvent(self, event):
         if not self.editMode and event.button() == Qt.LeftButton:
@@ -674,6 +686,7 @@ class CustomGraphicsView(QGraphicsView):
                         scale_factor = new_scale / current_scale
                         if abs(scale_factor - 1.0) > 1e-9:
                             self.scale(scale_factor, scale_factor)
+                            self.zoomChanged.emit(self.transform().m11())
                 elif gesture.state() in [Qt.GestureFinished, Qt.GestureCanceled]:
                     self.gestureInProgress = False
         except Exception as e:
@@ -0,0 +1,187 @@
+import argparse
+import math
+import multiprocessing
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from PySide6.QtCore import QRectF, Qt
+from PySide6.QtGui import QImage, QPainter
+from PySide6.QtWidgets import QApplication, QGraphicsScene
+
+from lib.ca_elements.core import CAFile
+
+from ._assets import Assets
+from ._framecache import FrameCache
+from ._imagecache import ImageCache
+from ._parse import Parse
+from ._pixmapcache import PixmapCache
+from .config_manager import ConfigManager
+from .preview_renderer import PreviewRenderer
+
+class HeadlessRenderer:
+    # draws bundles the way the preview does, without a MainWindow
+    # it stands in for the window, so it has everything PreviewRenderer reads from one
+    def __init__(self, diskcache=None, scale=1.0):
+        self.scale = scale
+        self.scene = QGraphicsScene()
+        self._parse = Parse()
+        self.parseTransform = self._parse.parseTransform
+        self.parseColor = self._parse.parseColor
+        self.cachedImages = PixmapCache()
+        self.missing_assets = set()
+        self._assets = Assets(diskcache, self.cachedImages)
+        self._assets.missing_assets = self.missing_assets
+        self._assets.level = PixmapCache.levelForScale(scale)
+        self.loadImage = self._assets.loadImage
+        self.cafile = None
+        self.cafilepath = ""
+        self.preview = PreviewRenderer(self)
+        self.preview.sync_frames = True
+        self.preview.view_scale = scale
+        self.frameCache = FrameCache()
+
+    def open(self, path):
+        self.cafile = CAFile(path)
+        self.cafilepath = path
+        self._assets.cafilepath = path
+        self.cachedImages.clear()
+        self.missing_assets.clear()
+        # decoded up front (straight from the disk cache when possible), so render_layer never waits for the loader
+        for layer in self.cafile.layerindex.layers.values():
+            src = getattr(getattr(layer, 'content', None), 'src', None)
+            if getattr(layer, '_content', None) is not None and src:
+                self.loadImage(src)
+
+    def show_state(self, state_name=None):
+        # same steps as MainWindow.previewState
+        root = self.cafile.rootlayer
+        target_state = None
+        if state_name and state_name != 'Base State':
+            target_state = root.states.get(state_name)
+            if target_state is None:
+                raise ValueError(f"no state named {state_name!r}")
+        self.preview.render_preview(root, target_state)
+        # the document border is editor chrome, not part of the poster
+        for item in self.scene.items():
+            if item.data(1) != 'Layer':
+                item.hide()
+        self.frameCache.setdocument(root, target_state)
+        self.preview.set_tracks(self.frameCache.evaluator.tracks)
+
+    def duration(self):
+        # end of the longest animation, from the models' timing (see FrameCache.length)
+        return self.frameCache.length()
+
+    def seek(self, t):
+        # what MainWindow.driveAnimations does on every clock tick, no timers involved
+        self.preview.apply_snapshot(self.frameCache.snapshot(t))
+
+    def document_rect(self):
+        b = self.cafile.rootlayer.numbers('bounds')
+        return QRectF(0, 0, b[2], b[3]) if b and len(b) >= 4 else QRectF(0, 0, 1000, 1000)
+
+    def render_frame(self, image, source):
+        image.fill(Qt.transparent)
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        self.scene.render(painter, QRectF(image.rect()), source)
+        painter.end()
+
+    def render(self, path, out, state_name=None, start=0.0, end=None, fps=30.0):
+        # writes out/<bundle name>/frame_NNNNN.png, returns how many frames
+        self.open(path)
+        self.show_state(state_name)
+        self.frameCache.fps = fps
+        if end is None:
+            end = max(start, self.duration())
+        count = max(1, int(math.floor((end - start) * fps + 1e-9)) + 1)
+
+        name = os.path.splitext(os.path.basename(os.path.normpath(path)))[0]
+        folder = os.path.join(out, name)
+        os.makedirs(folder, exist_ok=True)
+
+        source = self.document_rect()
+        image = QImage(max(1, round(source.width() * self.scale)), max(1, round(source.height() * self.scale)),
+                       QImage.Format_ARGB32_Premultiplied)
+        previous = None
+        previous_path = None
+        for frame in range(count):
+            self.seek(start + frame / fps)
+            self.render_frame(image, source)
+            framepath = os.path.join(folder, f"frame_{frame:05d}.png")
+            if previous is not None and image == previous:
+                # nothing moved (static posters, finished animations), skip encoding the same png again
+                shutil.copyfile(previous_path, framepath)
+                continue
+            if not image.save(framepath, "PNG"):
+                raise OSError(f"could not write {framepath}")
+            previous = image.copy()
+            previous_path = framepath
+        return count
+
+_worker = None
+
+def _initworker(cache_dir, cache_bytes, scale):
+    # one QApplication + renderer per process, reused for every bundle the process gets
+    global _worker
+    app = QApplication.instance() or QApplication([sys.argv[0]])
+    diskcache = ImageCache(cache_dir, cache_bytes) if cache_dir else None
+    _worker = (app, HeadlessRenderer(diskcache, scale))
+
+def _renderjob(path, out, state_name, start, end, fps):
+    started = time.perf_counter()
+    try:
+        frames = _worker[1].render(path, out, state_name, start, end, fps)
+        return path, frames, time.perf_counter() - started, None
+    except Exception as e:
+        return path, 0, time.perf_counter() - started, str(e)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="render.py",
+                                     description="Render .ca bundles to PNG frames without opening the editor.")
+    parser.add_argument("bundles", nargs="+", help=".ca bundles to render")
+    parser.add_argument("-s", "--state", default=None, help="state to show (default: Base State)")
+    parser.add_argument("--start", type=float, default=0.0, help="first frame time in seconds")
+    parser.add_argument("--end", type=float, default=None, help="last frame time in seconds (default: end of the longest animation)")
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--scale", type=float, default=1.0, help="output size relative to the document bounds")
+    parser.add_argument("-o", "--out", default="frames", help="folder the frames are written to, one subfolder per bundle")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="bundles rendered in parallel, one process each")
+    parser.add_argument("--no-cache", action="store_true", help="don't read or fill the decoded image cache")
+    args = parser.parse_args(argv)
+    if args.fps <= 0:
+        parser.error("--fps must be positive")
+
+    cache_dir, cache_bytes = None, 0
+    if not args.no_cache:
+        # the same cache the editor uses, so posters it has shown are never decoded again (and vice versa)
+        config = ConfigManager()
+        cache_dir = config.get_image_cache_dir()
+        cache_bytes = config.get_image_cache_size_mb() * 1024 * 1024
+
+    initargs = (cache_dir, cache_bytes, args.scale)
+    jobargs = [(path, args.out, args.state, args.start, args.end, args.fps) for path in args.bundles]
+    jobs = max(1, min(args.jobs, len(jobargs)))
+    if jobs == 1:
+        _initworker(*initargs)
+        results = (_renderjob(*job) for job in jobargs)
+    else:
+        # spawn, qt doesn't survive a fork
+        pool = ProcessPoolExecutor(jobs, mp_context=multiprocessing.get_context("spawn"),
+                                   initializer=_initworker, initargs=initargs)
+        results = pool.map(_renderjob, *zip(*jobargs))
+
+    failed = 0
+    for path, frames, seconds, error in results:
+        if error:
+            failed += 1
+            print(f"{path}: {error}", file=sys.stderr)
+        else:
+            print(f"{path}: {frames} frames in {seconds:.2f}s")
+    if jobs > 1:
+        pool.shutdown()
+    return 1 if failed else 0
@@ -1,11 +1,11 @@
 import sys
 import os
 import math
-from lib.ca_elements.core import CAFile, CALayer
+from lib.ca_elements.core import CAFile, CALayer, CGImage
 from PySide6 import QtCore
 from PySide6.QtCore import Qt, QRectF, QPointF, QSize, QEvent, QVariantAnimation, QKeyCombination, QKeyCombination, QTimer, QSettings, QStandardPaths, QDir, QObject, QProcess, QByteArray, QBuffer, QIODevice, QXmlStreamReader, QPoint, QMimeData, QRegularExpression, QTranslator
 from PySide6.QtGui import QPixmap, QImage, QBrush, QPen, QColor, QTransform, QPainter, QLinearGradient, QIcon, QPalette, QFont, QShortcut, QKeySequence, QAction, QCursor, QDesktopServices
-from PySide6.QtWidgets import QFileDialog, QTreeWidgetItem, QMainWindow, QTableWidgetItem, QGraphicsRectItem, QGraphicsPixmapItem, QGraphicsTextItem, QApplication, QHeaderView, QPushButton, QHBoxLayout, QVBoxLayout, QLabel, QTreeWidget, QWidget, QGraphicsItemAnimation, QMessageBox, QDialog, QColorDialog, QProgressDialog, QSizePolicy, QSplitter, QFrame, QToolButton, QGraphicsView, QGraphicsScene, QStyleFactory, QSpacerItem, QMenu, QLineEdit, QTableWidget, QTableWidgetItem, QSystemTrayIcon, QGraphicsProxyWidget, QGraphicsDropShadowEffect, QMenu, QTreeWidgetItemIterator, QInputDialog, QSlider, QTextEdit
+from PySide6.QtWidgets import QFileDialog, QTreeWidgetItem, QMainWindow, QTableWidgetItem, QGraphicsRectItem, QGraphicsPixmapItem, QGraphicsTextItem, QApplication, QHeaderView, QPushButton, QHBoxLayout, QVBoxLayout, QLabel, QTreeWidget, QWidget, QGraphicsItemAnimation, QMessageBox, QDialog, QColorDialog, QProgressDialog, QSizePolicy, QSplitter, QFrame, QToolButton, QGraphicsView, QGraphicsScene, QStyleFactory, QSpacerItem, QMenu, QLineEdit, QTableWidget, QTableWidgetItem, QSystemTrayIcon, QGraphicsProxyWidget, QGraphicsDropShadowEffect, QMenu, QTreeWidgetItemIterator, QInputDialog, QSlider, QTextEdit, QComboBox
 from ui.ui_mainwindow import Ui_OpenPoster
 from .custom_widgets import CustomGraphicsView, CheckerboardGraphicsScene
 import PySide6.QtCore as QtCore
@@ -21,8 +21,12 @@ from gui._meta import __version__
 # temporary code split for reading
 from ._formatter import Format
 from ._parse import Parse
-from ._applyanimation import ApplyAnimation
+from ._imagecache import ImageCache
+from ._pixmapcache import PixmapCache
 from ._assets import Assets
+from ._bundlewatcher import BundleWatcher
+from ._frameclock import FrameClock
+from ._framecache import FrameCache
 
 from .config_manager import ConfigManager
 from .settings_window import SettingsDialog
@@ -43,7 +47,6 @@ class MainWindow(QMainWindow):
         self._clear_nugget_exports_cache()
 
         self.animations_playing = False # Initialize animations_playing earlier
-        self.animations = [] # Initialize animations list earlier
         self.shortcuts_list = [] # Initialize list to store shortcuts
         self.theme_change_callbacks = [] # For notifying dialogs of theme changes
 
@@ -62,6 +65,12 @@ class MainWindow(QMainWindow):
         self.initUI()
         
         self.preview = PreviewRenderer(self)
+        self.preview.frames_ahead = self.config_manager.get_sequence_frames_ahead()
+
+        # picks up assets and caml rewritten by other programs while the bundle is open
+        self.bundleWatcher = BundleWatcher(self)
+        self.bundleWatcher.assetsChanged.connect(self.onBundleAssetsChanged)
+        self.bundleWatcher.camlChanged.connect(self.onBundleCamlChanged)
         
         # Restore window geometry
         self.loadWindowGeometry()
@@ -79,7 +88,8 @@ class MainWindow(QMainWindow):
         else:
             self.app_base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
         
-        self.cachedImages = {}
+        # pixmaps per asset and mip level, bounded by the pixmap memory budget
+        self.cachedImages = PixmapCache(self.config_manager.get_pixmap_memory_mb() * 1024 * 1024)
         self.missing_assets = set()
         self.cafilepath = "" 
 
@@ -93,13 +103,11 @@ class MainWindow(QMainWindow):
         self.parseTransform = self._parse.parseTransform
         self.parseColor = self._parse.parseColor
 
-        self._applyAnimation = ApplyAnimation(self.scene)
-        self.applyAnimationsToPreview = self._applyAnimation.applyAnimationsToPreview
-        self.applyKeyframeAnimationToItem = self._applyAnimation.applyKeyframeAnimationToItem
-        self.applyTransitionAnimationToPreview = self._applyAnimation.applyTransitionAnimationToPreview
-        self.applySpringAnimationToItem = self._applyAnimation.applySpringAnimationToItem
-
-        self._assets = Assets()
+        self._assets = Assets(ImageCache(self.config_manager.get_image_cache_dir(),
+                                         self.config_manager.get_image_cache_size_mb() * 1024 * 1024),
+                              self.cachedImages)
+        # one set shared with Assets, so the preview and the layer tree see the same missing files
+        self._assets.missing_assets = self.missing_assets
         self.findAssetPath = self._assets.findAssetPath
         self.loadImage = self._assets.loadImage
 
@@ -212,7 +220,7 @@ class MainWindow(QMainWindow):
         root_layer = self.cafile.rootlayer
         if root_layer and hasattr(root_layer, 'bounds') and len(root_layer.bounds) == 4:
             try:
-                root_bounds = [float(b) for b in root_layer.bounds]
+                root_bounds = root_layer.numbers('bounds', ())
                 root_width = root_bounds[2]
                 root_height = root_bounds[3]
 
@@ -241,7 +249,7 @@ class MainWindow(QMainWindow):
             layer.string = text
             
             if not hasattr(layer, "fontSize") or not layer.fontSize:
-                root_height = float(root_layer.bounds[3])
+                root_height = root_layer.numbers('bounds')[3]
                 default_font_size = int(root_height * 0.05 * 2)
                 layer.fontSize = str(default_font_size)
             if not hasattr(layer, "fontFamily") or not layer.fontFamily:
@@ -263,12 +271,12 @@ class MainWindow(QMainWindow):
                     img_height = image.height()
                     
                     if img_height > 0:
-                        current_height = float(layer.bounds[3])
+                        current_height = layer.numbers('bounds')[3]
                         
                         aspect_ratio = img_width / img_height
                         new_width = current_height * aspect_ratio
                         
-                        layer.bounds[2] = str(new_width)
+                        layer.bounds = [layer.bounds[0], layer.bounds[1], str(new_width), layer.bounds[3]]
             except Exception as e:
                 print(f"Could not resize image based on aspect ratio: {e}")
 
@@ -341,13 +349,6 @@ class MainWindow(QMainWindow):
         self.showFullPath = True
         
         self.scene = CheckerboardGraphicsScene()
-        # Initialize animation helper now that scene exists
-        from ._applyanimation import ApplyAnimation
-        self._applyAnimation = ApplyAnimation(self.scene)
-        self.applyAnimationsToPreview = self._applyAnimation.applyAnimationsToPreview
-        self.applyKeyframeAnimationToItem = self._applyAnimation.applyKeyframeAnimationToItem
-        self.applyTransitionAnimationToPreview = self._applyAnimation.applyTransitionAnimationToPreview
-        self.applySpringAnimationToItem = self._applyAnimation.applySpringAnimationToItem
         orig_make_item = self.scene.makeItemEditable
         def makeItemEditable(item):
             editable = orig_make_item(item)
@@ -361,6 +362,9 @@ class MainWindow(QMainWindow):
         self.ui.graphicsView.setEditMode(True)
 
         self.scene.itemSelectedOnCanvas.connect(self.selectLayerInTree)
+        self.ui.graphicsView.zoomChanged.connect(self.onZoomChanged)
+
+        self.initTimeline()
         
         self.ui.graphicsView.minZoom = 0.05
         self.ui.graphicsView.maxZoom = 10.0
@@ -372,7 +376,7 @@ class MainWindow(QMainWindow):
         self.loadSplitterSizes()
         
         self.currentSelectedItem = None
-        self.cachedImages = {}
+        self.cachedImages.clear()
         self.currentZoom = 1.0
 
         # Ensure scene background matches the current theme after scene creation
@@ -383,6 +387,74 @@ class MainWindow(QMainWindow):
                 self.scene.setBackgroundColor(QColor(240, 240, 240), QColor(220, 220, 220))
             self.scene.update()
 
+    def initTimeline(self):
+        # one timer drives every preview animation (see toggleAnimations), the slider under the preview scrubs it
+        self.frameClock = FrameClock(self)
+        self.frameClock.addDriver(self.driveAnimations)
+        self.frameClock.ticked.connect(self.onClockTicked)
+        # evaluated frames, scrubbing back and forth only sets values on the existing items
+        self.frameCache = FrameCache()
+        self.previewedTransition = [] # springs of the transition being previewed, see previewTransition
+        self._resumeAfterScrub = False
+
+        self.timelineSlider = QSlider(Qt.Horizontal, self.ui.previewWidget)
+        self.timelineSlider.setRange(0, 0)
+        self.timelineSlider.setEnabled(False)
+        self.timelineSlider.setToolTip("Drag to scrub through the animations")
+        self.timeLabel = QLabel("0.00s", self.ui.previewWidget)
+        self.timeLabel.setMinimumWidth(self.timeLabel.fontMetrics().horizontalAdvance("000.00s"))
+        self.speedBox = QComboBox(self.ui.previewWidget)
+        self.speedBox.addItems(["0.25x", "0.5x", "1x", "2x"])
+        self.speedBox.setCurrentText("1x")
+        self.speedBox.setToolTip("Playback speed")
+
+        timelineLayout = QHBoxLayout()
+        timelineLayout.addWidget(self.timelineSlider, 1)
+        timelineLayout.addWidget(self.timeLabel)
+        timelineLayout.addWidget(self.speedBox)
+        self.ui.previewLayout.addLayout(timelineLayout)
+
+        self.timelineSlider.sliderPressed.connect(self.onScrubStarted)
+        self.timelineSlider.valueChanged.connect(self.onScrubbed)
+        self.timelineSlider.sliderReleased.connect(self.onScrubFinished)
+        self.speedBox.currentTextChanged.connect(lambda text: self.frameClock.setSpeed(float(text[:-1])))
+
+    def refreshTimeline(self):
+        # the preview's animations changed, frames are only evaluated again if their content did
+        if not getattr(self, 'cafile', None):
+            return
+        self.frameCache.setdocument(self.cafile.rootlayer, self.preview.target_state, self.previewedTransition)
+        self.preview.set_tracks(self.frameCache.evaluator.tracks)
+        length = self.frameCache.length()
+        self.timelineSlider.blockSignals(True)
+        self.timelineSlider.setMaximum(int(length * 1000))
+        self.timelineSlider.blockSignals(False)
+        self.timelineSlider.setEnabled(length > 0)
+
+    def onClockTicked(self, t):
+        self.timeLabel.setText(f"{t:.2f}s")
+        if self.timelineSlider.isSliderDown():
+            return
+        length = self.timelineSlider.maximum()
+        self.timelineSlider.blockSignals(True)
+        # repeating animations keep going, the slider wraps around with them
+        self.timelineSlider.setValue(int(t * 1000) % (length + 1) if length else 0)
+        self.timelineSlider.blockSignals(False)
+
+    def onScrubStarted(self):
+        self._resumeAfterScrub = self.animations_playing
+        if self.animations_playing:
+            self.toggleAnimations()
+        self.onScrubbed(self.timelineSlider.value())
+
+    def onScrubbed(self, value):
+        self.frameClock.pauseAt(value / 1000.0)
+
+    def onScrubFinished(self):
+        if self._resumeAfterScrub:
+            self._resumeAfterScrub = False
+            self.toggleAnimations()
+
     # file display section
     def toggleFilenameDisplay(self, event):
         if hasattr(self, 'cafilepath'):
@@ -441,6 +513,10 @@ class MainWindow(QMainWindow):
             ca_file = CAFile(path)
             self.cafile = ca_file
             self.cafilepath = path
+            self.cachedImages.clear()
+            self.missing_assets.clear()
+            self.prefetchAssets()
+            self.watchBundle()
             self.populateLayersTreeWidget()
             self.populateStatesTreeWidget()
             self.renderPreview(self.cafile.rootlayer)
@@ -483,7 +559,107 @@ class MainWindow(QMainWindow):
         self.ui.graphicsView.fitInView(all_items_rect, Qt.AspectRatioMode.KeepAspectRatio)
         
         transform = self.ui.graphicsView.transform()
-        self.currentZoom = transform.m11()
+        self.onZoomChanged(transform.m11())
+
+    def prefetchAssets(self):
+        # start decoding every image the document uses before the preview asks for them
+        self.preview.reset_loaders()
+        self._assets.cafilepath = self.cafilepath
+        srcs = {layer.content.src for layer in self.cafile.layerindex.layers.values()
+                if getattr(layer, '_content', None) is not None and getattr(getattr(layer, 'content', None), 'src', None)}
+        self.preview.loader.prefetch(srcs, self._assets.level)
+
+    def watchBundle(self):
+        self.bundleWatcher.watch(self.cafilepath, self.cafile.index["rootDocument"])
+
+    def onBundleAssetsChanged(self, paths):
+        if not getattr(self, 'cafile', None):
+            return
+        if self._assets.assetIndex is not None:
+            self._assets.assetIndex.invalidate()
+        if self.cafile.assets.path:
+            assetspath = os.path.abspath(self.cafile.assets.path)
+            for path in paths:
+                if os.path.dirname(path) == assetspath:
+                    self.cafile.assets.reload(os.path.basename(path))
+        if self.preview.reload_assets(paths):
+            self.statusBar().showMessage(f"Reloaded {len(paths)} changed asset(s)", 3000)
+        else:
+            self.renderPreview(self.cafile.rootlayer)
+
+    def onBundleCamlChanged(self, path):
+        if not getattr(self, 'cafile', None) or not self.cafile.changedondisk(self.cafilepath):
+            return # our own save
+        if not self.config_manager.get_reload_caml_on_change():
+            self.statusBar().showMessage(f"{os.path.basename(path)} was changed by another program", 5000)
+            return
+        if self.isDirty:
+            msg = self.create_themed_message_box(
+                QMessageBox.Question,
+                "File Changed",
+                f"{os.path.basename(path)} was changed by another program. Reload it and discard your unsaved changes?",
+                QMessageBox.Yes | QMessageBox.No
+            )
+            msg.setDefaultButton(QMessageBox.No)
+            if msg.exec() != QMessageBox.Yes:
+                return
+        self.reloadCaml()
+
+    def reloadCaml(self):
+        # reads the document again, when only properties update_layer can patch changed
+        # (and no state is being previewed) just those layers are redrawn
+        try:
+            newfile = CAFile(self.cafilepath)
+        except Exception as e:
+            # most likely caught halfway through being written, the watcher fires again once it's done
+            print(f"Could not reload {self.cafilepath}: {e}")
+            return
+        oldfile, self.cafile = self.cafile, newfile
+        selected = self.currentInspectObject.id if isinstance(getattr(self, 'currentInspectObject', None), CALayer) else None
+        # anything else the inspector shows (an animation, a state element) is looked up again by its row in the trees
+        reopen = None
+        if selected is None:
+            try:
+                item = getattr(self, 'currentSelectedItem', None)
+                if item is not None:
+                    reopen = (item.treeWidget(), self.treeItemPath(item), [item.text(i) for i in range(4)])
+            except RuntimeError:
+                pass # the row went away with an earlier rebuild of the trees
+
+        updates = {}
+        rebuild = self.preview.target_state is not None or set(oldfile.layerindex.layers) != set(newfile.layerindex.layers)
+        if not rebuild:
+            for layer_id, layer in newfile.layerindex.layers.items():
+                # names only show up in the layer tree, which is rebuilt anyway
+                keys = [key for key in oldfile.findlayer(layer_id).compare(layer) if key != 'name']
+                if keys:
+                    updates[layer_id] = keys
+            rebuild = newfile.rootlayer.id in updates or \
+                any(not set(keys) <= PreviewRenderer.UPDATABLE_KEYS for keys in updates.values())
+
+        self.ui.treeWidget.clear()
+        self.populateLayersTreeWidget()
+        self.populateStatesTreeWidget()
+        if rebuild:
+            self.prefetchAssets()
+            self.renderPreview(newfile.rootlayer)
+        else:
+            # states are unchanged, but the preview has to look their values up in the new model
+            self.preview.base_state = newfile.rootlayer.states.get('Base State')
+            for layer_id, keys in updates.items():
+                self.updatePreviewLayer(newfile.findlayer(layer_id), keys)
+        if selected and newfile.findlayer(selected) is not None:
+            self.selectLayerInTree(selected)
+        elif not self.reopenInspector(reopen):
+            # whatever was shown belongs to the old model, edits to it would never be saved
+            self.clearInspector()
+        self.isDirty = False
+        self.statusBar().showMessage(f"Reloaded {os.path.basename(self.cafilepath)}", 3000)
+
+    def onZoomChanged(self, scale):
+        self.currentZoom = scale
+        # swaps image items to the resolution that fits the new zoom
+        self.preview.set_view_scale(scale)
 
     # only called like once
     def treeWidgetChildren(self, item: QTreeWidgetItem, layer) -> None:
@@ -526,7 +702,7 @@ class MainWindow(QMainWindow):
 
         element_type = current.text(1)
         if element_type == "Animation":
-            parent = self.cafile.rootlayer.findlayer(current.text(3))
+            parent = self.cafile.findlayer(current.text(3))
             element = parent.findanimation(current.text(0)) if parent is not None else None
             if element:
                 self.currentInspectObject = element
@@ -601,7 +777,8 @@ class MainWindow(QMainWindow):
                 if getattr(element, "type", "") == "CAKeyframeAnimation":
                     row_index = self.add_category_header("Keyframe Data", row_index)
                     if hasattr(element, "values") and element.values:
-                        values_str = ", ".join([str(self.formatFloat(value.value)) for value in element.values])
+                        values_str = ", ".join([str(value.src) if isinstance(value, CGImage) else str(self.formatFloat(value.value))
+                                                for value in element.values])
                         self.add_inspector_row("VALUES", values_str, row_index)
                         row_index += 1
                     if hasattr(element, "keyTimes") and element.keyTimes:
@@ -638,7 +815,7 @@ class MainWindow(QMainWindow):
                 
         elif element_type == "Layer" or element_type == "Root":
             if element_type == "Layer":
-                element = self.cafile.rootlayer.findlayer(current.text(2))
+                element = self.cafile.findlayer(current.text(2))
             else:
                 element = self.cafile.rootlayer
                 
@@ -769,7 +946,7 @@ class MainWindow(QMainWindow):
                 
                 if hasattr(element, "opacity") and element.opacity is not None:
                     try:
-                        opacity_percent = int(float(element.opacity) * 100)
+                        opacity_percent = int(element.number('opacity') * 100)
                         self.add_inspector_row("OPACITY", str(opacity_percent), row_index)
                     except (ValueError, TypeError):
                         self.add_inspector_row("OPACITY", "100", row_index)
@@ -998,8 +1175,9 @@ class MainWindow(QMainWindow):
                             layer.scale_factor = scale_factor
                             
                             root_layer = self.cafile.rootlayer
-                            root_width = float(root_layer.bounds[2])
-                            root_height = float(root_layer.bounds[3])
+                            root_bounds = root_layer.numbers('bounds', ())
+                            root_width = root_bounds[2]
+                            root_height = root_bounds[3]
                             
                             is_text_layer = hasattr(layer, "layer_class") and layer.layer_class == "CATextLayer"
                             
@@ -1012,17 +1190,18 @@ class MainWindow(QMainWindow):
                             else:
                                 target_height = root_height * scale_factor
                                 
-                                current_width = float(layer.bounds[2])
-                                current_height = float(layer.bounds[3])
+                                current_bounds = layer.numbers('bounds', ())
+                                current_width = current_bounds[2]
+                                current_height = current_bounds[3]
                                 aspect_ratio = current_width / current_height if current_height > 0 else 1.0
 
                                 target_width = target_height * aspect_ratio
 
-                                layer.bounds[2] = str(target_width)
-                                layer.bounds[3] = str(target_height)
+                                # assign a new list so the layer notices the change
+                                layer.bounds = [layer.bounds[0], layer.bounds[1], str(target_width), str(target_height)]
 
                             if not update_timer.isActive():
-                                update_timer.timeout.connect(lambda: self.renderPreview(self.cafile.rootlayer))
+                                update_timer.timeout.connect(lambda: self.updatePreviewLayer(layer, ('bounds', 'fontSize')))
                                 update_timer.start()
                                 
                             self.markDirty()
@@ -1032,7 +1211,7 @@ class MainWindow(QMainWindow):
             scale_slider.valueChanged.connect(update_scale_label)
 
             scale_slider.valueChanged.connect(lambda value: apply_scale(value))
-            scale_slider.sliderReleased.connect(lambda: self.renderPreview(self.cafile.rootlayer))
+            scale_slider.sliderReleased.connect(lambda: self.updatePreviewLayer(self.currentInspectObject, ('bounds', 'fontSize')))
             
             slider_layout.addWidget(scale_slider)
             slider_layout.addWidget(scale_label)
@@ -1093,16 +1272,21 @@ class MainWindow(QMainWindow):
     
     # preview section
     def renderPreview(self, root_layer, target_state=None):
-        anims = self.preview.render_preview(root_layer, target_state)
-        self.animations = anims
-        return anims
+        self.preview.render_preview(root_layer, target_state)
+        # new items, put them at the time the clock is at
+        self.refreshTimeline()
+        self.frameClock.apply()
+        if self.frameClock.isPlaying():
+            self.preview.flatten_static()
+
+    def updatePreviewLayer(self, layer, changed_keys):
+        # only touches the edited layer's items, anything the preview can't patch falls back to a full render
+        if layer is None or not self.preview.update_layer(layer, changed_keys):
+            self.renderPreview(self.cafile.rootlayer)
 
     def renderLayer(self, layer, parent_pos, parent_transform, base_state=None, target_state=None):
         return self.preview.render_layer(layer, parent_pos, parent_transform, base_state, target_state)
     
-    def applyDefaultAnimationsToLayer(self, layer, item):
-        return self.preview.apply_default_animations(layer, item)
-    
     def highlightLayerInPreview(self, layer):
         return self.preview.highlight_layer(layer)
     
@@ -1182,7 +1366,7 @@ class MainWindow(QMainWindow):
         element_type = current.text(1)
         if element_type == "State":
             layer_id = current.text(2)
-            layer = self.cafile.rootlayer.findlayer(layer_id) if layer_id else self.cafile.rootlayer
+            layer = self.cafile.findlayer(layer_id) if layer_id else self.cafile.rootlayer
             state_name = current.text(0)
             self.previewState(layer, state_name)
             return
@@ -1214,13 +1398,12 @@ class MainWindow(QMainWindow):
         if handler:
             handler(current, row_index)
 
-        # Reset animations list and preview state for State items
+        # Reset preview state for State items
         was_playing = getattr(self, 'animations_playing', False)
-        self.animations = []
         if element_type == "State":
             # Determine layer and state name for preview
             layer_id = current.text(2)
-            layer = self.cafile.rootlayer.findlayer(layer_id) if layer_id else self.cafile.rootlayer
+            layer = self.cafile.findlayer(layer_id) if layer_id else self.cafile.rootlayer
             state_name = current.text(0)
             self.previewState(layer, state_name)
             if was_playing:
@@ -1241,7 +1424,7 @@ class MainWindow(QMainWindow):
         layer = None
         
         if layer_id:
-            layer = self.cafile.rootlayer.findlayer(layer_id)
+            layer = self.cafile.findlayer(layer_id)
         else:
             layer = self.cafile.rootlayer
         
@@ -1284,8 +1467,6 @@ class MainWindow(QMainWindow):
                         self.add_inspector_row("ADD ANIMATION ELEMENTS", str(count), row_index)
                         row_index += 1
             
-            self.animations = []
-            
             self.previewState(layer, state_name)
             
             was_playing = hasattr(self, 'animations_playing') and self.animations_playing
@@ -1334,7 +1515,7 @@ class MainWindow(QMainWindow):
             
             # Check if there's actual transition data
             if layer_id:
-                layer = self.cafile.rootlayer.findlayer(layer_id)
+                layer = self.cafile.findlayer(layer_id)
             else:
                 layer = self.cafile.rootlayer
             
@@ -1351,8 +1532,6 @@ class MainWindow(QMainWindow):
                         self.add_inspector_row("ELEMENT COUNT", str(len(transition.elements)), row_index)
                         row_index += 1
             
-            self.animations = []
-            
             self.previewTransition(layer_id, fromState, toState)
             
             was_playing = hasattr(self, 'animations_playing') and self.animations_playing
@@ -1371,7 +1550,7 @@ class MainWindow(QMainWindow):
             row_index += 1
             
             # Try to find the target layer to show its name
-            target_layer = self.cafile.rootlayer.findlayer(targetId)
+            target_layer = self.cafile.findlayer(targetId)
             if target_layer and hasattr(target_layer, "name"):
                 self.add_inspector_row("TARGET NAME", target_layer.name, row_index)
                 row_index += 1
@@ -1413,7 +1592,7 @@ class MainWindow(QMainWindow):
             row_index += 1
             
             # Try to find the target layer to show its name
-            target_layer = self.cafile.rootlayer.findlayer(targetId)
+            target_layer = self.cafile.findlayer(targetId)
             if target_layer and hasattr(target_layer, "name"):
                 self.add_inspector_row("TARGET NAME", target_layer.name, row_index)
                 row_index += 1
@@ -1430,7 +1609,7 @@ class MainWindow(QMainWindow):
             layer_id = parent.text(2)
             
             if layer_id:
-                layer = self.cafile.rootlayer.findlayer(layer_id)
+                layer = self.cafile.findlayer(layer_id)
             else:
                 layer = self.cafile.rootlayer
                 
@@ -1460,7 +1639,7 @@ class MainWindow(QMainWindow):
             row_index += 1
             
             # Try to find the target layer to show its name
-            target_layer = self.cafile.rootlayer.findlayer(targetId)
+            target_layer = self.cafile.findlayer(targetId)
             if target_layer and hasattr(target_layer, "name"):
                 self.add_inspector_row("TARGET NAME", target_layer.name, row_index)
                 row_index += 1
@@ -1470,10 +1649,7 @@ class MainWindow(QMainWindow):
         if not layer or not state_name:
             return
             
-        # Clear previous animations in applyAnimation and mainWindow
-        if hasattr(self._applyAnimation, 'animations'):
-            self._applyAnimation.animations.clear()
-        self.animations = []
+        self.previewedTransition = []
         
         self.scene.clear()
         
@@ -1485,21 +1661,14 @@ class MainWindow(QMainWindow):
         if hasattr(layer, "states") and state_name in layer.states:
             target_state = layer.states[state_name]
         
+        # the state's added animations play from the frame cache along with the layers' own
         self.renderPreview(layer, target_state)
-        
-        if target_state and hasattr(target_state, "elements"):
-            for element in target_state.elements:
-                if element.__class__.__name__ == "LKStateAddAnimation":
-                    self.applyAnimationsToPreview(element)
-        
-        # Copy applied animations to MainWindow.animations for toggling
-        if hasattr(self._applyAnimation, 'animations'):
-            self.animations = list(self._applyAnimation.animations)
+        self.frameClock.seek(0.0)
 
     def previewTransition(self, layer_id, fromState, toState):
         layer = None
         if layer_id:
-            layer = self.cafile.rootlayer.findlayer(layer_id)
+            layer = self.cafile.findlayer(layer_id)
         else:
             layer = self.cafile.rootlayer
             
@@ -1518,15 +1687,59 @@ class MainWindow(QMainWindow):
         if not transition:
             return
             
+        # the springs are evaluated with the keyframe animations, every frame goes through apply_snapshot
+        springs = []
         if hasattr(transition, "elements"):
             for element in transition.elements:
                 if hasattr(element, "animations"):
+                    fromValue = self.transitionValue(layer, fromState if fromState != "*" else "Base State",
+                                                     element.targetId, element.key)
+                    toValue = self.transitionValue(layer, toState, element.targetId, element.key)
+                    if fromValue is None or toValue is None or type(fromValue) is not type(toValue):
+                        continue
                     for anim in element.animations:
-                        self.applyTransitionAnimationToPreview(element.targetId, element.key, anim)
-        
-        # Copy applied transition animations to MainWindow.animations for toggling
-        if hasattr(self._applyAnimation, 'animations'):
-            self.animations = list(self._applyAnimation.animations)
+                        springs.append((element.targetId, anim, element.key, fromValue, toValue))
+        self.previewedTransition = springs
+        self.refreshTimeline()
+        self.frameClock.seek(0.0)
+
+    def transitionValue(self, layer, stateName, targetId, keyPath):
+        # what keyPath of targetId is in a state of layer, a float or a tuple of them (None when it isn't numeric)
+        # states only list what they change, everything else keeps the layer's own value
+        states = getattr(layer, "states", None) or {}
+        for name in (stateName, "Base State"):
+            for element in getattr(states.get(name), "elements", None) or []:
+                if (element.__class__.__name__ == "LKStateSetValue" and element.targetId == targetId
+                        and element.keyPath == keyPath):
+                    return self.numericValue(element.value)
+        target = self.cafile.findlayer(targetId)
+        if target is None:
+            return None
+        if keyPath in self.TRANSITION_DEFAULTS:
+            return self.TRANSITION_DEFAULTS[keyPath]
+        name, _, part = keyPath.partition(".")
+        numbers = target.numbers(name)
+        if not numbers:
+            return 1.0 if keyPath == "opacity" else (0.0 if keyPath in ("zPosition", "cornerRadius") else None)
+        parts = {"": slice(None), "x": slice(0, 1), "y": slice(1, 2), "size": slice(2, 4),
+                 "size.width": slice(2, 3), "size.height": slice(3, 4), "origin": slice(0, 2)}
+        if part not in parts:
+            return None
+        return self.numericValue(" ".join(str(number) for number in numbers[parts[part]]))
+
+    # the value of transform key paths on a layer whose transform isn't set by a state
+    TRANSITION_DEFAULTS = {"transform.rotation.z": 0.0, "transform.rotation": 0.0, "transform.scale": 1.0,
+                           "transform.scale.x": 1.0, "transform.scale.y": 1.0, "transform.translation.x": 0.0,
+                           "transform.translation.y": 0.0}
+
+    def numericValue(self, text):
+        try:
+            numbers = tuple(float(part) for part in str(text).split())
+        except (TypeError, ValueError):
+            return None
+        if not numbers:
+            return None
+        return numbers[0] if len(numbers) == 1 else numbers
 
     # pause and play section
     def toggleAnimations(self):
@@ -1539,17 +1752,9 @@ class MainWindow(QMainWindow):
                 self.ui.playButton.setIcon(self.pauseIcon)
             self.ui.playButton.setToolTip("Playing (Click to Pause)")
 
-            for anim, _ in self.animations:
-                if isinstance(anim, QVariantAnimation):
-                    if anim.state() == QVariantAnimation.State.Stopped:
-                        anim.start()
-                    else:
-                        anim.resume()
-                elif isinstance(anim, QtCore.QTimeLine):
-                    if anim.state() == QtCore.QTimeLine.State.NotRunning:
-                        anim.start()
-                    else:
-                        anim.resume()
+            self.frameClock.play()
+            # only the animated layers are painted per frame while playing
+            self.preview.flatten_static()
         else: # Just toggled TO NOT playing (paused/stopped)
             if self.isDarkMode:
                 self.ui.playButton.setIcon(self.playIconWhite) # Show PLAY icon
@@ -1557,11 +1762,17 @@ class MainWindow(QMainWindow):
                 self.ui.playButton.setIcon(self.playIcon)
             self.ui.playButton.setToolTip("Paused/Stopped (Click to Play)")
 
-            for anim, _ in self.animations:
-                if isinstance(anim, QVariantAnimation):
-                    anim.pause()
-                elif isinstance(anim, QtCore.QTimeLine):
-                    anim.setPaused(True)
+            self.preview.unflatten()
+            self.frameClock.pause()
+
+    def driveAnimations(self, t):
+        # frame clock driver, the animations never run their own timers
+        # keyframe animations and spring transitions all come from the frame cache
+        if t == 0 and not self.frameClock.isPlaying():
+            # at rest the preview shows the document itself, which is what gets edited
+            self.preview.apply_snapshot({})
+        else:
+            self.preview.apply_snapshot(self.frameCache.snapshot(t))
 
     def setupShortcuts(self):
         # Clear existing shortcuts for live updates
@@ -1697,8 +1908,8 @@ class MainWindow(QMainWindow):
         if hasattr(self, 'cafilepath') and self.cafilepath:
             try:
                 dest, name = os.path.split(self.cafilepath)
-                self.cafile.write_file(name, dest)
-                self.statusBar().showMessage(f"File saved to {self.cafilepath}", 3000)
+                report = self.cafile.write_file(name, dest)
+                self.statusBar().showMessage(f"File saved to {self.cafilepath} ({len(report['written'])} written, {len(report['skipped'])} unchanged)", 3000)
                 self.isDirty = False
                 return True
             except Exception as e:
@@ -1732,11 +1943,12 @@ class MainWindow(QMainWindow):
             
         try:
             dest, name = os.path.split(path)
-            self.cafile.write_file(name, dest)
+            report = self.cafile.write_file(name, dest)
             self.cafilepath = path # Update current file path
+            self.watchBundle()
             self.ui.filename.setText(path) # Update filename label
             self.setWindowTitle(f"OpenPoster - {name}") # Update window title
-            self.statusBar().showMessage(f"File saved as {path}", 3000)
+            self.statusBar().showMessage(f"File saved as {path} ({len(report['written'])} written, {len(report['skipped'])} unchanged)", 3000)
             self.isDirty = False
             return True
         except Exception as e:
@@ -1871,27 +2083,11 @@ class MainWindow(QMainWindow):
     def onItemMoved(self, item):
         layer_id = item.data(0)
         if not layer_id: return
-        layer = self.cafile.rootlayer.findlayer(layer_id)
+        layer = self.cafile.findlayer(layer_id)
         if layer:
-            pos = item.pos()
-            
-            scene_rect = item.sceneBoundingRect()
-            w = scene_rect.width()
-            h = scene_rect.height()
-            
-            x0, y0 = (float(b) for b in layer.bounds[:2])
-            
-            layer.bounds = [str(x0), str(y0), str(w), str(h)]
-
-            layer.position = [str(pos.x()), str(pos.y())]
-
-            m11 = item.transform().m11()
-            m12 = item.transform().m12()
-            m21 = item.transform().m21()
-            m22 = item.transform().m22()
-            dx = item.transform().dx()
-            dy = item.transform().dy()
-            layer.transform = f"{m11} {m12} {m21} {m22} {dx} {dy}"
+            # resizing and rotating go into the layer's transform, bounds stay what they are
+            for key, value in self.preview.edited_values(layer, item).items():
+                setattr(layer, key, value)
 
         if hasattr(self, 'currentInspectObject') and self.currentInspectObject == layer:
             self.ui.tableWidget.blockSignals(True)
@@ -1934,15 +2130,16 @@ class MainWindow(QMainWindow):
                         selected_item.setText(0, value)
                 elif key == 'POSITION':
                     self.currentInspectObject.position = value.split(" ")
-                    self.renderPreview(self.cafile.rootlayer)
+                    self.updatePreviewLayer(self.currentInspectObject, ('position',))
                 elif key == 'BOUNDS':
                     self.currentInspectObject.bounds = value.split(" ")
-                    self.renderPreview(self.cafile.rootlayer)
+                    self.updatePreviewLayer(self.currentInspectObject, ('bounds',))
                 elif key == 'ANCHOR POINT':
                     self.currentInspectObject.anchorPoint = value
-                    self.renderPreview(self.cafile.rootlayer)
+                    self.updatePreviewLayer(self.currentInspectObject, ('anchorPoint',))
                 elif key == 'Z-POSITION':
                     self.currentInspectObject.zPosition = value
+                    self.updatePreviewLayer(self.currentInspectObject, ('zPosition',))
                 elif key == 'OPACITY':
                     try:
                         clean_value = item.text().strip().replace('%', '')
@@ -1958,7 +2155,7 @@ class MainWindow(QMainWindow):
                         item.setText(str(int(backend_val * 100)))
                         self.ui.tableWidget.blockSignals(False)
                         
-                        self.renderPreview(self.cafile.rootlayer)
+                        self.updatePreviewLayer(self.currentInspectObject, ('opacity',))
                     except ValueError:
                         pass
                 elif key == 'BACKGROUND COLOR':
@@ -1967,25 +2164,25 @@ class MainWindow(QMainWindow):
                         color_str = f"{color.redF()} {color.greenF()} {color.blueF()} {color.alphaF()}"
                         self.currentInspectObject.backgroundColor = color_str
                         item.setText(self.formatColor(color_str))
-                        self.renderPreview(self.cafile.rootlayer)
+                        self.updatePreviewLayer(self.currentInspectObject, ('backgroundColor',))
                 elif key == 'CORNER RADIUS':
                     self.currentInspectObject.cornerRadius = value
-                    self.renderPreview(self.cafile.rootlayer)
+                    self.updatePreviewLayer(self.currentInspectObject, ('cornerRadius',))
                 elif key == 'STRING':
                     self.currentInspectObject.string = value
-                    self.renderPreview(self.cafile.rootlayer)
+                    self.updatePreviewLayer(self.currentInspectObject, ('string',))
                 elif key == 'FONT SIZE':
                     self.currentInspectObject.fontSize = value
-                    self.renderPreview(self.cafile.rootlayer)
+                    self.updatePreviewLayer(self.currentInspectObject, ('fontSize',))
                 elif key == 'FONT FAMILY':
                     self.currentInspectObject.fontFamily = value
-                    self.renderPreview(self.cafile.rootlayer)
+                    self.updatePreviewLayer(self.currentInspectObject, ('fontFamily',))
                 elif key == 'ALIGNMENT MODE':
                     self.currentInspectObject.alignmentMode = value
-                    self.renderPreview(self.cafile.rootlayer)
+                    self.updatePreviewLayer(self.currentInspectObject, ('alignmentMode',))
                 elif key == 'COLOR':
                     self.currentInspectObject.color = value
-                    self.renderPreview(self.cafile.rootlayer)
+                    self.updatePreviewLayer(self.currentInspectObject, ('color',))
                 
             self.markDirty()
 
@@ -2056,25 +2253,71 @@ class MainWindow(QMainWindow):
         self.ui.filename.setStyleSheet("font-style: normal; color: palette(text); border: 1.5px solid palette(highlight); border-radius: 8px; padding: 5px 10px;")
         self.showFullPath = True
         self.cafile = CAFile(self.cafilepath)
-        self.cachedImages = {}
-        self.missing_assets = set()
+        self.cachedImages.clear()
+        self.missing_assets.clear()
+        self.prefetchAssets()
+        self.watchBundle()
         rootItem = QTreeWidgetItem([self.cafile.rootlayer.name, "Root", self.cafile.rootlayer.id, ""])
         self.ui.treeWidget.addTopLevelItem(rootItem)
         if len(self.cafile.rootlayer._sublayerorder) > 0:
             self.treeWidgetChildren(rootItem, self.cafile.rootlayer)
         self.populateStatesTreeWidget()
-        if hasattr(self._applyAnimation, 'animations'):
-            self._applyAnimation.animations.clear()
-        self.animations = []
         self.scene.clear()
         self.currentZoom = 1.0
         self.ui.graphicsView.resetTransform()
+        self.onZoomChanged(1.0)
         self.renderPreview(self.cafile.rootlayer)
-        if hasattr(self._applyAnimation, 'animations'):
-            self.animations = list(self._applyAnimation.animations)
         self.fitPreviewToView()
         self.isDirty = False
         
+    def treeItemKey(self, item):
+        # what tells a row apart from its siblings, layers by id since their names can change
+        name = item.text(2) if item.text(1) in ("Layer", "Root") else item.text(0)
+        return (item.text(1), name, item.data(0, Qt.UserRole))
+
+    def treeItemPath(self, item):
+        path = []
+        while item is not None:
+            path.append(self.treeItemKey(item))
+            item = item.parent()
+        return path[::-1]
+
+    def selectTreeItem(self, tree, path):
+        # selects the row at path (see treeItemPath) after the tree was rebuilt, False when it isn't there anymore
+        items = [tree.topLevelItem(i) for i in range(tree.topLevelItemCount())]
+        found = None
+        for key in path:
+            found = next((item for item in items if self.treeItemKey(item) == key), None)
+            if found is None:
+                return False
+            items = [found.child(i) for i in range(found.childCount())]
+        if found is None:
+            return False
+        tree.setCurrentItem(found)
+        return True
+
+    def reopenInspector(self, reopen):
+        # shows the row the inspector had open before the trees were rebuilt, looked up in the new model
+        if reopen is None:
+            return False
+        tree, path, texts = reopen
+        if tree is not None and self.selectTreeItem(tree, path):
+            return True
+        if texts[1] == "Animation":
+            # the inspector finds animations by their layer id and keyPath, the row doesn't have to be in a tree
+            layer = self.cafile.findlayer(texts[3])
+            if layer is not None and layer.findanimation(texts[0]) is not None:
+                self.openInInspector(QTreeWidgetItem(texts), None)
+                return True
+        return False
+
+    def clearInspector(self):
+        self.currentInspectObject = None
+        self.currentSelectedItem = None
+        self.ui.tableWidget.blockSignals(True)
+        self.ui.tableWidget.setRowCount(0)
+        self.ui.tableWidget.blockSignals(False)
+
     def selectLayerInTree(self, layer_id: str):
         if not hasattr(self, 'ui') or not self.ui.treeWidget:
             return
@@ -1,24 +1,117 @@
-from PySide6.QtCore import QRectF, QPointF, Qt
-from PySide6.QtGui import QTransform
-from PySide6.QtWidgets import QGraphicsRectItem, QGraphicsPixmapItem, QGraphicsTextItem
-from PySide6.QtGui import QPen, QBrush, QColor
+import math
+import os
+
+from PySide6.QtCore import QRectF, QPointF, QSize, Qt
+from PySide6.QtGui import QTransform, QPainter
+from PySide6.QtWidgets import QGraphicsItem, QGraphicsRectItem, QGraphicsPixmapItem, QGraphicsTextItem, QStyleOptionGraphicsItem
+from PySide6.QtGui import QPen, QBrush, QColor, QPixmap
+
+from ._framesequence import FrameSequence
+from ._imageloader import ImageLoader
+from ._pixmapcache import PixmapCache
+
+# what an animated value does to the properties animated_properties builds, per keyPath (see KEY_PATHS)
+# props has layer_properties' keys, parts the pieces of the animated transform in the layer's own space
+def _number(name):
+    def apply(props, parts, value):
+        props[name] = float(value)
+    return apply
+
+def _part(*names):
+    # transform.scale sets both sx and sy from one value, transform.translation takes a point
+    def apply(props, parts, value):
+        values = value if isinstance(value, tuple) else (value,) * len(names)
+        for name, number in zip(names, values):
+            parts[name] = float(number)
+    return apply
+
+def _position(props, parts, value):
+    props['pos'] = QPointF(value[0], value[1])
+
+def _position_x(props, parts, value):
+    props['pos'] = QPointF(value, props['pos'].y())
+
+def _position_y(props, parts, value):
+    props['pos'] = QPointF(props['pos'].x(), value)
+
+def _bounds(props, parts, value):
+    props['bounds'] = QRectF(value[0], value[1], value[2], value[3])
+
+def _bounds_size(props, parts, value):
+    bounds = props['bounds']
+    props['bounds'] = QRectF(bounds.x(), bounds.y(), value[0], value[1])
+
+def _bounds_width(props, parts, value):
+    bounds = props['bounds']
+    props['bounds'] = QRectF(bounds.x(), bounds.y(), value, bounds.height())
+
+def _bounds_height(props, parts, value):
+    bounds = props['bounds']
+    props['bounds'] = QRectF(bounds.x(), bounds.y(), bounds.width(), value)
+
+def _background_color(props, parts, value):
+    # components from 0 to 1 like CGColor, interpolated component-wise
+    rgba = [min(max(float(c), 0.0), 1.0) for c in value] + [1.0]
+    props['bg_color'] = QColor.fromRgbF(rgba[0], rgba[1], rgba[2], rgba[3])
 
 class PreviewRenderer:
     def __init__(self, window):
         self.window = window
         self.scene = window.scene
-        self.animation_helper = window._applyAnimation
         self.assets = window._assets
         self.load_image = window.loadImage
         self.parse_transform = window.parseTransform
         self.parse_color = window.parseColor
-        self.animations = []
+        # images are decoded on a thread pool, see image_decoded
+        self.loader = ImageLoader(self.assets)
+        self.loader.decoded.connect(self.image_decoded)
+        self.image_layers = {} # src -> ids of the layers showing it
+        self._placeholders = {}
+        self.view_scale = 1.0
+        # contents animations play as frame sequences, their frames come from a loader of their own
+        self.sequences = {} # layer id -> FrameSequence
+        self.frames_ahead = FrameSequence.AHEAD
+        self.sync_frames = False # decode frames right when they are asked for (headless rendering can't wait)
+        self.frame_loader = ImageLoader(self.assets)
+        self.frame_loader.decoded.connect(self.frame_decoded)
+        self.animated_keys = {} # layer id -> keyPaths its animations change, see set_tracks
+        # while playing, subtrees nothing animates are drawn as one cached pixmap each (see flatten_static)
+        self.flattened = False
+        self._flat = {} # subtree root id -> (pixmap, scene rect, scale, layer ids)
+        self._flat_items = []
+        # layer id -> what was drawn for it in the last render_preview, used by update_layer
+        self.items = {}
+        self.parent_transforms = {}
+        self.missing = {}
+        self.base_state = None
+        self.target_state = None
+        self._overrides = None
+        # for apply_snapshot: the un-animated properties per layer, document order, and what is applied now
+        self.base_props = {}
+        self.order = {}
+        self._applied = {}
+        self._placed_parents = {}
+
+    # keys update_layer can apply without rebuilding the scene
+    UPDATABLE_KEYS = {'position', 'bounds', 'anchorPoint', 'transform', 'zPosition', 'opacity',
+                      'backgroundColor', 'cornerRadius', 'string', 'fontSize', 'fontFamily',
+                      'alignmentMode', 'color'}
 
     def render_preview(self, root_layer, target_state=None):
-        if hasattr(self.animation_helper, 'animations'):
-            self.animation_helper.animations.clear()
-        self.animations = []
         self.scene.clear()
+        self.items = {}
+        self.parent_transforms = {}
+        self.missing = {}
+        self.image_layers = {}
+        self.sequences = {}
+        self.animated_keys = {}
+        self.flattened = False
+        self._flat = {}
+        self._flat_items = []
+        self.base_props = {}
+        self.order = {}
+        self._applied = {}
+        self._placed_parents = {}
         default_w, default_h = 1000, 1000
         try:
             b = root_layer.bounds
@@ -36,16 +129,14 @@ class PreviewRenderer:
         base_state = None
         if hasattr(root_layer, 'states') and root_layer.states and 'Base State' in root_layer.states:
             base_state = root_layer.states['Base State']
+        self.base_state = base_state
+        self.target_state = target_state
 
         self.render_layer(root_layer, QPointF(0, 0), QTransform(), base_state, target_state)
 
         rect = self.scene.itemsBoundingRect()
         self.scene.setSceneRect(rect)
 
-        if hasattr(self.animation_helper, 'animations'):
-            self.animations = list(self.animation_helper.animations)
-        return self.animations
-
     def render_layer(self, layer, parent_pos, parent_transform, base_state=None, target_state=None):
         if getattr(layer, 'hidden', False):
             return
@@ -56,67 +147,107 @@ class PreviewRenderer:
                     self.render_layer(sub, QPointF(0, 0), parent_transform, base_state, target_state)
             return
 
-        pos = QPointF(0, 0)
-        if hasattr(layer, 'position') and layer.position:
-            try:
-                pos = QPointF(float(layer.position[0]), float(layer.position[1]))
-            except Exception:
-                pass
+        overrides = self.state_overrides(base_state, target_state).get(layer.id)
+        props = self.layer_properties(layer, parent_transform, overrides)
 
-        bounds = QRectF(0, 0, 100, 100)
-        if hasattr(layer, 'bounds') and layer.bounds:
-            try:
-                x, y, w, h = map(float, layer.bounds[:4])
-                bounds = QRectF(x, y, w, h)
-            except Exception:
-                pass
+        item = None
+        missing_asset = False
+        if getattr(layer, 'layer_class', '') == 'CATextLayer':
+            item = QGraphicsTextItem()
+        elif hasattr(layer, '_content') and layer._content is not None:
+            src = getattr(layer.content, 'src', None)
+            if src:
+                self.assets.cafilepath = self.window.cafilepath
+                self.assets.cachedImages = self.window.cachedImages
+                pix = self.assets.cachedImages.get(src, self.assets.level)
+                if pix is None and src not in self.window.missing_assets:
+                    # not decoded yet, a placeholder is shown until image_decoded swaps the pixmap in
+                    if self.loader.request(src, self.assets.level):
+                        pix = self.placeholder_pixmap()
+                if src in self.window.missing_assets:
+                    missing_asset = True
+                elif pix:
+                    item = QGraphicsPixmapItem()
+                    item.setPixmap(pix)
+                    item.setTransformationMode(Qt.SmoothTransformation)
+                    self.image_layers.setdefault(src, []).append(layer.id)
+        elif any(getattr(anim, 'keyPath', None) == 'contents' for anim in getattr(layer, 'animations', None) or []):
+            # nothing to show until the first frame of the sequence is there (see set_sequences)
+            item = QGraphicsPixmapItem()
+            item.setPixmap(self.placeholder_pixmap())
+            item.setTransformationMode(Qt.SmoothTransformation)
+        if item is None:
+            item = QGraphicsRectItem()
+
+        self.apply_properties(item, layer, props, missing_asset)
+        item.setData(0, layer.id)
+        item.setData(1, 'Layer')
+        self.scene.addItem(item)
+        self.items[layer.id] = item
+        self.order[layer.id] = len(self.order)
+        self.parent_transforms[layer.id] = parent_transform
+        self.missing[layer.id] = missing_asset
 
-        transform = QTransform(parent_transform)
+        for lid in getattr(layer, '_sublayerorder', []):
+            sub = layer.sublayers.get(lid)
+            if sub:
+                self.render_layer(sub, props['pos'], props['transform'], base_state, target_state)
+
+    def layer_properties(self, layer, parent_transform, overrides=None):
+        # everything about a layer the preview draws, overrides is the layer's {keyPath: value} from the states
+        # numbers()/number() are parsed once per value and cached on the layer
+        p = layer.numbers('position')
+        pos = QPointF(p[0], p[1]) if p and len(p) >= 2 else QPointF(0, 0)
+
+        b = layer.numbers('bounds')
+        bounds = QRectF(b[0], b[1], b[2], b[3]) if b and len(b) >= 4 else QRectF(0, 0, 100, 100)
+
+        local = QTransform()
         if hasattr(layer, 'transform') and layer.transform:
-            transform = transform * self.parse_transform(layer.transform)
+            local = self.parse_transform(layer.transform)
 
-        anchor = QPointF(0.5, 0.5)
-        if hasattr(layer, 'anchorPoint') and layer.anchorPoint:
-            try:
-                ax, ay = map(float, layer.anchorPoint.split()[:2])
-                anchor = QPointF(ax, ay)
-            except Exception:
-                pass
+        a = layer.numbers('anchorPoint')
+        anchor = QPointF(a[0], a[1]) if a and len(a) >= 2 else QPointF(0.5, 0.5)
 
-        zpos = float(getattr(layer, 'zPosition', 0) or 0)
-        try:
-            opacity = float(layer.opacity) if hasattr(layer, 'opacity') else 1.0
-        except Exception:
-            opacity = 1.0
+        zpos = layer.number('zPosition', 0.0)
+        opacity = layer.number('opacity', 1.0)
         bg_color = None
         if hasattr(layer, 'backgroundColor') and layer.backgroundColor:
             bg_color = self.parse_color(layer.backgroundColor)
-        try:
-            radius = float(layer.cornerRadius) if hasattr(layer, 'cornerRadius') else 0
-        except Exception:
-            radius = 0
-
-        for state in (base_state, target_state):
-            if state and hasattr(state, 'elements'):
-                for el in state.elements:
-                    if getattr(el, '__class__', None).__name__ == 'LKStateSetValue' and el.targetId == layer.id:
-                        key, val = el.keyPath, el.value
-                        try:
-                            if key == 'position.x': pos.setX(float(val))
-                            elif key == 'position.y': pos.setY(float(val))
-                            elif key == 'transform': transform = self.parse_transform(val) * parent_transform
-                            elif key == 'opacity': opacity = float(val)
-                            elif key == 'zPosition': zpos = float(val)
-                            elif key == 'backgroundColor': bg_color = self.parse_color(val)
-                            elif key == 'cornerRadius': radius = float(val)
-                        except Exception:
-                            pass
-
-        has_content = False
-        missing_asset = False
-        is_text = getattr(layer, 'layer_class', '') == 'CATextLayer'
-        if is_text:
-            item = QGraphicsTextItem()
+        radius = layer.number('cornerRadius', 0)
+
+        for key, val in (overrides or {}).items():
+            try:
+                if key == 'position.x': pos.setX(float(val))
+                elif key == 'position.y': pos.setY(float(val))
+                elif key == 'transform': local = self.parse_transform(val)
+                elif key == 'opacity': opacity = float(val)
+                elif key == 'zPosition': zpos = float(val)
+                elif key == 'backgroundColor': bg_color = self.parse_color(val)
+                elif key == 'cornerRadius': radius = float(val)
+            except Exception:
+                pass
+
+        # local is kept so apply_snapshot can put the layer under an animated parent
+        transform = QTransform(parent_transform) * local
+        return {'pos': pos, 'bounds': bounds, 'transform': transform, 'local': local, 'anchor': anchor,
+                'zpos': zpos, 'opacity': opacity, 'bg_color': bg_color, 'radius': radius}
+
+    def state_overrides(self, base_state=None, target_state=None):
+        # targetId -> {keyPath: value} of both states merged, target state values win
+        # each state caches its own table, the merge is only redone when one of those tables is rebuilt
+        tables = tuple(state.overrides() if state else None for state in (base_state, target_state))
+        if self._overrides is None or any(a is not b for a, b in zip(self._overrides[0], tables)):
+            merged = {}
+            for table in tables:
+                for target, values in (table or {}).items():
+                    merged.setdefault(target, {}).update(values)
+            self._overrides = (tables, merged)
+        return self._overrides[1]
+
+    def apply_properties(self, item, layer, props, missing_asset=False):
+        self.base_props[layer.id] = props
+        if isinstance(item, QGraphicsTextItem):
             text = getattr(layer, 'string', '') or 'Text Layer'
             item.setPlainText(text)
             if hasattr(layer, 'fontSize') and layer.fontSize:
@@ -133,81 +264,503 @@ class PreviewRenderer:
             if hasattr(layer, 'color') and layer.color:
                 c = self.parse_color(layer.color)
                 if c: item.setDefaultTextColor(c)
+        elif isinstance(item, QGraphicsRectItem):
+            self.style_rect(item, layer.id, props, missing_asset)
+        self.place_item(item, props)
+
+    def style_rect(self, item, layer_id, props, missing_asset=False):
+        item.setRect(props['bounds'])
+        pen = QPen(QColor(200,200,200,180),1)
+        brush = QBrush(QColor(180,180,180,30))
+        if layer_id == self.window.cafile.rootlayer.id:
+            pen = QPen(QColor(0,0,0,200),1.5)
+            brush = QBrush(Qt.transparent)
+        if missing_asset:
+            pen = QPen(QColor(255,0,0,200),2)
+            brush = QBrush(QColor(255,200,200,30))
+        if props['bg_color']:
+            brush = QBrush(props['bg_color'])
+        if props['radius']>0:
+            pen.setStyle(Qt.DashLine)
+        item.setPen(pen)
+        item.setBrush(brush)
+
+    def fit_transform(self, item, bounds):
+        # the scale that stretches a pixmap item's pixmap over the layer bounds, identity for other items
+        if not isinstance(item, QGraphicsPixmapItem):
+            return QTransform()
+        pix = item.pixmap()
+        sx = bounds.width()/pix.width() if pix.width()>0 else 1
+        sy = bounds.height()/pix.height() if pix.height()>0 else 1
+        return QTransform().scale(sx, sy)
+
+    def place_item(self, item, props):
+        # geometry, stacking and opacity, the part of apply_properties animations change
+        pos, bounds, transform, anchor = props['pos'], props['bounds'], props['transform'], props['anchor']
+        if isinstance(item, QGraphicsPixmapItem):
+            pix = item.pixmap()
+            tf = self.fit_transform(item, bounds)
+            sx, sy = tf.m11(), tf.m22()
+            item.setTransform(tf*transform)
+            ww, hh = pix.width()*sx, pix.height()*sy
+            item.setTransformOriginPoint(ww*anchor.x(), hh*anchor.y())
+            item.setPos(QPointF(pos.x() - ww*anchor.x(), pos.y() - hh*anchor.y()))
+        else:
             item.setTransformOriginPoint(bounds.width()*anchor.x(), bounds.height()*anchor.y())
             item.setPos(QPointF(pos.x() - bounds.width()*anchor.x(), pos.y() - bounds.height()*anchor.y()))
             item.setTransform(transform)
-            item.setZValue(zpos)
-            item.setOpacity(opacity)
-            item.setData(0, layer.id)
-            item.setData(1, 'Layer')
-            self.scene.addItem(item)
-            has_content = True
-            self.apply_default_animations(layer, item)
-        elif hasattr(layer, '_content') and layer._content is not None:
-            src = getattr(layer.content, 'src', None)
-            if src:
-                self.assets.cafilepath = self.window.cafilepath
-                self.assets.cachedImages = self.window.cachedImages
-                pix = self.load_image(src)
-                self.window.cachedImages = self.assets.cachedImages
-                if not pix and src in self.window.missing_assets:
-                    missing_asset = True
-                if pix:
-                    pitem = QGraphicsPixmapItem()
-                    pitem.setPixmap(pix)
-                    sx = bounds.width()/pix.width() if pix.width()>0 else 1
-                    sy = bounds.height()/pix.height() if pix.height()>0 else 1
-                    tf = QTransform().scale(sx, sy)
-                    pitem.setTransform(tf*transform)
-                    ww, hh = pix.width()*sx, pix.height()*sy
-                    pitem.setTransformOriginPoint(ww*anchor.x(), hh*anchor.y())
-                    pitem.setPos(QPointF(pos.x() - ww*anchor.x(), pos.y() - hh*anchor.y()))
-                    pitem.setTransformationMode(Qt.SmoothTransformation)
-                    pitem.setZValue(zpos)
-                    pitem.setOpacity(opacity)
-                    pitem.setData(0, layer.id)
-                    pitem.setData(1, 'Layer')
-                    self.scene.addItem(pitem)
-                    has_content = True
-                    self.apply_default_animations(layer, pitem)
-
-        if not has_content:
-            rect = QGraphicsRectItem(bounds)
-            rect.setTransformOriginPoint(bounds.width()*anchor.x(), bounds.height()*anchor.y())
-            rect.setPos(QPointF(pos.x() - bounds.width()*anchor.x(), pos.y() - bounds.height()*anchor.y()))
-            rect.setTransform(transform)
-            rect.setZValue(zpos)
-            rect.setOpacity(opacity)
-            pen = QPen(QColor(200,200,200,180),1)
-            brush = QBrush(QColor(180,180,180,30))
-            if layer.id == self.window.cafile.rootlayer.id:
-                pen = QPen(QColor(0,0,0,200),1.5)
-                brush = QBrush(Qt.transparent)
-            if missing_asset:
-                pen = QPen(QColor(255,0,0,200),2)
-                brush = QBrush(QColor(255,200,200,30))
-            if bg_color:
-                brush = QBrush(bg_color)
-            if radius>0:
-                pen.setStyle(Qt.DashLine)
-            rect.setPen(pen)
-            rect.setBrush(brush)
-            rect.setData(0, layer.id)
-            rect.setData(1, 'Layer')
-            self.scene.addItem(rect)
-            self.apply_default_animations(layer, rect)
+        item.setZValue(props['zpos'])
+        item.setOpacity(props['opacity'])
+
+    def edited_values(self, layer, item):
+        # what to store on the layer after its item was dragged, resized or rotated in the scene, the reverse of place_item
+        # the fit scale and the parent transform are taken back out, so a re-render puts the item where it is now
+        # transform is only included when the edit changed it, a plain drag keeps the layer's own string
+        props = self.base_props.get(layer.id)
+        if props is None:
+            return {}
+        pos, bounds, anchor = item.pos(), props['bounds'], props['anchor']
+        values = {'position': [str(pos.x() + bounds.width()*anchor.x()), str(pos.y() + bounds.height()*anchor.y())]}
+
+        outer = self.fit_transform(item, bounds) * self.parent_transforms.get(layer.id, QTransform())
+        inverse, invertible = outer.inverted()
+        if not invertible:
+            return values
+        local = inverse * item.transform()
+        old = props['local']
+        parts = (local.m11(), local.m12(), local.m21(), local.m22(), local.dx(), local.dy())
+        if any(abs(a - b) > 1e-6 for a, b in zip(parts, (old.m11(), old.m12(), old.m21(), old.m22(), old.dx(), old.dy()))):
+            values['transform'] = " ".join(str(part) for part in parts)
+        return values
+
+    def update_layer(self, layer, changed_keys):
+        # patch the items of an edited layer in place instead of rebuilding the scene
+        # returns False when that isn't possible and the caller should do a full render_preview
+        item = self.items.get(layer.id)
+        if item is None or layer.id == self.window.cafile.rootlayer.id:
+            return False
+        if not set(changed_keys) <= self.UPDATABLE_KEYS:
+            return False
+        if not self.is_current(item):
+            return False
 
+        if 'transform' in changed_keys:
+            # sublayers inherit the transform, so the whole subtree moves with it
+            self.update_subtree(layer, self.parent_transforms[layer.id])
+        else:
+            overrides = self.state_overrides(self.base_state, self.target_state).get(layer.id)
+            props = self.layer_properties(layer, self.parent_transforms[layer.id], overrides)
+            self.apply_properties(item, layer, props, self.missing[layer.id])
+        if self._applied:
+            # the edit put items back at their base properties, animated ones go back to the current frame
+            self.apply_snapshot(self._applied, force=True)
+        self.invalidate_flat(layer.id)
+        if self.flattened:
+            self.unflatten()
+            self.flatten_static()
+        return True
+
+    def is_current(self, item):
+        # False for items of a scene that was cleared without going through render_preview
+        try:
+            return item.scene() is self.scene
+        except RuntimeError:
+            return False
+
+    def update_subtree(self, layer, parent_transform):
+        if layer.id not in self.items:
+            return
+        item = self.items[layer.id]
+        self.parent_transforms[layer.id] = parent_transform
+        overrides = self.state_overrides(self.base_state, self.target_state).get(layer.id)
+        props = self.layer_properties(layer, parent_transform, overrides)
+        self.apply_properties(item, layer, props, self.missing[layer.id])
         for lid in getattr(layer, '_sublayerorder', []):
             sub = layer.sublayers.get(lid)
             if sub:
-                self.render_layer(sub, pos, transform, base_state, target_state)
+                self.update_subtree(sub, props['transform'])
+
+    # keyPaths apply_snapshot understands, values come interpolated from CAKeyframeTrack/CASpringTrack
+    KEY_PATHS = {
+        'position': _position,
+        'position.x': _position_x,
+        'position.y': _position_y,
+        'opacity': _number('opacity'),
+        'zPosition': _number('zpos'),
+        'cornerRadius': _number('radius'),
+        'backgroundColor': _background_color,
+        'bounds': _bounds,
+        'bounds.size': _bounds_size,
+        'bounds.size.width': _bounds_width,
+        'bounds.size.height': _bounds_height,
+        'transform.rotation.z': _part('rz'),
+        'transform.rotation': _part('rz'),
+        'transform.scale': _part('sx', 'sy'),
+        'transform.scale.x': _part('sx'),
+        'transform.scale.y': _part('sy'),
+        'transform.translation': _part('tx', 'ty'),
+        'transform.translation.x': _part('tx'),
+        'transform.translation.y': _part('ty'),
+    }
+    IDENTITY_PARTS = {'tx': 0.0, 'ty': 0.0, 'rz': 0.0, 'sx': 1.0, 'sy': 1.0}
+    TRANSFORM_KEYS = {key for key in KEY_PATHS if key.startswith('transform.')}
+    # these change how a rect item is drawn, not just where
+    STYLE_KEYS = {'bounds', 'bounds.size', 'bounds.size.width', 'bounds.size.height', 'backgroundColor', 'cornerRadius'}
+
+    def apply_snapshot(self, snapshot, force=False):
+        # {layer id: {keyPath: value}} for one frame (see FrameCache), set on the items that already exist
+        # only layers whose values differ from the last frame are touched, unless force
+        # layers that are no longer animated go back to their base properties
+        if force:
+            changed = set(snapshot) | set(self._applied)
+        else:
+            changed = {layer_id for layer_id in set(snapshot) | set(self._applied)
+                       if snapshot.get(layer_id) != self._applied.get(layer_id)}
+        placed = set()
+        for layer_id in sorted((i for i in changed if i in self.items), key=self.order.get):
+            if layer_id not in placed:
+                self.place_animated(layer_id, self._placed_parents.get(layer_id, self.parent_transforms[layer_id]),
+                                    snapshot, placed)
+        self._applied = snapshot
+
+    def place_animated(self, layer_id, parent_transform, snapshot, placed):
+        item = self.items.get(layer_id)
+        if item is None or layer_id not in self.base_props or not self.is_current(item):
+            return
+        placed.add(layer_id)
+        self._placed_parents[layer_id] = parent_transform
+        if layer_id in self.sequences:
+            self.show_frame(layer_id, item, (snapshot.get(layer_id) or {}).get('contents'))
+        props = self.animated_properties(layer_id, parent_transform, snapshot.get(layer_id))
+        moved = set(snapshot.get(layer_id) or ()) | set(self._applied.get(layer_id) or ())
+        if moved & self.STYLE_KEYS and isinstance(item, QGraphicsRectItem):
+            self.style_rect(item, layer_id, props, self.missing.get(layer_id, False))
+        self.place_item(item, props)
+
+        # items aren't parented in the scene, so a transform change has to be carried down by hand
+        if parent_transform != self.parent_transforms[layer_id] or moved & self.TRANSFORM_KEYS:
+            layer = self.window.cafile.findlayer(layer_id)
+            for lid in getattr(layer, '_sublayerorder', []):
+                if lid in self.items:
+                    self.place_animated(lid, props['transform'], snapshot, placed)
+
+    def animated_properties(self, layer_id, parent_transform, values):
+        # base properties with the frame's values applied through KEY_PATHS, all of a layer's keyPaths in one go
+        base = self.base_props[layer_id]
+        props = dict(base)
+        transform = QTransform(parent_transform) * base['local']
+        if values:
+            parts = dict(self.IDENTITY_PARTS)
+            for key, value in values.items():
+                apply = self.KEY_PATHS.get(key)
+                if apply is None:
+                    continue
+                try:
+                    apply(props, parts, value)
+                except (TypeError, ValueError, IndexError):
+                    pass
+            if parts != self.IDENTITY_PARTS:
+                # in the layer's own space, before its transform and its parents'
+                transform = (QTransform().translate(parts['tx'], parts['ty']).rotateRadians(parts['rz'])
+                             .scale(parts['sx'], parts['sy']) * transform)
+        props['transform'] = transform
+        return props
+
+    def reset_loaders(self):
+        # the document is opened or reloaded, decodes queued for the old tree aren't needed anymore
+        # the sequences go with the frame loader's queue, set_tracks makes new ones that ask for their frames again
+        self.loader.reset()
+        self.frame_loader.reset()
+        self.sequences = {}
+
+    def set_tracks(self, tracks):
+        # (layer id, CAKeyframeTrack/CASpringTrack) pairs, as the FrameCache's evaluator has them
+        # contents tracks with CGImage frames get a FrameSequence, the items are new after every render_preview
+        self.sequences = {}
+        self.animated_keys = {}
+        for layer_id, track in tracks:
+            self.animated_keys.setdefault(layer_id, set()).add(track.keyPath)
+            if track.keyPath != 'contents' or getattr(track, 'numeric', True):
+                continue
+            if not isinstance(self.items.get(layer_id), QGraphicsPixmapItem):
+                continue
+            srcs = [value.src for value in track.values if getattr(value, 'src', None)]
+            if srcs:
+                self.sequences[layer_id] = FrameSequence(srcs, self.request_frame, self.assets.level, self.frames_ahead)
+
+    def show_frame(self, layer_id, item, frame):
+        # frame is the CGImage the contents animation is at, None when it has no effect (the layer's own contents show)
+        sequence = self.sequences[layer_id]
+        if frame is None:
+            sequence.current = None
+            pix = self.contents_pixmap(layer_id)
+        else:
+            pix = sequence.show(frame.src)
+        if pix is not None and pix.cacheKey() != item.pixmap().cacheKey():
+            item.setPixmap(pix)
+
+    def contents_pixmap(self, layer_id):
+        layer = self.window.cafile.findlayer(layer_id)
+        src = getattr(getattr(layer, 'content', None), 'src', None) if getattr(layer, '_content', None) is not None else None
+        pix = self.assets.cachedImages.get(src, self.assets.level) if src else None
+        return pix or self.placeholder_pixmap(missing=self.missing.get(layer_id, False))
+
+    def request_frame(self, src, level):
+        if not self.sync_frames:
+            return self.frame_loader.request(src, level)
+        asset_path = self.assets.findAssetPath(src)
+        if not asset_path or not os.path.exists(asset_path):
+            return False
+        self.frame_decoded(src, level, self.assets.decodeImage(asset_path, PixmapCache.levelScale(level)))
+        return True
+
+    def frame_decoded(self, src, level, image):
+        for layer_id, sequence in self.sequences.items():
+            if src not in sequence.window:
+                continue
+            if image.isNull():
+                print(f"Failed to load image: {src}")
+                sequence.missing.add(src)
+                continue
+            pix = QPixmap.fromImage(image)
+            first = sequence.size is None
+            if first:
+                # frames bigger than the layer are decoded smaller from here on, they are scaled down to its bounds anyway
+                sequence.size = (image.width() * 2 ** level, image.height() * 2 ** level)
+                sequence.setlevel(self.frame_level(layer_id, sequence))
+            kept = sequence.store(src, level, pix)
+            if src == sequence.current and (kept or first):
+                # the frame the animation is at came in late, it replaces the last one right away
+                item = self.items.get(layer_id)
+                if isinstance(item, QGraphicsPixmapItem) and self.is_current(item):
+                    item.setPixmap(pix)
+                    parent_transform = self._placed_parents.get(layer_id, self.parent_transforms[layer_id])
+                    self.place_item(item, self.animated_properties(layer_id, parent_transform, self._applied.get(layer_id)))
 
-    def apply_default_animations(self, layer, item):
-        if not hasattr(layer, 'animations') or not layer.animations:
+    def frame_level(self, layer_id, sequence):
+        # mip level that still has a pixel per device pixel for the frame at the layer's size in the view
+        if sequence.size is None or layer_id not in self.base_props:
+            return self.assets.level
+        bounds = self.base_props[layer_id]['bounds']
+        width, height = sequence.size
+        if width <= 0 or height <= 0:
+            return self.assets.level
+        return PixmapCache.levelForScale(self.view_scale * max(bounds.width() / width, bounds.height() / height))
+
+    # keyPaths that only move an item or fade it, what it draws stays the same (see flatten_static)
+    CACHEABLE_KEYS = {'position', 'position.x', 'position.y', 'opacity', 'zPosition'}
+    FLAT_MAX_SIZE = 4096 # px, bigger subtrees are flattened at a lower resolution
+
+    def flatten_static(self):
+        # for playback: every largest subtree without animations and without state overrides is drawn as one
+        # pixmap item in place of its items, rendered at the view scale and kept until one of its layers changes
+        # the animated items that only move or fade get a device coordinate cache, so their (smooth scaled)
+        # pixmaps aren't painted again every frame
+        if self.flattened or not self.items:
+            return
+        self.flattened = True
+        ordered = sorted(self.order, key=self.order.get)
+        for root_id in self.static_subtrees():
+            self.flatten(root_id, ordered)
+        for layer_id, item in self.items.items():
+            if not item.isVisible() or not self.is_current(item):
+                continue
+            cacheable = self.animated_keys.get(layer_id, set()) <= self.CACHEABLE_KEYS and layer_id not in self.sequences
+            parent = self.window.cafile.layerindex.parent(layer_id)
+            while cacheable and parent is not None:
+                cacheable = not (self.animated_keys.get(parent.id, set()) & self.TRANSFORM_KEYS)
+                parent = self.window.cafile.layerindex.parent(parent.id)
+            if cacheable:
+                item.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+
+    def unflatten(self):
+        # back to one item per layer, for editing, the flattened pixmaps are kept for the next flatten_static
+        if not self.flattened:
             return
-        for anim in layer.animations:
-            if getattr(anim, 'type', None) == 'CAKeyframeAnimation':
-                self.animation_helper.applyKeyframeAnimationToItem(item, anim.keyPath, anim)
+        self.flattened = False
+        for flat in self._flat_items:
+            if self.is_current(flat):
+                self.scene.removeItem(flat)
+        self._flat_items = []
+        for item in self.items.values():
+            if self.is_current(item):
+                item.setCacheMode(QGraphicsItem.NoCache)
+                item.setVisible(True)
+
+    def static_subtrees(self):
+        # roots of the largest subtrees whose layers are neither animated nor set by any state
+        root = self.window.cafile.rootlayer
+        overridden = set()
+        for state in (getattr(root, 'states', None) or {}).values():
+            for element in getattr(state, 'elements', None) or []:
+                overridden.add(getattr(element, 'targetId', None))
+        roots = []
+
+        def visit(layer, moved):
+            # moved: an ancestor animates its transform, which carries this layer along
+            moves = moved or bool(self.animated_keys.get(layer.id, set()) & self.TRANSFORM_KEYS)
+            children = [layer.sublayers[lid] for lid in getattr(layer, '_sublayerorder', [])
+                        if lid in layer.sublayers and lid in self.items]
+            static = [visit(child, moves) for child in children]
+            if (not moved and layer.id in self.items and all(static) and layer.id not in self.animated_keys
+                    and layer.id not in overridden):
+                return True
+            roots.extend(child.id for child, is_static in zip(children, static) if is_static)
+            return False
+
+        visit(root, False)
+        return sorted(roots, key=self.order.get)
+
+    def subtree_ids(self, layer_id):
+        # the layer and everything below it that has an item, in document order
+        ids = []
+        stack = [self.window.cafile.findlayer(layer_id)]
+        while stack:
+            layer = stack.pop()
+            if layer is None or layer.id not in self.items:
+                continue
+            ids.append(layer.id)
+            stack.extend(layer.sublayers.get(lid) for lid in reversed(getattr(layer, '_sublayerorder', [])))
+        return ids
+
+    def flatten(self, root_id, ordered):
+        entry = self._flat.get(root_id)
+        if entry is None or entry[2] != self.view_scale:
+            ids = self.subtree_ids(root_id)
+            items = [self.items[layer_id] for layer_id in ids]
+            # the pixmap takes the place of the items in the stacking order, which only works if they share one z
+            if not items or any(item.zValue() != items[0].zValue() for item in items):
+                return
+            if len(items) == 1 and not isinstance(items[0], QGraphicsPixmapItem):
+                return # a lone rect draws as fast as its pixmap would
+            entry = self.render_flat(ids, items)
+            if entry is None:
+                return
+            self._flat[root_id] = entry
+        pix, rect, scale, ids = entry
+
+        flat = QGraphicsPixmapItem(pix)
+        flat.setPos(rect.topLeft())
+        flat.setScale(1 / scale)
+        flat.setZValue(self.items[root_id].zValue())
+        flat.setData(1, 'Flattened')
+        self.scene.addItem(flat)
+        self._flat_items.append(flat)
+        following = self.order[ids[-1]] + 1 # subtrees are contiguous in document order
+        if following < len(ordered):
+            flat.stackBefore(self.items[ordered[following]])
+        for layer_id in ids:
+            self.items[layer_id].setVisible(False)
+
+    def render_flat(self, ids, items):
+        rect = QRectF()
+        for item in items:
+            rect = rect.united(item.sceneBoundingRect())
+        if rect.isEmpty():
+            return None
+        scale = min(self.view_scale, self.FLAT_MAX_SIZE / max(rect.width(), rect.height()))
+        pix = QPixmap(QSize(max(1, math.ceil(rect.width() * scale)), max(1, math.ceil(rect.height() * scale))))
+        pix.fill(Qt.transparent)
+        painter = QPainter(pix)
+        painter.setRenderHints(QPainter.Antialiasing | QPainter.SmoothPixmapTransform)
+        to_pixmap = QTransform().translate(-rect.x(), -rect.y()) * QTransform().scale(scale, scale)
+        option = QStyleOptionGraphicsItem()
+        for item in items:
+            # the items aren't parented, their own transform and opacity is all there is
+            painter.save()
+            painter.setTransform(item.sceneTransform() * to_pixmap)
+            painter.setOpacity(item.opacity())
+            item.paint(painter, option, None)
+            painter.restore()
+        painter.end()
+        return pix, rect, self.view_scale, ids
+
+    def invalidate_flat(self, layer_id):
+        # drop the flattened pixmaps the layer is part of, or that hang below it (its transform moves them)
+        for root_id, entry in list(self._flat.items()):
+            if layer_id in entry[3]:
+                del self._flat[root_id]
+                continue
+            parent = self.window.cafile.layerindex.parent(root_id)
+            while parent is not None:
+                if parent.id == layer_id:
+                    del self._flat[root_id]
+                    break
+                parent = self.window.cafile.layerindex.parent(parent.id)
+
+    def set_view_scale(self, scale):
+        # picks the mip level for the view scale, image items keep their current pixmap until the new level is decoded
+        self.view_scale = scale
+        if self.flattened:
+            # flattened subtrees are drawn again at the new scale
+            self.unflatten()
+            self.flatten_static()
+        for layer_id, sequence in self.sequences.items():
+            sequence.setlevel(self.frame_level(layer_id, sequence))
+        level = PixmapCache.levelForScale(scale)
+        if level == self.assets.level:
+            return
+        self.assets.level = level
+        for src in list(self.image_layers):
+            pix = self.assets.cachedImages.get(src, level)
+            if pix is None:
+                self.loader.request(src, level)
+            else:
+                self.swap_pixmap(src, pix)
+
+    def reload_assets(self, paths):
+        # asset files changed on disk (see BundleWatcher), only the images that use them are decoded again
+        # and swapped into their items, returns False when the scene has to be rebuilt instead
+        # (an image that was missing showed up, or one that was shown is gone)
+        changed = {os.path.normcase(os.path.abspath(path)) for path in paths}
+        rebuild = False
+        for src in list(self.window.missing_assets):
+            asset_path = self.assets.findAssetPath(src)
+            if asset_path and os.path.normcase(os.path.abspath(asset_path)) in changed:
+                self.window.missing_assets.discard(src)
+                rebuild = True
+        for src in list(self.image_layers):
+            asset_path = self.assets.findAssetPath(src)
+            if asset_path is None:
+                self.assets.cachedImages.remove(src)
+                rebuild = True
+            elif os.path.normcase(os.path.abspath(asset_path)) in changed:
+                # drop every level, the one being shown is decoded again, the others when the zoom asks for them
+                self.assets.cachedImages.remove(src)
+                self.loader.reload(src, self.assets.level)
+        return not rebuild
+
+    def image_decoded(self, src, level, image):
+        if image.isNull():
+            print(f"Failed to load image: {src}")
+            self.window.missing_assets.add(src)
+            pix = self.placeholder_pixmap(missing=True)
+        else:
+            pix = QPixmap.fromImage(image)
+            self.assets.cachedImages.put(src, level, pix)
+        if level == self.assets.level:
+            self.swap_pixmap(src, pix)
+
+    def swap_pixmap(self, src, pix):
+        # same item, so animations, edit handles and selection stay attached to it
+        for layer_id in self.image_layers.get(src, []):
+            item = self.items.get(layer_id)
+            if not isinstance(item, QGraphicsPixmapItem) or not self.is_current(item):
+                continue
+            layer = self.window.cafile.findlayer(layer_id)
+            if layer is None:
+                continue
+            item.setPixmap(pix)
+            # pixmap size changed, so its scale to the layer bounds has to be redone
+            self.update_layer(layer, ('bounds',))
+
+    def placeholder_pixmap(self, missing=False):
+        # 1x1 pixmap stretched over the layer bounds while the real one is decoded (red if it can't be)
+        if missing not in self._placeholders:
+            pix = QPixmap(1, 1)
+            pix.fill(QColor(255, 200, 200, 60) if missing else QColor(180, 180, 180, 60))
+            self._placeholders[missing] = pix
+        return self._placeholders[missing]
 
     def highlight_layer(self, layer):
         self.scene.clearSelection()
@@ -1,4 +1,10 @@
 from .caanimation import CAAnimation
 from .caspringanimation import CASpringAnimation
 from .camatchmoveanimation import CAMatchMoveAnimation
-from .cakeyframeanimation import CAKeyframeAnimation
\ No newline at end of file
+from .cakeyframeanimation import CAKeyframeAnimation
+from .catiming import CATiming
+from .catimingfunction import CATimingFunction
+from .cakeyframetrack import CAKeyframeTrack
+from .caanimationevaluator import CAAnimationEvaluator
+from .caspringsolver import CASpringSolver
+from .caspringtrack import CASpringTrack
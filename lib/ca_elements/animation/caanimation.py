@@ -1,6 +1,16 @@
 import xml.etree.ElementTree as ET
 
+from ..core.caunknown import CAUnknown
+
 class CAAnimation:
+    # attributes/children read by the constructor, everything else ends up in self.unknown
+    ATTRIBUTES = ("type", "keyPath", "beginTime", "duration", "fillMode", "removedOnCompletion",
+                  "repeatCount", "repeatDuration", "speed", "timeOffset", "timingFunction")
+    CHILDREN = ()
+    __slots__ = ("element", "tag", "type", "keyPath", "beginTime", "duration", "fillMode",
+                 "removedOnCompletion", "repeatCount", "repeatDuration", "speed", "timeOffset",
+                 "timingFunction", "unknown")
+
     def __init__(self, element):
         self.element = element
         self.tag = self.element.tag.replace(
@@ -21,6 +31,11 @@ class CAAnimation:
         self.timeOffset = self.element.get("timeOffset")
         self.timingFunction = self.element.get("timingFunction")
 
+        self.unknown = CAUnknown(self.element, self.ATTRIBUTES, self.CHILDREN) or None
+
+    def detach(self):
+        self.element = None
+
     def create(self):
         e = ET.Element(self.tag)
         self.setValue(e, "type", self.type)
@@ -39,6 +54,9 @@ class CAAnimation:
         self.setValue(e, "timeOffset", self.timeOffset)
         self.setValue(e, "timingFunction", self.timingFunction)
 
+        if self.unknown is not None:
+            self.unknown.write(e)
+
         return e
 
     def setValue(self, element, key, value):
@@ -0,0 +1,66 @@
+import math
+
+from .cakeyframetrack import CAKeyframeTrack
+from .caspringtrack import CASpringTrack
+
+class CAAnimationEvaluator:
+    # values of every keyframe animation in a layer tree at any time, computed from the document alone
+    # (no timers), so scrubbing, headless rendering and tests all see the same frame for the same time
+    # animations are compiled when they are added, call rebuild() after editing them
+    def __init__(self, rootlayer=None):
+        self.rootlayer = rootlayer
+        self.tracks = [] # (layer id, CAKeyframeTrack/CASpringTrack) in document order, later ones win on the same keyPath
+        if rootlayer is not None:
+            self.rebuild()
+
+    def rebuild(self):
+        self.tracks = []
+        stack = [self.rootlayer] if self.rootlayer is not None else []
+        while stack:
+            layer = stack.pop()
+            for animation in getattr(layer, 'animations', None) or []:
+                self.add(layer.id, animation)
+            stack.extend(layer.sublayers[id] for id in reversed(layer._sublayerorder) if id in layer.sublayers)
+
+    def add(self, layer_id, animation, keyPath=None, fromValue=None, toValue=None):
+        # also for animations that aren't part of the tree, like the ones a state adds (with the state's keyPath)
+        # springs only get a track with the values they go between (a transition's from and to state)
+        # returns False for anything that can't be evaluated
+        kind = getattr(animation, 'type', None)
+        if kind == "CAKeyframeAnimation":
+            track = CAKeyframeTrack(animation, keyPath)
+        elif kind == "CASpringAnimation" and fromValue is not None and toValue is not None:
+            track = CASpringTrack(animation, keyPath, fromValue, toValue)
+        else:
+            return False
+        self.tracks.append((layer_id, track))
+        return True
+
+    def duration(self):
+        # document time the last finite animation ends at, 0 if there is none
+        ends = [track.timing.end() for _, track in self.tracks]
+        return max([end for end in ends if not math.isinf(end)], default=0.0)
+
+    def evaluate(self, t):
+        # {layer id: {keyPath: value}} at time t, animations without effect at t are left out
+        result = {}
+        for layer_id, track in self.tracks:
+            value = track.valueat(t)
+            if value is not None:
+                result.setdefault(layer_id, {})[track.keyPath] = value
+        return result
+
+    def evaluatemany(self, times):
+        # {layer id: {keyPath: [value per time]}} for a whole batch of times (None where the animation has no effect)
+        # one list per keyPath instead of one dict per time, handy for scrubbing/plotting a whole range
+        times = list(times)
+        result = {}
+        for layer_id, track in self.tracks:
+            samples = track.sample(times)
+            current = result.setdefault(layer_id, {})
+            previous = current.get(track.keyPath)
+            if previous is not None:
+                # an earlier animation on the same keyPath still shows wherever this one has no effect
+                samples = [value if value is not None else old for value, old in zip(samples, previous)]
+            current[track.keyPath] = samples
+        return result
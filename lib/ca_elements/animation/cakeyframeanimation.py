@@ -1,9 +1,14 @@
 import xml.etree.ElementTree as ET
 
 from .caanimation import CAAnimation
-from ..core import CANumber
+from ..core import CANumber, CANumberArray, CGImage
 
 class CAKeyframeAnimation(CAAnimation):
+    ATTRIBUTES = CAAnimation.ATTRIBUTES + ("calculationMode", "additive", "cumulative")
+    CHILDREN = ("keyTimes", "timingFunctions", "values")
+    __slots__ = ("key", "calculationMode", "additive", "cumulative", "keyTimes", "_keyTimes",
+                 "timingFunctions", "_timingFunctions", "values", "_values")
+
     def __init__(self, element):
         super().__init__(element)
         if self.tag == "p":
@@ -19,8 +24,7 @@ class CAKeyframeAnimation(CAAnimation):
         self._keyTimes = self.element.find(
             "{http://www.apple.com/CoreAnimation/1.0}keyTimes")
         if self._keyTimes is not None:
-            for keyTime in self._keyTimes:
-                self.keyTimes.append(CANumber(keyTime))
+            self.keyTimes = self.loadnumbers(self._keyTimes)
                 
         self.timingFunctions = []
         self._timingFunctions = self.element.find(
@@ -33,8 +37,32 @@ class CAKeyframeAnimation(CAAnimation):
         self._values = self.element.find(
             "{http://www.apple.com/CoreAnimation/1.0}values")
         if self._values is not None:
-            for value in self._values:
-                self.values.append(CANumber(value))
+            self.values = self.loadnumbers(self._values)
+
+    def loadnumbers(self, element):
+        # packed into a CANumberArray when every item is a plain number, which is the usual case
+        numbers = CANumberArray()
+        for number in element:
+            if not numbers.add(number.tag.replace("{http://www.apple.com/CoreAnimation/1.0}", ""), number.get("value")):
+                # CGImage frames, CGPoints etc. keep one object per item
+                return [self.loaditem(item) for item in element]
+        return numbers
+
+    def loaditem(self, item):
+        # CGImages are frames of a contents animation, they have a src instead of a value
+        if item.tag.replace("{http://www.apple.com/CoreAnimation/1.0}", "") == "CGImage":
+            return CGImage(item.get("src"))
+        return CANumber(item)
+
+    def detach(self):
+        super().detach()
+        for numbers in (self.keyTimes, self.values):
+            if isinstance(numbers, list):
+                for number in numbers:
+                    number.detach()
+        self._keyTimes = None if self._keyTimes is None else True
+        self._timingFunctions = None if self._timingFunctions is None else True
+        self._values = None if self._values is None else True
 
     def create(self):
         e = super().create()
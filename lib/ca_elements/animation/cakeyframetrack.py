@@ -0,0 +1,147 @@
+import math
+from bisect import bisect_right
+
+from .catiming import CATiming
+from .catimingfunction import CATimingFunction
+from ..core import CANumberArray
+
+class CAKeyframeTrack:
+    # a CAKeyframeAnimation compiled for evaluation: keyTimes/values as floats, the timing parsed once
+    # values are floats for scalar key paths, tuples for multi-component ones ("0 0" points, transforms)
+    # and the original objects when they aren't numbers at all (CGImage frames), those can only be stepped through
+    __slots__ = ("keyPath", "timing", "mode", "keyTimes", "values", "numeric", "cumulative", "additive",
+                 "timingFunction", "timingFunctions")
+
+    def __init__(self, animation, keyPath=None):
+        # keyPath overrides the animation's own, states give it on the LKStateAddAnimation instead
+        self.keyPath = keyPath or animation.keyPath
+        self.timing = CATiming(animation)
+        self.mode = animation.calculationMode or "linear"
+        self.cumulative = CATiming.flag(animation.cumulative, False)
+        self.additive = CATiming.flag(animation.additive, False)
+
+        self.values = self.loadvalues(animation.values)
+        self.numeric = all(value is not None for value in self.values)
+        if not self.numeric:
+            self.values = list(animation.values)
+            self.mode = "discrete"
+        elif self.values and all(len(value) == 1 for value in self.values):
+            self.values = [value[0] for value in self.values]
+
+        self.keyTimes = self.loadkeytimes(animation.keyTimes)
+
+        # timingFunction eases the whole animation, timingFunctions each segment between two values
+        # (paced modes ignore those, like core animation does)
+        self.timingFunction = CATimingFunction.parse(animation.timingFunction)
+        self.timingFunctions = []
+        if self.mode not in ("paced", "cubicPaced", "discrete"):
+            self.timingFunctions = [CATimingFunction.parse(function) for function in animation.timingFunctions]
+
+    def loadvalues(self, values):
+        if isinstance(values, CANumberArray):
+            return [(number,) for number in values.numbers]
+        parsed = []
+        for value in values:
+            try:
+                parsed.append(tuple(float(part) for part in str(value.value).split()) or None)
+            except (AttributeError, ValueError):
+                parsed.append(None)
+        return parsed
+
+    def loadkeytimes(self, keyTimes):
+        count = len(self.values)
+        if self.mode in ("paced", "cubicPaced") and count > 1:
+            # keyTimes are ignored, time is spent in proportion to how far each segment moves
+            lengths = [self.distance(self.values[i], self.values[i + 1]) for i in range(count - 1)]
+            total = sum(lengths)
+            if total > 0:
+                times = [0.0]
+                for length in lengths:
+                    times.append(times[-1] + length / total)
+                times[-1] = 1.0
+                return times
+
+        if isinstance(keyTimes, CANumberArray):
+            times = list(keyTimes.numbers)
+        else:
+            times = [CATiming.number(keyTime.value, None) for keyTime in keyTimes]
+        # discrete animations may list one extra key time for the end of the last value
+        expected = (count, count + 1) if self.mode == "discrete" else (count,)
+        if len(times) in expected and None not in times:
+            return times
+        if count <= 1:
+            return [0.0] * count
+        if self.mode == "discrete":
+            return [i / count for i in range(count)]
+        return [i / (count - 1) for i in range(count)]
+
+    def distance(self, a, b):
+        if isinstance(a, tuple):
+            return math.sqrt(sum((y - x) ** 2 for x, y in zip(a, b)))
+        return abs(b - a)
+
+    def valueat(self, t):
+        # value at document time t, None when the animation has no effect then
+        progress = self.timing.progress(t)
+        if progress is None or not self.values:
+            return None
+        iteration, fraction = progress
+        if self.timingFunction is not None:
+            fraction = self.timingFunction.valueat(fraction)
+        value = self.interpolate(fraction)
+        if self.cumulative and iteration > 0 and self.numeric:
+            # every repeat starts where the previous one ended
+            value = self.combine(value, self.values[0], self.values[-1], iteration)
+        return value
+
+    def sample(self, times):
+        return [self.valueat(t) for t in times]
+
+    def interpolate(self, fraction):
+        values, keyTimes = self.values, self.keyTimes
+        if len(values) == 1:
+            return values[0]
+        if self.mode == "discrete":
+            index = bisect_right(keyTimes, fraction) - 1
+            return values[min(max(index, 0), len(values) - 1)]
+
+        if fraction <= keyTimes[0]:
+            return values[0]
+        if fraction >= keyTimes[-1]:
+            return values[-1]
+        index = min(bisect_right(keyTimes, fraction) - 1, len(values) - 2)
+        span = keyTimes[index + 1] - keyTimes[index]
+        u = (fraction - keyTimes[index]) / span if span > 0 else 1.0
+        if index < len(self.timingFunctions) and self.timingFunctions[index] is not None:
+            u = self.timingFunctions[index].valueat(u)
+        if self.mode in ("cubic", "cubicPaced"):
+            return self.catmullrom(index, u)
+        return self.lerp(values[index], values[index + 1], u)
+
+    def lerp(self, a, b, u):
+        if isinstance(a, tuple):
+            return tuple(x + (y - x) * u for x, y in zip(a, b))
+        return a + (b - a) * u
+
+    def catmullrom(self, index, u):
+        # the spline core animation's cubic mode uses with tension/continuity/bias at 0,
+        # the end points are repeated so the curve starts and stops at the first/last value
+        values = self.values
+        p0 = values[max(index - 1, 0)]
+        p1 = values[index]
+        p2 = values[index + 1]
+        p3 = values[min(index + 2, len(values) - 1)]
+        u2 = u * u
+        u3 = u2 * u
+
+        def spline(a, b, c, d):
+            return 0.5 * (2 * b + (c - a) * u + (2 * a - 5 * b + 4 * c - d) * u2 + (3 * b - a - 3 * c + d) * u3)
+
+        if isinstance(p1, tuple):
+            return tuple(spline(a, b, c, d) for a, b, c, d in zip(p0, p1, p2, p3))
+        return spline(p0, p1, p2, p3)
+
+    def combine(self, value, first, last, iteration):
+        if isinstance(value, tuple):
+            return tuple(v + (l - f) * iteration for v, f, l in zip(value, first, last))
+        return value + (last - first) * iteration
@@ -4,6 +4,14 @@ from .caanimation import CAAnimation
 from ..core.cgpoint import CGPoint
 
 class CAMatchMoveAnimation(CAAnimation):
+    ATTRIBUTES = CAAnimation.ATTRIBUTES + ("additive", "appliesX", "appliesY", "appliesScale",
+                                           "appliesRotation", "targetsSuperlayer",
+                                           "usesNormalizedCoordinates")
+    CHILDREN = ("sourceLayer", "sourcePoints", "animationType")
+    __slots__ = ("additive", "appliesX", "appliesY", "appliesScale", "appliesRotation",
+                 "targetsSuperlayer", "usesNormalizedCoordinates", "sourceLayer", "_sourceLayer",
+                 "sourcePoints", "_sourcePoints", "animationType", "_animationType")
+
     def __init__(self, element):
         super().__init__(element)
         self.type = "CAMatchMoveAnimation"
@@ -37,6 +45,12 @@ class CAMatchMoveAnimation(CAAnimation):
         if self._animationType is not None:
             self.animationType = self._animationType
 
+    def detach(self):
+        super().detach()
+        for sourcePoint in self.sourcePoints:
+            sourcePoint.detach()
+        self._sourcePoints = None if self._sourcePoints is None else True
+
     def create(self):
         e = super().create()
 
@@ -1,6 +1,10 @@
 from .caanimation import CAAnimation
 
 class CASpringAnimation(CAAnimation):
+    ATTRIBUTES = CAAnimation.ATTRIBUTES + ("damping", "mass", "stiffness", "velocity",
+                                           "mica_autorecalculatesDuration")
+    __slots__ = ("damping", "mass", "stiffness", "velocity", "micarecalc")
+
     def __init__(self, element):
         super().__init__(element)
         self.type = "CASpringAnimation"
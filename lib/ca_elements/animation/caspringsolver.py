@@ -0,0 +1,106 @@
+import math
+from array import array
+
+from .catiming import CATiming
+
+class CASpringSolver:
+    # a CASpringAnimation as a damped harmonic oscillator, solved in closed form
+    # valueat(t) is the fraction of the way from fromValue to toValue t seconds in (0 -> 1, overshooting when
+    # underdamped), looked up in a table sampled once per parameter set and shared by every spring using it
+    # velocity is core animation's initialVelocity: distances per second towards toValue
+    MASS = 1.0
+    STIFFNESS = 100.0
+    DAMPING = 10.0
+    EPSILON = 0.001 # settled once it stays this close to toValue (as a fraction of the distance)
+    RATE = 240 # table samples per second
+    MAX_SETTLING = 60.0 # springs without damping never settle, they are cut off here
+    MAX_TABLES = 256
+    _tables = {} # (mass, stiffness, damping, velocity) -> (settling duration, array('d') of progress)
+    __slots__ = ("mass", "stiffness", "damping", "velocity", "settlingDuration", "timing", "table")
+
+    def __init__(self, animation):
+        self.mass = self.positive(animation.mass, self.MASS)
+        self.stiffness = self.positive(animation.stiffness, self.STIFFNESS)
+        self.damping = max(0.0, CATiming.number(animation.damping, self.DAMPING))
+        self.velocity = CATiming.number(animation.velocity, 0.0)
+
+        key = (self.mass, self.stiffness, self.damping, self.velocity)
+        if key not in self._tables:
+            if len(self._tables) >= self.MAX_TABLES:
+                self._tables.clear()
+            self._tables[key] = self.sampletable()
+        self.settlingDuration, self.table = self._tables[key]
+
+        # the animation runs for as long as the spring takes to settle when micasa asks for it
+        # (mica_autorecalculatesDuration) or when it has no duration of its own
+        self.timing = CATiming(animation)
+        if CATiming.flag(animation.micarecalc, False) or CATiming.number(animation.duration, 0.0) <= 0:
+            self.timing = self.settled(self.timing)
+
+    @staticmethod
+    def positive(text, default):
+        value = CATiming.number(text, default)
+        return value if value > 0 else default
+
+    def settled(self, timing):
+        # timing with the settling duration instead of the animation's own, repeats scale with it
+        repeats = timing.active / timing.duration
+        timing.duration = self.settlingDuration or CATiming.DEFAULT_DURATION
+        timing.active = timing.duration * repeats
+        return timing
+
+    def displacement(self, t):
+        # distance left to toValue at t seconds, 1 at the start
+        return self.solve(t)[0]
+
+    def solve(self, t):
+        # (displacement, bound on its size from t on), the bound is what lets sampletable stop early
+        w0 = math.sqrt(self.stiffness / self.mass)
+        zeta = self.damping / (2 * math.sqrt(self.stiffness * self.mass))
+        v0 = -self.velocity
+        if zeta < 1:
+            wd = w0 * math.sqrt(1 - zeta * zeta)
+            b = (zeta * w0 + v0) / wd
+            decay = math.exp(-zeta * w0 * t)
+            return decay * (math.cos(wd * t) + b * math.sin(wd * t)), decay * math.sqrt(1 + b * b)
+        if zeta == 1:
+            decay = math.exp(-w0 * t)
+            return decay * (1 + (v0 + w0) * t), decay * (1 + abs(v0 + w0) * t)
+        root = math.sqrt(zeta * zeta - 1)
+        r1 = -w0 * (zeta - root)
+        r2 = -w0 * (zeta + root)
+        c2 = (v0 - r1) / (r2 - r1)
+        e1, e2 = math.exp(r1 * t), math.exp(r2 * t)
+        return (1 - c2) * e1 + c2 * e2, abs(1 - c2) * e1 + abs(c2) * e2
+
+    def progress(self, t):
+        # exact value, valueat() is the cheap one
+        return 1.0 - self.displacement(max(0.0, t))
+
+    def sampletable(self):
+        # samples up to where the spring stays within EPSILON of toValue, that point is its settling duration
+        table = array('d')
+        last = 0 # first sample from which on it stays settled
+        for i in range(int(self.MAX_SETTLING * self.RATE) + 1):
+            x, bound = self.solve(i / self.RATE)
+            table.append(1.0 - x)
+            if abs(x) > self.EPSILON:
+                last = i + 1
+            elif bound < self.EPSILON:
+                break
+        del table[last + 1:]
+        return min(last, len(table) - 1) / self.RATE, table
+
+    def valueat(self, t):
+        # progress t seconds after the spring started, it sits at toValue once settled
+        if t <= 0:
+            return 0.0
+        position = t * self.RATE
+        index = int(position)
+        if index >= len(self.table) - 1:
+            return 1.0
+        a = self.table[index]
+        return a + (self.table[index + 1] - a) * (position - index)
+
+    def sample(self, times):
+        return [self.valueat(t) for t in times]
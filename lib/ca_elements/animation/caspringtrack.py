@@ -0,0 +1,26 @@
+from .caspringsolver import CASpringSolver
+
+class CASpringTrack:
+    # a CASpringAnimation going from one value to another (a state transition), evaluated like a CAKeyframeTrack
+    # values are floats or tuples of them, the spring moves every component by the same fraction
+    # transitions leave the layer at toValue, so it holds that once the spring is done (and fromValue before it starts)
+    __slots__ = ("keyPath", "timing", "solver", "fromValue", "toValue")
+
+    def __init__(self, animation, keyPath=None, fromValue=0.0, toValue=1.0):
+        self.keyPath = keyPath or animation.keyPath
+        self.solver = CASpringSolver(animation)
+        self.timing = self.solver.timing
+        self.fromValue = fromValue
+        self.toValue = toValue
+
+    def valueat(self, t):
+        progress = self.timing.progress(t)
+        if progress is None:
+            return self.fromValue if t < self.timing.beginTime else self.toValue
+        fraction = self.solver.valueat(progress[1] * self.timing.duration)
+        if isinstance(self.fromValue, tuple):
+            return tuple(a + (b - a) * fraction for a, b in zip(self.fromValue, self.toValue))
+        return self.fromValue + (self.toValue - self.fromValue) * fraction
+
+    def sample(self, times):
+        return [self.valueat(t) for t in times]
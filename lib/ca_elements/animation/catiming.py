@@ -0,0 +1,83 @@
+import math
+
+class CATiming:
+    # the CAMediaTiming part of an animation, maps a time on the document clock to (iteration, fraction)
+    # the animation's strings are parsed once here, times are in seconds
+    DEFAULT_DURATION = 0.25 # what core animation uses when duration is 0 or missing
+    __slots__ = ("beginTime", "duration", "speed", "timeOffset", "active", "fillsBackwards", "fillsForwards")
+
+    def __init__(self, animation):
+        self.beginTime = self.number(animation.beginTime, 0.0)
+        self.duration = self.number(animation.duration, 0.0)
+        if self.duration <= 0:
+            self.duration = self.DEFAULT_DURATION
+        self.speed = self.number(animation.speed, 1.0)
+        self.timeOffset = self.number(animation.timeOffset, 0.0)
+
+        # how long it runs in its own time, repeatDuration wins over repeatCount like in core animation
+        repeatCount = self.number(animation.repeatCount, 0.0)
+        repeatDuration = self.number(animation.repeatDuration, 0.0)
+        if repeatDuration > 0:
+            self.active = repeatDuration
+        elif repeatCount > 0:
+            self.active = self.duration * repeatCount
+        else:
+            self.active = self.duration
+
+        fillMode = animation.fillMode or "removed"
+        self.fillsBackwards = fillMode in ("backwards", "both")
+        # removedOnCompletion defaults to YES, which takes the animation off the layer no matter the fillMode
+        self.fillsForwards = fillMode in ("forwards", "both") and not self.flag(animation.removedOnCompletion, True)
+
+    @staticmethod
+    def number(text, default):
+        if text is None:
+            return default
+        try:
+            value = float(text)
+        except (TypeError, ValueError):
+            return default
+        return default if math.isnan(value) else value
+
+    @staticmethod
+    def flag(text, default):
+        if text is None:
+            return default
+        return str(text).strip().lower() not in ("0", "false", "no", "")
+
+    def end(self):
+        # document time the animation stops at, inf when it repeats forever (or never advances)
+        if math.isinf(self.active) or self.speed == 0:
+            return math.inf
+        return self.beginTime + self.active / abs(self.speed)
+
+    def progress(self, t):
+        # (iteration, fraction of that iteration) at document time t
+        # None when the animation has no effect at t (not started yet / finished, and not filled)
+        elapsed = (t - self.beginTime) * abs(self.speed)
+        if elapsed < 0:
+            if not self.fillsBackwards:
+                return None
+            local = 0.0
+        elif elapsed >= self.active:
+            if not self.fillsForwards:
+                return None
+            # held at the very end, a partial last repeat (repeatCount 1.5) stops halfway through
+            iterations = self.active / self.duration
+            iteration = max(0, math.ceil(iterations) - 1)
+            return self.directed(iteration, iterations - iteration)
+        else:
+            # timeOffset shifts the phase within the active period, it doesn't move the period itself
+            local = elapsed + self.timeOffset
+            if not math.isinf(self.active):
+                local %= self.active
+            elif local < 0:
+                local %= self.duration
+
+        iteration = math.floor(local / self.duration)
+        return self.directed(iteration, local / self.duration - iteration)
+
+    def directed(self, iteration, fraction):
+        # negative speed plays every iteration backwards
+        fraction = min(max(fraction, 0.0), 1.0)
+        return iteration, (1.0 - fraction if self.speed < 0 else fraction)
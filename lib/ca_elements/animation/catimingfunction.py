@@ -0,0 +1,79 @@
+from array import array
+
+class CATimingFunction:
+    # a CAMediaTimingFunction, the cubic bezier from (0, 0) to (1, 1) that maps a time fraction to a progress fraction
+    # each set of control points is sampled once into a table shared by every function using it,
+    # so easing a value is a lookup instead of solving the bezier for its time parameter
+    NAMED = {
+        "linear": (0.0, 0.0, 1.0, 1.0),
+        "easeIn": (0.42, 0.0, 1.0, 1.0),
+        "easeOut": (0.0, 0.0, 0.58, 1.0),
+        "easeInEaseOut": (0.42, 0.0, 0.58, 1.0),
+        "default": (0.25, 0.1, 0.25, 1.0),
+    }
+    SAMPLES = 512
+    _tables = {} # control points -> array('d') of progress at SAMPLES + 1 evenly spaced times
+    __slots__ = ("controlPoints", "table")
+
+    def __init__(self, controlPoints=NAMED["linear"]):
+        self.controlPoints = tuple(float(point) for point in controlPoints)
+        x1, y1, x2, y2 = self.controlPoints
+        if x1 == y1 and x2 == y2:
+            self.table = None # a straight line, nothing to look up
+            return
+        if self.controlPoints not in self._tables:
+            self._tables[self.controlPoints] = self.sampletable()
+        self.table = self._tables[self.controlPoints]
+
+    @classmethod
+    def parse(cls, value):
+        # a name ("easeIn"), four control points ("0.42 0 0.58 1") or an element with either as
+        # its name/controlPoints/value attribute, None when it is none of those
+        if value is None:
+            return None
+        if not isinstance(value, str):
+            value = value.get("name") or value.get("controlPoints") or value.get("value")
+            if value is None:
+                return None
+        value = value.strip()
+        if value in cls.NAMED:
+            return cls(cls.NAMED[value])
+        try:
+            points = [float(part) for part in value.replace(",", " ").split()]
+        except ValueError:
+            return None
+        if len(points) != 4:
+            return None
+        # the curve has to stay a function of time, core animation clamps x the same way
+        points[0] = min(max(points[0], 0.0), 1.0)
+        points[2] = min(max(points[2], 0.0), 1.0)
+        return cls(points)
+
+    def bezier(self, t, a, b):
+        # one coordinate of the curve with end points 0 and 1 and control points a and b
+        u = 1 - t
+        return 3 * u * u * t * a + 3 * u * t * t * b + t * t * t
+
+    def solve(self, x):
+        # the curve's time parameter where it reaches x, bisection since x(t) only ever increases
+        x1, _, x2, _ = self.controlPoints
+        low, high = 0.0, 1.0
+        for _ in range(40):
+            middle = (low + high) / 2
+            if self.bezier(middle, x1, x2) < x:
+                low = middle
+            else:
+                high = middle
+        return (low + high) / 2
+
+    def sampletable(self):
+        _, y1, _, y2 = self.controlPoints
+        return array('d', (self.bezier(self.solve(i / self.SAMPLES), y1, y2) for i in range(self.SAMPLES + 1)))
+
+    def valueat(self, x):
+        if self.table is None or x <= 0 or x >= 1:
+            return x
+        position = x * self.SAMPLES
+        index = int(position)
+        a = self.table[index]
+        return a + (self.table[index + 1] - a) * (position - index)
@@ -1,5 +1,9 @@
 from .cgimage import CGImage
 from .cgpoint import CGPoint
 from .canumber import CANumber
+from .canumberarray import CANumberArray
+from .caassets import CAAssets
+from .calayerindex import CALayerIndex
 from .calayer import CALayer
+from .camlloader import CAMLLoader
 from .cafile import CAFile
\ No newline at end of file
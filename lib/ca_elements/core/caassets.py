@@ -0,0 +1,136 @@
+import hashlib
+import mmap
+import os.path
+import shutil
+from collections.abc import MutableMapping
+
+class CAAssets(MutableMapping):
+    # dict-like view of a bundle's assets folder
+    # only names/sizes/mtimes are read on open, bytes are fetched on first access
+    def __init__(self, path=None, use_mmap=False):
+        self.path = path
+        self.use_mmap = use_mmap
+        self._entries = {} # name -> (size, mtime) of the file on disk
+        self._loaded = {} # name -> bytes (or mmap) that have been read or assigned
+        self._modified = set() # names assigned in memory, these have no file backing them
+
+        if path is not None and os.path.isdir(path):
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.is_file():
+                        st = entry.stat()
+                        self._entries[entry.name] = (st.st_size, st.st_mtime)
+
+    def __getitem__(self, name):
+        if name in self._loaded:
+            return self._loaded[name]
+        if name not in self._entries:
+            raise KeyError(name)
+
+        with open(os.path.join(self.path, name), "rb") as f:
+            if self.use_mmap and self._entries[name][0] > 0:
+                val = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                val = f.read()
+        self._loaded[name] = val
+        return val
+
+    def __setitem__(self, name, data):
+        self._release(name)
+        self._entries[name] = (len(data), None)
+        self._loaded[name] = data
+        self._modified.add(name)
+
+    def __delitem__(self, name):
+        if name not in self._entries:
+            raise KeyError(name)
+        self._release(name)
+        del self._entries[name]
+        self._modified.discard(name)
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def isloaded(self, name):
+        return name in self._loaded
+
+    def stat(self, name):
+        # (size, mtime) - mtime is None for assets that only exist in memory
+        return self._entries[name]
+
+    def reload(self, name):
+        # the file changed on disk (or appeared/disappeared), forget what was read from it
+        # assets assigned in memory win over the disk, False for those
+        if name in self._modified or self.path is None:
+            return False
+        self._release(name)
+        filepath = os.path.join(self.path, name)
+        if os.path.isfile(filepath):
+            st = os.stat(filepath)
+            self._entries[name] = (st.st_size, st.st_mtime)
+        else:
+            self._entries.pop(name, None)
+        return True
+
+    def sourcepath(self, name):
+        # file an untouched asset can be copied from, None if it was assigned in memory
+        if name in self._modified or name not in self._entries or self.path is None:
+            return None
+        return os.path.join(self.path, name)
+
+    def write(self, path):
+        # returns (written, skipped) asset names
+        written = []
+        skipped = []
+        for name in self._entries:
+            dest = os.path.join(path, name)
+            src = self.sourcepath(name)
+            if src is None:
+                data = self._loaded[name]
+                if self._samecontents(dest, data):
+                    skipped.append(name)
+                    continue
+                with open(dest, "wb") as f:
+                    f.write(data)
+                written.append(name)
+                if self.path is not None and os.path.isdir(self.path) and os.path.samefile(path, self.path):
+                    # it lives in our own folder now so it can be treated like any other file
+                    st = os.stat(dest)
+                    self._entries[name] = (st.st_size, st.st_mtime)
+                    self._modified.discard(name)
+                continue
+            if os.path.exists(dest):
+                if os.path.samefile(src, dest):
+                    skipped.append(name)
+                    continue
+                size, mtime = self._entries[name]
+                st = os.stat(dest)
+                if st.st_size == size and st.st_mtime == mtime:
+                    skipped.append(name)
+                    continue
+            # file-to-file copy, never pulls the bytes through python
+            # copy2 keeps the mtime so the next save can tell the copy is up to date
+            shutil.copy2(src, dest)
+            written.append(name)
+        return written, skipped
+
+    def _samecontents(self, dest, data):
+        if not os.path.exists(dest) or os.path.getsize(dest) != len(data):
+            return False
+        with open(dest, "rb") as f:
+            return hashlib.sha1(f.read()).digest() == hashlib.sha1(data).digest()
+
+    def close(self):
+        for name in list(self._loaded):
+            self._release(name)
+
+    def _release(self, name):
+        val = self._loaded.pop(name, None)
+        if isinstance(val, mmap.mmap):
+            val.close()
@@ -1,29 +1,57 @@
 import xml.etree.ElementTree as ET
+import io
 import os.path
 import plistlib
 
 from .calayer import CALayer
+from .calayerindex import CALayerIndex
+from .caassets import CAAssets
+from .camlloader import CAMLLoader
 
 class CAFile:
-    def __init__(self, path):
+    STREAMING_BYTES = 8 * 1024 * 1024 # bigger caml files are read with CAMLLoader unless streaming says otherwise
+
+    def __init__(self, path, use_mmap=False, streaming=None, detached=False):
         self.path = path
         # parse index.xml because it tells you the name of the .caml file
-        self.assets = {}
         with open(os.path.join(path, "index.xml"), 'rb') as f:
             self.index = plistlib.load(f, fmt=plistlib.FMT_XML)
             f.close()
 
-        if os.path.exists(os.path.join(path, "assets")):
-            for asset in os.listdir(os.path.join(path, "assets")):
-                with open(os.path.join(path, "assets", asset), "rb") as f:
-                    val = f.read()
-                    self.assets[os.path.basename(f.name)] = val
-                    f.close()
+        # assets are only listed here, their bytes are read when something asks for them
+        self.assets = CAAssets(os.path.join(path, "assets"), use_mmap=use_mmap)
+
+        camlpath = os.path.join(path, self.index["rootDocument"])
+        if streaming is None:
+            streaming = os.path.getsize(camlpath) > self.STREAMING_BYTES
+        if streaming:
+            # large documents: build the layers while parsing and never keep the element tree
+            self.elementTree = None
+            self.root = None
+            self.rootlayer = CAMLLoader().load(camlpath, detached=detached)
+        else:
+            self.elementTree = ET.parse(camlpath)
+            self.root = self.elementTree.getroot()
+            self.rootlayer = CALayer().load(self.root[0], detached=detached)
+            if detached:
+                # nothing in the model points into the tree anymore, let it go
+                self.elementTree = None
+                self.root = None
+        # every layer in the document by id, addlayer/removelayer keep it current
+        self.layerindex = CALayerIndex(self.rootlayer)
+
+        # caml files known to match the model, realpath -> (size, mtime)
+        self._synced = {}
+        self._remember(camlpath)
+
+    def findlayer(self, uniqueid):
+        # unlike rootlayer.findlayer this also finds the root layer itself
+        return self.layerindex.find(uniqueid)
 
-        self.elementTree = ET.parse(
-            os.path.join(path, self.index["rootDocument"]))
-        self.root = self.elementTree.getroot()
-        self.rootlayer = CALayer().load(self.root[0])
+    def changedondisk(self, path=None):
+        # True when the caml of the bundle at path (default: the one we were read from)
+        # was rewritten by something other than write_file since we read or saved it
+        return not self._insync(os.path.join(path or self.path, self.index["rootDocument"]))
 
     def create(self):
         tree = ET.ElementTree()
@@ -35,21 +63,27 @@ class CAFile:
         return tree
 
     def write_file(self, filename, path="./"):
+        # only rewrites what changed, returns the bundle-relative paths that were written/skipped
         capath = os.path.join(path, filename)
+        report = {"written": [], "skipped": []}
         if not os.path.exists(capath):
             os.makedirs(capath)
-        with open(os.path.join(capath, 'index.xml'), 'wb') as f:
-            plistlib.dump(self.index, f, fmt=plistlib.FMT_XML)
-            f.close()
+
+        indexpath = os.path.join(capath, 'index.xml')
+        data = plistlib.dumps(self.index, fmt=plistlib.FMT_XML)
+        if self._hascontents(indexpath, data):
+            report["skipped"].append('index.xml')
+        else:
+            self._writeatomic(indexpath, lambda f: f.write(data))
+            report["written"].append('index.xml')
 
         if len(self.assets) > 0:
             assetspath = os.path.join(capath, "assets")
             if not os.path.exists(assetspath):
                 os.makedirs(assetspath)
-            for asset in self.assets:
-                with open(os.path.join(assetspath, asset), 'wb') as f:
-                    f.write(self.assets[asset])
-                    f.close()
+            written, skipped = self.assets.write(assetspath)
+            report["written"] += [os.path.join("assets", name) for name in written]
+            report["skipped"] += [os.path.join("assets", name) for name in skipped]
 
         # Build XML tree and sanitize None attribute values to avoid serialization errors
         tree = self.create()
@@ -57,4 +91,50 @@ class CAFile:
             for key, val in list(elem.attrib.items()):
                 if val is None:
                     elem.attrib.pop(key)
-        tree.write(os.path.join(capath, self.index['rootDocument']))
+        buffer = io.BytesIO()
+        tree.write(buffer)
+        data = buffer.getvalue()
+
+        # compared byte for byte, so every edit (states, animations, lists changed in place) gets written
+        camlpath = os.path.join(capath, self.index['rootDocument'])
+        if self._hascontents(camlpath, data):
+            report["skipped"].append(self.index['rootDocument'])
+            self._remember(camlpath)
+            return report
+
+        self._writeatomic(camlpath, lambda f: f.write(data))
+        report["written"].append(self.index['rootDocument'])
+
+        # every other copy we knew about is stale now
+        self._synced = {}
+        self._remember(camlpath)
+        return report
+
+    def _remember(self, camlpath):
+        if os.path.exists(camlpath):
+            st = os.stat(camlpath)
+            self._synced[os.path.realpath(camlpath)] = (st.st_size, st.st_mtime_ns)
+
+    def _insync(self, camlpath):
+        if not os.path.exists(camlpath):
+            return False
+        st = os.stat(camlpath)
+        return self._synced.get(os.path.realpath(camlpath)) == (st.st_size, st.st_mtime_ns)
+
+    def _hascontents(self, filepath, data):
+        if not os.path.exists(filepath) or os.path.getsize(filepath) != len(data):
+            return False
+        with open(filepath, 'rb') as f:
+            return f.read() == data
+
+    def _writeatomic(self, filepath, write):
+        # write next to the target and swap it in, so a failed save never leaves a half written file
+        tmppath = filepath + ".tmp"
+        try:
+            with open(tmppath, 'wb') as f:
+                write(f)
+            os.replace(tmppath, filepath)
+        except BaseException:
+            if os.path.exists(tmppath):
+                os.remove(tmppath)
+            raise
@@ -1,6 +1,7 @@
 import xml.etree.ElementTree as ET
 
 from .cgimage import CGImage
+from .caunknown import CAUnknown
 
 from ..state.lkstate import LKState
 from ..state.lkstatetransition import LKStateTransition
@@ -9,8 +10,31 @@ from ..animation.cakeyframeanimation import CAKeyframeAnimation
 from ..animation.camatchmoveanimation import CAMatchMoveAnimation
 
 class CALayer:
+    # attributes/children read by load, everything else ends up in self.unknown
+    ATTRIBUTES = ("id", "name", "position", "bounds", "hidden", "transform", "anchorPoint",
+                  "geometryFlipped", "opacity", "zPosition", "backgroundColor", "cornerRadius")
+    TEXTATTRIBUTES = ("tracking", "leading", "verticalAlignmentMode", "wrapped", "resizingMode",
+                      "allowsEdgeAntialiasing", "allowsGroupOpacity", "contentsFormat", "cornerCurve",
+                      "classIfAvailable")
+    CHILDREN = ("contents", "sublayers", "states", "stateTransitions", "animations")
+    TEXTCHILDREN = ("font", "string")
+    # no __dict__, so anything set on a layer has to be listed here
+    # (that includes the text/scale properties the inspector adds)
+    __slots__ = ("element", "layer_class", "id", "name", "position", "bounds", "hidden", "transform",
+                 "anchorPoint", "geometryFlipped", "opacity", "zPosition", "backgroundColor",
+                 "cornerRadius", "unknown", "content", "_content", "sublayers", "_sublayers",
+                 "_sublayerorder", "states", "_states", "stateTransitions", "_stateTransitions",
+                 "animations", "_animations", "_index", "_parsed",
+                 # CATextLayer
+                 "string", "font", "tracking", "leading", "verticalAlignmentMode", "wrapped",
+                 "resizingMode", "allowsEdgeAntialiasing", "allowsGroupOpacity", "contentsFormat",
+                 "cornerCurve", "classIfAvailable",
+                 # set by the inspector
+                 "fontSize", "fontFamily", "alignmentMode", "color", "scale_factor")
+
     def __init__(self, id="", type="default", name="New Layer"): 
         # create default layer without reading from preexisting
+        self._parsed = {} # property name -> parsed float tuple, see numbers()
         self.layer_class = "CALayer"
         self.id = id
         self.name = name
@@ -24,6 +48,8 @@ class CALayer:
         self.zPosition = None
         self.backgroundColor = "0 0 0" # black
         self.cornerRadius = None
+        self.unknown = None
+        self._index = None # CALayerIndex of the document this layer is in, if any
 
         if self.layer_class == "CALayer":
             self._content = None
@@ -66,7 +92,9 @@ class CALayer:
 
         
 
-    def load(self, element):
+    def load(self, element, sublayers=None, detached=False):
+        # sublayers can be passed in already built (see CAMLLoader), otherwise they are loaded from element
+        # detached layers don't hold on to any xml once they are loaded
         self.element = element
         self.id = self.element.get('id')
         self.name = self.element.get('name')
@@ -103,6 +131,11 @@ class CALayer:
             string_element = self.element.find('{http://www.apple.com/CoreAnimation/1.0}string')
             if string_element is not None:
                 self.string = string_element.get('value')
+
+            self.unknown = CAUnknown(self.element, self.ATTRIBUTES + self.TEXTATTRIBUTES,
+                                     self.CHILDREN + self.TEXTCHILDREN) or None
+        else:
+            self.unknown = CAUnknown(self.element, self.ATTRIBUTES, self.CHILDREN) or None
         
         self._content = self.element.find(
             '{http://www.apple.com/CoreAnimation/1.0}contents')
@@ -114,11 +147,15 @@ class CALayer:
         self._sublayerorder = []
         self._sublayers = self.element.find(
             "{http://www.apple.com/CoreAnimation/1.0}sublayers")
-        if self._sublayers is not None:
+        if sublayers is not None:
+            for new_layer in sublayers:
+                self.sublayers[new_layer.id] = new_layer
+                self._sublayerorder.append(new_layer.id)
+        elif self._sublayers is not None:
             for layer_element in self._sublayers:
                 layer_class_name = layer_element.tag.split('}')[-1] if '}' in layer_element.tag else layer_element.tag
                 if layer_class_name:
-                    new_layer = CALayer().load(layer_element)
+                    new_layer = CALayer().load(layer_element, detached=detached)
                     self.sublayers[new_layer.id] = new_layer
                     self._sublayerorder.append(new_layer.id)
 
@@ -128,6 +165,8 @@ class CALayer:
         if self._states is not None:
             for state in self._states:
                 self.states[state.get("name")] = LKState(state)
+                if detached:
+                    self.states[state.get("name")].detach()
 
         self.stateTransitions = []
         self._stateTransitions = self.element.find(
@@ -135,6 +174,8 @@ class CALayer:
         if self._stateTransitions is not None:
             for transition in self._stateTransitions:
                 self.stateTransitions.append(LKStateTransition(transition))
+                if detached:
+                    self.stateTransitions[-1].detach()
 
         self.animations = []
         self._animations = self.element.find(
@@ -145,16 +186,81 @@ class CALayer:
                     self.animations.append(CAKeyframeAnimation(animation))
                 elif animation.get("type") == "CAMatchMoveAnimation":
                     self.animations.append(CAMatchMoveAnimation(animation))
+                else:
+                    continue
+                if detached:
+                    self.animations[-1].detach()
+
+        if detached:
+            self.detach(recursive=False)
         return self
 
+    def detach(self, recursive=True):
+        # drop every reference into the element tree, only presence is remembered for the optional children
+        self.element = None
+        self._content = None if self._content is None else True
+        self._sublayers = None if getattr(self, '_sublayers', None) is None else True
+        self._states = None if getattr(self, '_states', None) is None else True
+        self._stateTransitions = None if getattr(self, '_stateTransitions', None) is None else True
+        self._animations = None if getattr(self, '_animations', None) is None else True
+        if not recursive:
+            return
+        for state in self.states.values():
+            state.detach()
+        for transition in self.stateTransitions:
+            transition.detach()
+        for animation in self.animations:
+            animation.detach()
+        for sublayer in self.sublayers.values():
+            sublayer.detach()
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        # a new value for a property numbers() has parsed, parse it again on the next read
+        if not name.startswith('_') and name in self._parsed:
+            del self._parsed[name]
+
+    def numbers(self, name, default=None):
+        # a numeric property ("0 0 100 100" or ['0', '0', '100', '100']) as a float tuple
+        # parsed once and cached until the property is assigned again, the strings are still what gets saved
+        # lists changed in place aren't noticed, assign a new list instead
+        if name not in self._parsed:
+            value = getattr(self, name, None)
+            if isinstance(value, str):
+                value = value.split()
+            try:
+                self._parsed[name] = tuple(float(v) for v in value) if value else None
+            except (TypeError, ValueError):
+                self._parsed[name] = None
+        parsed = self._parsed[name]
+        return default if parsed is None else parsed
+
+    def number(self, name, default=None):
+        # first value of numbers(), for single values like opacity or zPosition
+        parsed = self.numbers(name)
+        return default if not parsed else parsed[0]
+
        
     def addlayer(self, layer): # layer = CALayer
         # add a child layer to the current layer
         self.sublayers[layer.id] = layer
         self._sublayerorder.append(layer.id)
+        if self._index is not None:
+            self._index.add(layer, self)
         return self.findlayer(layer.id)
 
     def removelayer(self, layer_id):
+        if self._index is not None:
+            layer = self._index.find(layer_id)
+            parent = self._index.parent(layer_id)
+            if layer is None or parent is None or not (parent is self or self._index.contains(self, parent)):
+                return False
+            del parent.sublayers[layer_id]
+            if layer_id in parent._sublayerorder:
+                parent._sublayerorder.remove(layer_id)
+            self._index.remove(layer)
+            return True
+
         if layer_id in self.sublayers:
             del self.sublayers[layer_id]
             if layer_id in self._sublayerorder:
@@ -169,6 +275,11 @@ class CALayer:
 
     def findlayer(self, uniqueid):
         # must be a unique value or it will return the first instance it finds because im too lazy - retron
+        if self._index is not None:
+            layer = self._index.find(uniqueid)
+            if layer is not None and self._index.contains(self, layer):
+                return layer
+            return None
         for id in self._sublayerorder:
             possiblelayer = self.sublayers.get(id)
             if possiblelayer.id == uniqueid:
@@ -189,6 +300,26 @@ class CALayer:
         # none are found
         return None
 
+    def compare(self, other):
+        # names of what differs from other (normally the same layer loaded again), sublayers are not descended into
+        # "contents"/"sublayers"/"states"/"stateTransitions"/"animations" stand for the children
+        changed = []
+        for name in ("layer_class",) + self.ATTRIBUTES + self.TEXTATTRIBUTES + self.TEXTCHILDREN:
+            if getattr(self, name, None) != getattr(other, name, None):
+                changed.append(name)
+        mine = getattr(self, 'content', None) if self._content is not None else None
+        theirs = getattr(other, 'content', None) if other._content is not None else None
+        if getattr(mine, 'src', None) != getattr(theirs, 'src', None) or (mine is None) != (theirs is None):
+            changed.append("contents")
+        if self._sublayerorder != other._sublayerorder:
+            changed.append("sublayers")
+        for name, mine, theirs in (("states", list(self.states.values()), list(other.states.values())),
+                                   ("stateTransitions", self.stateTransitions, other.stateTransitions),
+                                   ("animations", self.animations, other.animations)):
+            if len(mine) != len(theirs) or [ET.tostring(x.create()) for x in mine] != [ET.tostring(x.create()) for x in theirs]:
+                changed.append(name)
+        return changed
+
     def create(self):
         e = ET.Element(self.layer_class if self.layer_class else 'CALayer')
         e.set('id', self.id)
@@ -263,4 +394,7 @@ class CALayer:
             for animation in self.animations:
                 animations.append(animation.create())
 
+        if self.unknown is not None:
+            self.unknown.write(e)
+
         return e
@@ -0,0 +1,70 @@
+class CALayerIndex:
+    # id -> layer and id -> parent layer for a whole document
+    # kept up to date by CALayer.addlayer/removelayer so lookups don't have to walk the tree
+    def __init__(self, rootlayer=None):
+        self.layers = {}
+        self.parents = {}
+        self.root = rootlayer
+        if rootlayer is not None:
+            self.add(rootlayer)
+
+    def add(self, layer, parent=None):
+        # registers layer and everything under it, layers with an id that is already indexed keep the first one
+        # (same as the old depth first findlayer would have returned)
+        stack = [(layer, parent)]
+        while stack:
+            layer, parent = stack.pop()
+            layer._index = self
+            if layer.id not in self.layers:
+                self.layers[layer.id] = layer
+                self.parents[layer.id] = parent
+            for id in reversed(layer._sublayerorder):
+                stack.append((layer.sublayers[id], layer))
+
+    def remove(self, layer):
+        removed = []
+        stack = [layer]
+        while stack:
+            layer = stack.pop()
+            layer._index = None
+            if self.layers.get(layer.id) is layer:
+                del self.layers[layer.id]
+                del self.parents[layer.id]
+                removed.append(layer.id)
+            stack.extend(layer.sublayers.values())
+        if removed:
+            # another layer may share one of those ids, it is found again like add() would have found it
+            self.reindex(set(removed))
+
+    def reindex(self, ids):
+        # first layer in depth first order for each of ids that is still in the tree
+        stack = [(self.root, None)] if self.root is not None else []
+        while stack and ids:
+            layer, parent = stack.pop()
+            if layer.id in ids:
+                ids.discard(layer.id)
+                self.layers[layer.id] = layer
+                self.parents[layer.id] = parent
+            for id in reversed(layer._sublayerorder):
+                stack.append((layer.sublayers[id], layer))
+
+    def find(self, id):
+        return self.layers.get(id)
+
+    def parent(self, id):
+        return self.parents.get(id)
+
+    def contains(self, ancestor, layer):
+        # True when layer is somewhere below ancestor
+        parent = self.parents.get(layer.id)
+        while parent is not None:
+            if parent is ancestor:
+                return True
+            parent = self.parents.get(parent.id)
+        return False
+
+    def __len__(self):
+        return len(self.layers)
+
+    def __contains__(self, id):
+        return id in self.layers
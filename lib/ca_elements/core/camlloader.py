@@ -0,0 +1,41 @@
+import xml.etree.ElementTree as ET
+
+from .calayer import CALayer
+
+NS = "{http://www.apple.com/CoreAnimation/1.0}"
+
+class CAMLLoader:
+    # builds the CALayer tree in one iterparse pass instead of parsing the whole document first
+    # every layer is built as soon as its closing tag is read and its xml is cleared right after,
+    # so only the layers that are still open are ever held as elements
+    def load(self, source, detached=False):
+        rootlayer = None
+        tags = [] # tags of the elements that are currently open
+        layers = [] # finished sublayers for every layer that is currently open
+
+        for event, elem in ET.iterparse(source, events=("start", "end")):
+            if event == "start":
+                if self.islayer(tags) and rootlayer is None:
+                    layers.append([])
+                tags.append(elem.tag)
+                continue
+
+            tags.pop()
+            if elem.tag == NS + "sublayers":
+                # the layers inside were built already, only empty shells are left
+                elem.clear()
+            elif self.islayer(tags) and rootlayer is None:
+                layer = CALayer().load(elem, sublayers=layers.pop(), detached=detached)
+                elem.clear()
+                if layers:
+                    layers[-1].append(layer)
+                else:
+                    rootlayer = layer
+
+        return rootlayer
+
+    def islayer(self, tags):
+        # layers are the first child of <caml> and anything directly inside <sublayers>
+        if not tags:
+            return False
+        return tags[-1] == NS + "sublayers" or (len(tags) == 1 and tags[0] == NS + "caml")
@@ -1,12 +1,22 @@
 import xml.etree.ElementTree as ET
 
 class CANumber:
-    def __init__(self, element):
+    __slots__ = ("element", "type", "value")
+
+    def __init__(self, element=None, type=None, value=None):
+        # either read from an element or built straight from a type/value pair (see CANumberArray)
         self.element = element
+        if self.element is None:
+            self.type = type
+            self.value = value
+            return
         self.type = self.element.tag.replace(
             "{http://www.apple.com/CoreAnimation/1.0}", "")
         self.value = self.element.get("value")
 
+    def detach(self):
+        self.element = None
+
     def create(self):
         e = ET.Element(self.type)
         e.set("value", self.value)
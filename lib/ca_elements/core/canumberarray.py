@@ -0,0 +1,117 @@
+from array import array
+
+from .canumber import CANumber
+
+class CANumberArray:
+    # a run of <integer>/<real> elements (keyTimes, values) packed into one array('d')
+    # behaves like the list of CANumbers it replaces, items are only built when something asks for them
+    __slots__ = ("numbers", "types", "_text")
+
+    def __init__(self):
+        self.numbers = array('d')
+        self.types = [] # "integer"/"real" per item, these strings are shared
+        self._text = {} # index -> original text, only where formatting the float wouldn't give it back
+
+    def add(self, type, text):
+        # returns False for anything that isn't a plain number, the caller should keep objects then
+        if type not in ("integer", "real") or text is None:
+            return False
+        try:
+            number = float(text)
+        except ValueError:
+            return False
+        if self.format(number) != text:
+            self._text[len(self.numbers)] = text
+        self.numbers.append(number)
+        self.types.append("integer" if type == "integer" else "real")
+        return True
+
+    def format(self, number):
+        text = repr(number)
+        if text.endswith(".0"):
+            text = text[:-2]
+        return text
+
+    def text(self, index):
+        if index in self._text:
+            return self._text[index]
+        return self.format(self.numbers[index])
+
+    def set(self, index, type, text):
+        # the same checks as add(), but a ValueError instead of False since there is no list to fall back to
+        if type not in ("integer", "real") or text is None:
+            raise ValueError(f"not a plain number: {type} {text!r}")
+        number = float(text)
+        self._text.pop(index, None)
+        if self.format(number) != text:
+            self._text[index] = text
+        self.numbers[index] = number
+        self.types[index] = "integer" if type == "integer" else "real"
+
+    def item(self, value):
+        # (type, text) of a CANumber, or of a plain int/float/str
+        if isinstance(value, CANumber):
+            return value.type, value.value
+        if isinstance(value, str):
+            return "real", value
+        return ("integer" if isinstance(value, int) else "real"), self.format(float(value))
+
+    def index(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return index
+
+    def __len__(self):
+        return len(self.numbers)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return CANumberArrayItem(self, self.index(index))
+
+    def __setitem__(self, index, value):
+        self.set(self.index(index), *self.item(value))
+
+    def __delitem__(self, index):
+        index = self.index(index)
+        del self.numbers[index]
+        del self.types[index]
+        self._text = {i - (i > index): text for i, text in self._text.items() if i != index}
+
+    def insert(self, index, value):
+        type, text = self.item(value)
+        index = min(max(index + len(self) if index < 0 else index, 0), len(self))
+        self._text = {i + (i >= index): text for i, text in self._text.items()}
+        self.numbers.insert(index, 0.0)
+        self.types.insert(index, "real")
+        try:
+            self.set(index, type, text)
+        except ValueError:
+            del self[index]
+            raise
+
+    def append(self, value):
+        self.insert(len(self), value)
+
+    def __iter__(self):
+        for i in range(len(self.numbers)):
+            yield self[i]
+
+class CANumberArrayItem(CANumber):
+    # an item of a CANumberArray, assigning its value or type writes through into the array
+    # (indexes aren't followed, an item taken before an insert/delete points at whatever moved into its place)
+    __slots__ = ("array", "index")
+
+    def __init__(self, array, index):
+        object.__setattr__(self, "array", array)
+        object.__setattr__(self, "index", index)
+        super().__init__(type=array.types[index], value=array.text(index))
+
+    def __setattr__(self, name, value):
+        if name in ("type", "value") and getattr(self, name, None) != value and getattr(self, "type", None) is not None:
+            type = value if name == "type" else self.type
+            text = value if name == "value" else self.value
+            self.array.set(self.index, type, text)
+        object.__setattr__(self, name, value)
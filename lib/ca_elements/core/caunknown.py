@@ -0,0 +1,35 @@
+import copy
+
+NS = "{http://www.apple.com/CoreAnimation/1.0}"
+
+class CAUnknown:
+    # attributes and children an element had that the model doesn't read
+    # kept around so writing the document back out doesn't drop them
+    def __init__(self, element, attributes=(), children=()):
+        self.attributes = {}
+        for key, value in element.attrib.items():
+            if key not in attributes:
+                self.attributes[key] = value
+
+        self.children = []
+        for child in element:
+            if child.tag.replace(NS, "") not in children:
+                self.children.append(self.stripnamespace(child))
+
+    def __bool__(self):
+        return bool(self.attributes) or bool(self.children)
+
+    def write(self, e):
+        for key, value in self.attributes.items():
+            if key not in e.attrib:
+                e.set(key, value)
+        for child in self.children:
+            e.append(child)
+
+    def stripnamespace(self, element):
+        # created documents set xmlns on <caml> themselves, namespaced tags would come out as ns0:tag
+        element = copy.deepcopy(element)
+        element.tail = None
+        for elem in element.iter():
+            elem.tag = elem.tag.replace(NS, "")
+        return element
@@ -1,3 +1,17 @@
+import xml.etree.ElementTree as ET
+
 class CGImage:
+    __slots__ = ("src",)
+
     def __init__(self, src):
-        self.src = src
\ No newline at end of file
+        self.src = src
+
+    def detach(self):
+        pass
+
+    def create(self):
+        # as an item of an animation's values (<CGImage src="..."/>), layer contents write their own element
+        e = ET.Element("CGImage")
+        e.set("src", self.src)
+
+        return e
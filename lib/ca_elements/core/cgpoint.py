@@ -1,12 +1,17 @@
 import xml.etree.ElementTree as ET
 
 class CGPoint:
+    __slots__ = ("element", "type", "value")
+
     def __init__(self, element):
         self.element = element
         self.type = self.element.tag.replace(
             "{http://www.apple.com/CoreAnimation/1.0}", "")
         self.value = self.element.get("value")
 
+    def detach(self):
+        self.element = None
+
     def create(self):
         e = ET.Element(self.type)
         e.set("value", self.value)
@@ -4,8 +4,11 @@ from .lkstatesetvalue import LKStateSetValue
 from .lkstateaddanimation import LKStateAddAnimation
 
 class LKState:
+    __slots__ = ("element", "name", "elements", "_elements", "_overrides")
+
     def __init__(self, element):
         self.element = element
+        self._overrides = None
         self.name = self.element.get("name")
 
         self.elements = []
@@ -18,6 +21,32 @@ class LKState:
                 elif element.tag == "{http://www.apple.com/CoreAnimation/1.0}LKStateAddAnimation":
                     self.elements.append(LKStateAddAnimation(element))
 
+    def detach(self):
+        self.element = None
+        for element in self.elements:
+            element.detach()
+        self._elements = None if self._elements is None else True
+
+    def overrides(self):
+        # targetId -> {keyPath: value} for every LKStateSetValue, later elements win
+        # built once and reused until an element is added, removed or replaced, or a LKStateSetValue
+        # in it is edited (those call changed())
+        if self._overrides is None or not self.sameelements(self._overrides[0]):
+            table = {}
+            for element in self.elements:
+                if isinstance(element, LKStateSetValue):
+                    element._state = self
+                    table.setdefault(element.targetId, {})[element.keyPath] = element.value
+            self._overrides = (tuple(self.elements), table)
+        return self._overrides[1]
+
+    def sameelements(self, elements):
+        return len(elements) == len(self.elements) and all(a is b for a, b in zip(elements, self.elements))
+
+    def changed(self):
+        # drops the override table, LKStateSetValue calls this when one of its fields is assigned
+        self._overrides = None
+
     def create(self):
         e = ET.Element('LKState')
         e.set("name", self.name)
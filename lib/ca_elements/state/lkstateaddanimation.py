@@ -4,6 +4,8 @@ from ..animation.cakeyframeanimation import CAKeyframeAnimation
 from ..animation.caspringanimation import CASpringAnimation
 
 class LKStateAddAnimation:
+    __slots__ = ("element", "targetId", "keyPath", "animations", "_animations")
+
     def __init__(self, element):
         self.element = element
         self.targetId = self.element.get("targetId")
@@ -19,6 +21,12 @@ class LKStateAddAnimation:
                 elif animation.get("type") == "CASpringAnimation":
                     self.animations.append(CASpringAnimation(animation))
 
+    def detach(self):
+        self.element = None
+        for animation in self.animations:
+            animation.detach()
+        self._animations = None if self._animations is None else True
+
     def create(self):
         e = ET.Element('LKStateAddAnimation')
         e.set("targetId", self.targetId)
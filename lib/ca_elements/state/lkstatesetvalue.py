@@ -1,13 +1,25 @@
 import xml.etree.ElementTree as ET
 
 class LKStateSetValue:
+    __slots__ = ("element", "targetId", "keyPath", "value", "valueType", "_state")
+
     def __init__(self, element):
+        self._state = None # the LKState whose overrides() table lists this, see __setattr__
         self.element = element
         self.targetId = self.element.get("targetId")
         self.keyPath = self.element.get("keyPath")
         self.value = self.element[0].get("value")
         self.valueType = self.element[0].get("type")
 
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        # the state's override table has the old target/keyPath/value in it
+        if name in ("targetId", "keyPath", "value") and getattr(self, "_state", None) is not None:
+            self._state.changed()
+
+    def detach(self):
+        self.element = None
+
     def create(self):
         e = ET.Element('LKStateSetValue')
         e.set("targetId", self.targetId)
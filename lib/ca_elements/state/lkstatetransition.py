@@ -3,6 +3,8 @@ import xml.etree.ElementTree as ET
 from .lkstatetransitionelement import LKStateTransitionElement
 
 class LKStateTransition:
+    __slots__ = ("element", "fromState", "toState", "elements", "_elements")
+
     def __init__(self, element):
         self.element = element
         self.fromState = self.element.get("fromState")
@@ -15,6 +17,12 @@ class LKStateTransition:
             for element in self._elements:
                 self.elements.append(LKStateTransitionElement(element))
 
+    def detach(self):
+        self.element = None
+        for element in self.elements:
+            element.detach()
+        self._elements = None if self._elements is None else True
+
     def create(self):
         e = ET.Element('LKStateTransition')
         e.set("fromState", self.fromState)
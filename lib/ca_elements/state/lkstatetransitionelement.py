@@ -3,6 +3,8 @@ import xml.etree.ElementTree as ET
 from ..animation.caspringanimation import CASpringAnimation
 
 class LKStateTransitionElement:
+    __slots__ = ("element", "key", "targetId", "animations", "_animations")
+
     def __init__(self, element):
         self.element = element
         self.key = self.element.get("key")
@@ -16,6 +18,12 @@ class LKStateTransitionElement:
                 if animation.get("type") == "CASpringAnimation":
                     self.animations.append(CASpringAnimation(animation))
 
+    def detach(self):
+        self.element = None
+        for animation in self.animations:
+            animation.detach()
+        self._animations = None if self._animations is None else True
+
     def create(self):
         e = ET.Element('LKStateTransitionElement')
         e.set("key", self.key)
@@ -0,0 +1,44 @@
+import random
+import timeit
+
+from lib.ca_elements.core import CALayer, CALayerIndex
+
+# run from the repo root: python -m lib.main.bench_findlayer
+
+def buildtree(count, fanout):
+    # count layers, breadth first with fanout children per layer
+    root = CALayer(id="root", name="root")
+    layers = [root]
+    for i in range(1, count):
+        parent = layers[(i - 1) // fanout]
+        layer = CALayer(id=f"layer{i}", name=f"layer{i}")
+        parent.addlayer(layer)
+        layers.append(layer)
+    return root, [layer.id for layer in layers[1:]]
+
+def scan(layer, uniqueid):
+    # the depth first search findlayer does without an index
+    for id in layer._sublayerorder:
+        sublayer = layer.sublayers[id]
+        if sublayer.id == uniqueid:
+            return sublayer
+        found = scan(sublayer, uniqueid)
+        if found is not None:
+            return found
+    return None
+
+if __name__ == "__main__":
+    random.seed(0)
+    for count, fanout in ((10000, 2), (10000, 20)):
+        root, ids = buildtree(count, fanout)
+        lookups = random.sample(ids, 200)
+
+        recursive = timeit.timeit(lambda: [scan(root, id) for id in lookups], number=5) / (5 * len(lookups))
+        index = CALayerIndex(root)
+        indexed = timeit.timeit(lambda: [root.findlayer(id) for id in lookups], number=5) / (5 * len(lookups))
+        direct = timeit.timeit(lambda: [index.find(id) for id in lookups], number=5) / (5 * len(lookups))
+
+        print(f"{count} layers, {fanout} sublayers each:")
+        print(f"  recursive findlayer  {recursive * 1e6:10.2f} us/lookup")
+        print(f"  indexed findlayer    {indexed * 1e6:10.2f} us/lookup")
+        print(f"  CALayerIndex.find    {direct * 1e6:10.2f} us/lookup")
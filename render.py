@@ -0,0 +1,10 @@
+import os
+import sys
+
+# no display needed, has to be set before qt is imported
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from gui.headless_renderer import main
+
+if __name__ == "__main__":
+    sys.exit(main())
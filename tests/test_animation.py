@@ -0,0 +1,178 @@
+import math
+import xml.etree.ElementTree as ET
+
+import pytest
+
+import lib.ca_elements.core # the model has to be loaded before the animations can be
+from lib.ca_elements.animation import (CAAnimationEvaluator, CAKeyframeAnimation, CAKeyframeTrack,
+                                       CASpringAnimation, CASpringSolver, CATimingFunction)
+
+NS = "http://www.apple.com/CoreAnimation/1.0"
+
+def keyframes(values, keyTimes=None, **attributes):
+    # a CAKeyframeAnimation the way the caml loader builds one
+    element = ET.Element(f"{{{NS}}}animation", {"type": "CAKeyframeAnimation", "keyPath": "opacity", **attributes})
+    for tag, numbers in (("keyTimes", keyTimes), ("values", values)):
+        if numbers is not None:
+            child = ET.SubElement(element, f"{{{NS}}}{tag}")
+            for number in numbers:
+                ET.SubElement(child, f"{{{NS}}}real", {"value": str(number)})
+    return CAKeyframeAnimation(element)
+
+def spring(**attributes):
+    return CASpringAnimation(ET.Element(f"{{{NS}}}animation", {"type": "CASpringAnimation", "keyPath": "opacity", **attributes}))
+
+# runs from 1s to 3s and holds its values outside of that, so key time k is at 1 + 2k
+HELD = {"beginTime": "1", "duration": "2", "fillMode": "both", "removedOnCompletion": "0"}
+
+@pytest.mark.parametrize("mode", ["linear", "cubic", "discrete"])
+def test_keyframes_hit_their_values_at_the_key_times(mode):
+    values = [0, 1, 4, 4]
+    keyTimes = [0, 0.25, 0.75, 1]
+    track = CAKeyframeTrack(keyframes(values, keyTimes, calculationMode=mode, **HELD))
+    for keyTime, value in zip(keyTimes, values):
+        assert track.valueat(1 + 2 * keyTime) == pytest.approx(value)
+    assert track.valueat(0) == 0
+    assert track.valueat(10) == 4
+
+def test_linear_keyframes_interpolate_within_their_segment():
+    track = CAKeyframeTrack(keyframes([0, 1, 4, 4], [0, 0.25, 0.75, 1], **HELD))
+    assert track.valueat(1 + 2 * 0.125) == pytest.approx(0.5)
+    assert track.valueat(1 + 2 * 0.5) == pytest.approx(2.5)
+    assert track.valueat(1 + 2 * 0.875) == pytest.approx(4)
+
+def test_discrete_keyframes_hold_until_the_next_key_time():
+    track = CAKeyframeTrack(keyframes([0, 1, 4, 4], [0, 0.25, 0.75, 1], calculationMode="discrete", **HELD))
+    assert track.valueat(1 + 2 * 0.2) == 0
+    assert track.valueat(1 + 2 * 0.7) == 1
+
+def test_cubic_keyframes_follow_the_catmull_rom_spline():
+    # halfway through a segment the spline is (-p0 + 9 p1 + 9 p2 - p3) / 16, the ends repeat the first/last value
+    values = [0, 1, 4, 4]
+    track = CAKeyframeTrack(keyframes(values, [0, 0.25, 0.75, 1], calculationMode="cubic", **HELD))
+    assert track.valueat(1 + 2 * 0.125) == pytest.approx((-0 + 9 * 0 + 9 * 1 - 4) / 16)
+    assert track.valueat(1 + 2 * 0.5) == pytest.approx((-0 + 9 * 1 + 9 * 4 - 4) / 16)
+    assert track.valueat(1 + 2 * 0.875) == pytest.approx((-1 + 9 * 4 + 9 * 4 - 4) / 16)
+
+def test_keyframes_without_key_times_are_spread_evenly():
+    track = CAKeyframeTrack(keyframes([0, 10, 30], **HELD))
+    assert track.keyTimes == [0, 0.5, 1]
+    assert track.valueat(1 + 2 * 0.75) == pytest.approx(20)
+
+def test_repeats_start_over_and_cumulative_ones_add_up():
+    track = CAKeyframeTrack(keyframes([0, 10], duration="1", repeatCount="3"))
+    assert track.valueat(1.5) == pytest.approx(5)
+    track = CAKeyframeTrack(keyframes([0, 10], duration="1", repeatCount="3", cumulative="1"))
+    assert track.valueat(2.5) == pytest.approx(25)
+    assert track.valueat(3) is None
+
+def test_evaluator_leaves_out_animations_without_effect():
+    evaluator = CAAnimationEvaluator()
+    evaluator.add("a", keyframes([0, 1], beginTime="1", duration="1"))
+    evaluator.add("b", keyframes([2, 4], **HELD), "position.x")
+    assert evaluator.evaluate(0) == {"b": {"position.x": 2}}
+    assert evaluator.evaluate(1.5) == {"a": {"opacity": 0.5}, "b": {"position.x": 2.5}}
+    assert evaluator.evaluatemany([0, 1.5]) == {"a": {"opacity": [None, 0.5]}, "b": {"position.x": [2, 2.5]}}
+    assert evaluator.duration() == 3
+
+# underdamped (the defaults), critically damped, overdamped (what test2.ca uses) and thrown the other way
+SPRINGS = [{}, {"damping": "20"}, {"damping": "50", "mass": "2", "stiffness": "300"}, {"velocity": "-5"}]
+
+@pytest.mark.parametrize("attributes", SPRINGS)
+def test_spring_settles_at_its_settling_duration(attributes):
+    solver = CASpringSolver(spring(**attributes))
+    settled = solver.settlingDuration
+    assert 0 < settled < CASpringSolver.MAX_SETTLING
+    assert solver.valueat(0) == 0 and solver.progress(0) == pytest.approx(0)
+    # within EPSILON of toValue from the settling duration on, not one sample earlier
+    assert abs(1 - solver.progress(settled - 1 / CASpringSolver.RATE)) > CASpringSolver.EPSILON
+    for i in range(200):
+        assert abs(1 - solver.progress(settled + i / 50)) <= CASpringSolver.EPSILON
+    assert solver.valueat(settled + 1 / CASpringSolver.RATE) == 1
+
+@pytest.mark.parametrize("attributes", SPRINGS)
+def test_spring_table_matches_the_closed_form(attributes):
+    solver = CASpringSolver(spring(**attributes))
+    for i in range(int(solver.settlingDuration * 100)):
+        assert solver.valueat(i / 100) == pytest.approx(solver.progress(i / 100), abs=1e-3)
+
+def test_underdamped_spring_overshoots_by_the_textbook_amount():
+    # mass 1, stiffness 100, damping 10: w0 = 10, zeta = 0.5, first peak at pi / wd
+    solver = CASpringSolver(spring())
+    wd = 10 * math.sqrt(1 - 0.5 ** 2)
+    peak = 1 + math.exp(-0.5 * math.pi / math.sqrt(1 - 0.5 ** 2))
+    assert solver.progress(math.pi / wd) == pytest.approx(peak)
+    assert solver.valueat(math.pi / wd) == pytest.approx(peak, abs=1e-4)
+    # the envelope decays as exp(-zeta w0 t), so it has settled by the time that drops below EPSILON
+    assert solver.settlingDuration <= math.log(math.sqrt(1 + 1 / 3) / CASpringSolver.EPSILON) / 5
+
+def test_critically_damped_spring_never_overshoots():
+    solver = CASpringSolver(spring(damping="20"))
+    for i in range(1, 200):
+        t = i / 100
+        assert solver.progress(t) == pytest.approx(1 - math.exp(-10 * t) * (1 + 10 * t))
+        assert solver.valueat(t) <= 1
+
+def test_spring_runs_for_its_settling_duration_when_recalculated():
+    solver = CASpringSolver(spring(duration="0.8", mica_autorecalculatesDuration="1", repeatCount="2"))
+    assert solver.timing.duration == solver.settlingDuration
+    assert solver.timing.active == 2 * solver.settlingDuration
+    assert CASpringSolver(spring(duration="0.8")).timing.duration == 0.8
+    assert CASpringSolver(spring()).timing.duration == solver.settlingDuration
+
+def test_spring_track_goes_between_the_state_values():
+    evaluator = CAAnimationEvaluator()
+    evaluator.add("a", spring(duration="0.8", beginTime="1"), "position", (0.0, 10.0), (100.0, 30.0))
+    assert evaluator.evaluate(0) == {"a": {"position": (0.0, 10.0)}}
+    x, y = evaluator.evaluate(1.4)["a"]["position"]
+    fraction = CASpringSolver(spring()).valueat(0.4)
+    assert (x, y) == pytest.approx((100 * fraction, 10 + 20 * fraction))
+    assert evaluator.evaluate(2) == {"a": {"position": (100.0, 30.0)}}
+
+def midpoint(controlPoints):
+    # the curve at parameter 0.5: 3/8 of each control point plus 1/8 of the end point
+    x1, y1, x2, y2 = controlPoints
+    return 0.375 * (x1 + x2) + 0.125, 0.375 * (y1 + y2) + 0.125
+
+@pytest.mark.parametrize("name", sorted(CATimingFunction.NAMED))
+def test_timing_function_table_matches_the_bezier(name):
+    function = CATimingFunction.parse(name)
+    assert function.valueat(0) == 0 and function.valueat(1) == 1
+    x, y = midpoint(CATimingFunction.NAMED[name])
+    assert function.valueat(x) == pytest.approx(y, abs=1e-5)
+    previous = 0
+    for i in range(1, 101):
+        value = function.valueat(i / 100)
+        assert value >= previous
+        previous = value
+
+def test_ease_in_ease_out_is_symmetric():
+    function = CATimingFunction.parse("easeInEaseOut")
+    assert function.valueat(0.5) == pytest.approx(0.5)
+    for i in range(1, 50):
+        assert function.valueat(i / 100) + function.valueat(1 - i / 100) == pytest.approx(1, abs=1e-5)
+
+def test_control_points_share_the_named_table():
+    named = CATimingFunction.parse("easeIn")
+    points = CATimingFunction.parse("0.42 0 1 1")
+    assert points.table is named.table
+    assert CATimingFunction.parse("linear").table is None
+    assert CATimingFunction.parse("0.3 0.3 0.6 0.6").valueat(0.37) == 0.37
+
+def test_timing_function_overshoot_and_bad_values():
+    # y may leave 0...1 (back easing), x is clamped to keep the curve a function of time
+    function = CATimingFunction.parse("0.5 -0.5 0.5 1.5")
+    x, y = midpoint((0.5, -0.5, 0.5, 1.5))
+    assert function.valueat(x) == pytest.approx(y, abs=1e-5)
+    assert min(function.valueat(i / 100) for i in range(101)) < 0
+    assert CATimingFunction.parse("-1 0 2 1").controlPoints == (0, 0, 1, 1)
+    assert CATimingFunction.parse("bogus") is None
+    assert CATimingFunction.parse("0 0 1") is None
+
+def test_timing_function_eases_the_keyframes():
+    track = CAKeyframeTrack(keyframes([0, 10], timingFunction="easeIn", **HELD))
+    function = CATimingFunction.parse("easeIn")
+    x, y = midpoint(CATimingFunction.NAMED["easeIn"])
+    assert track.valueat(1 + 2 * x) == pytest.approx(10 * y, abs=1e-4)
+    assert track.valueat(2) == pytest.approx(10 * function.valueat(0.5))
+    assert track.valueat(1) == 0 and track.valueat(3) == 10
@@ -0,0 +1,96 @@
+import os
+import plistlib
+import shutil
+
+import pytest
+
+from lib.ca_elements.core import CAFile
+
+MAIN = os.path.join(os.path.dirname(__file__), os.pardir, "lib", "main")
+BUNDLE = os.path.join(MAIN, "test2.ca")
+BUNDLES = [os.path.join(MAIN, name) for name in ("test.ca", "test2.ca", "test3.ca")]
+
+def setvalue(cafile, targetId, keyPath):
+    for state in cafile.rootlayer.states.values():
+        for element in state.elements:
+            if element.__class__.__name__ == "LKStateSetValue" and (element.targetId, element.keyPath) == (targetId, keyPath):
+                return element
+    return None
+
+def test_state_edit_is_saved(tmp_path):
+    path = str(tmp_path / "test2.ca")
+    shutil.copytree(BUNDLE, path)
+
+    cafile = CAFile(path)
+    setvalue(cafile, "#1", "opacity").value = "0.25"
+    report = cafile.write_file("test2.ca", str(tmp_path))
+    assert "main.caml" in report["written"]
+
+    assert setvalue(CAFile(path), "#1", "opacity").value == "0.25"
+
+def test_unchanged_document_is_skipped(tmp_path):
+    path = str(tmp_path / "test2.ca")
+    shutil.copytree(BUNDLE, path)
+
+    cafile = CAFile(path)
+    cafile.write_file("test2.ca", str(tmp_path))
+    report = cafile.write_file("test2.ca", str(tmp_path))
+    assert "main.caml" in report["skipped"]
+
+def saved(cafile, folder):
+    cafile.write_file("saved.ca", str(folder))
+    with open(os.path.join(str(folder), "saved.ca", cafile.index["rootDocument"]), "rb") as f:
+        return f.read()
+
+@pytest.mark.parametrize("bundle", BUNDLES)
+def test_streaming_load_saves_the_same_bytes(tmp_path, bundle):
+    expected = saved(CAFile(bundle, streaming=False), tmp_path / "default")
+    cafile = CAFile(bundle, streaming=True)
+    assert cafile.elementTree is None
+    assert saved(cafile, tmp_path / "streaming") == expected
+
+def test_large_files_are_streamed(tmp_path, monkeypatch):
+    assert CAFile(BUNDLE).elementTree is not None
+    monkeypatch.setattr(CAFile, "STREAMING_BYTES", 0)
+    cafile = CAFile(BUNDLE)
+    assert cafile.elementTree is None
+    assert saved(cafile, tmp_path / "streamed") == saved(CAFile(BUNDLE, streaming=False), tmp_path / "default")
+
+# what the model doesn't read is written back after what it does: masksToBounds, cornerCurve on a
+# plain layer, <scriptComponents> and the animation's key (which ends up before calculationMode)
+UNKNOWN_CAML = (
+    '<caml xmlns="http://www.apple.com/CoreAnimation/1.0"><CALayer id="#1" name="Root" bounds="0 0 100 100" '
+    'position="50 50" masksToBounds="1"><sublayers><CALayer id="a" name="A" bounds="0 0 10 10" position="5 5" '
+    'cornerCurve="circular"><animations><animation type="CAKeyframeAnimation" keyPath="opacity" duration="2" '
+    'calculationMode="linear" key="fade"><keyTimes><real value="0"/><real value="1"/></keyTimes><values>'
+    '<real value="0"/><real value="1"/></values></animation></animations></CALayer></sublayers>'
+    '<scriptComponents/></CALayer></caml>'
+)
+UNKNOWN_SAVED = (
+    b'<caml xmlns="http://www.apple.com/CoreAnimation/1.0"><CALayer id="#1" name="Root" position="50 50" '
+    b'bounds="0 0 100 100" masksToBounds="1"><sublayers><CALayer id="a" name="A" position="5 5" '
+    b'bounds="0 0 10 10" cornerCurve="circular"><animations><animation type="CAKeyframeAnimation" '
+    b'keyPath="opacity" duration="2" key="fade" calculationMode="linear"><keyTimes><real value="0" />'
+    b'<real value="1" /></keyTimes><values><real value="0" /><real value="1" /></values></animation>'
+    b'</animations></CALayer></sublayers><scriptComponents /></CALayer></caml>'
+)
+
+@pytest.mark.parametrize("options", [{}, {"detached": True}, {"streaming": True}, {"streaming": True, "detached": True}])
+def test_unknown_attributes_and_children_are_saved(tmp_path, options):
+    path = tmp_path / "unknown.ca"
+    path.mkdir()
+    (path / "index.xml").write_bytes(plistlib.dumps({"rootDocument": "main.caml"}, fmt=plistlib.FMT_XML))
+    (path / "main.caml").write_text(UNKNOWN_CAML, encoding="utf-8")
+
+    assert saved(CAFile(str(path), **options), tmp_path / "saved") == UNKNOWN_SAVED
+
+@pytest.mark.parametrize("bundle", BUNDLES)
+def test_detached_load_keeps_no_xml_and_saves_the_same_bytes(tmp_path, bundle):
+    expected = saved(CAFile(bundle), tmp_path / "default")
+    cafile = CAFile(bundle, detached=True)
+    assert cafile.elementTree is None
+    for layer in cafile.layerindex.layers.values():
+        assert layer.element is None
+        assert all(animation.element is None for animation in layer.animations)
+        assert all(state.element is None for state in layer.states.values())
+    assert saved(cafile, tmp_path / "detached") == expected
@@ -0,0 +1,62 @@
+import os
+import time
+
+import pytest
+
+pytest.importorskip("PySide6")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+
+from gui._assets import Assets
+from gui._imageloader import ImageLoader
+
+BUNDLE = os.path.join(os.path.dirname(__file__), os.pardir, "lib", "main", "test2.ca")
+SRCS = ["assets/83593.png", "assets/1810440.jpg", "assets/KANYE WEST.png"]
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+def wait(app, loader, seconds=10.0):
+    deadline = time.monotonic() + seconds
+    while loader.pending and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+
+def test_reset_leaves_other_loaders_queued(app):
+    assets = Assets()
+    assets.cafilepath = BUNDLE
+    loader = ImageLoader(assets)
+    frames = ImageLoader(assets)
+    decoded = []
+    frames.decoded.connect(lambda src, level, image: decoded.append((src, level, image.isNull())))
+
+    wanted = {(src, level) for src in SRCS for level in range(4)}
+    for src, level in sorted(wanted):
+        assert frames.request(src, level)
+    loader.request(SRCS[0], 0)
+    loader.reset()
+
+    wait(app, frames)
+    assert frames.pending == set()
+    assert {(src, level) for src, level, _ in decoded} == wanted
+    assert not any(null for _, _, null in decoded)
+
+def test_reset_forgets_its_queued_decodes(app):
+    assets = Assets()
+    assets.cafilepath = BUNDLE
+    loader = ImageLoader(assets)
+    decoded = []
+    loader.decoded.connect(lambda src, level, image: decoded.append((src, level)))
+
+    for level in range(4):
+        loader.request(SRCS[0], level)
+    loader.reset()
+    assert loader.pending == set()
+    # asked for again after the reset, so it is decoded even though a decode from before may still be running
+    assert loader.request(SRCS[0], 0)
+    wait(app, loader)
+    loader.pool.waitForDone()
+    app.processEvents()
+    assert decoded == [(SRCS[0], 0)]
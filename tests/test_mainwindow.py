@@ -0,0 +1,76 @@
+import os
+import re
+import shutil
+
+import pytest
+
+pytest.importorskip("PySide6")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QTranslator
+from PySide6.QtWidgets import QApplication, QTreeWidgetItem, QTreeWidgetItemIterator
+
+BUNDLE = os.path.join(os.path.dirname(__file__), os.pardir, "lib", "main", "test2.ca")
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+@pytest.fixture
+def window(app, tmp_path, monkeypatch):
+    # the config (and the image cache it points at) goes to a home of its own
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    from gui.config_manager import ConfigManager
+    from gui.mainwindow import MainWindow
+    path = str(tmp_path / "test2.ca")
+    shutil.copytree(BUNDLE, path)
+    window = MainWindow(ConfigManager(), QTranslator())
+    window.cafilepath = path
+    window.open_ca_file(path)
+    yield window
+    window.deleteLater()
+
+def row(tree, kind):
+    iterator = QTreeWidgetItemIterator(tree)
+    while iterator.value():
+        if iterator.value().text(1) == kind:
+            return iterator.value()
+        iterator += 1
+    return None
+
+def inspectanimation(window):
+    # what selecting the layer's position animation row does
+    window.openInInspector(QTreeWidgetItem(["position", "Animation", "", "KANYE WEST"]), None)
+    return window.currentInspectObject
+
+def test_reload_looks_the_inspected_animation_up_again(window):
+    old = inspectanimation(window)
+    assert old is window.cafile.findlayer("KANYE WEST").findanimation("position")
+
+    window.reloadCaml()
+    assert window.currentInspectObject is window.cafile.findlayer("KANYE WEST").findanimation("position")
+    assert window.currentInspectObject is not old
+    assert window.ui.tableWidget.rowCount() > 0
+
+def test_reload_clears_an_animation_that_is_gone(window):
+    inspectanimation(window)
+    camlpath = os.path.join(window.cafilepath, "main.caml")
+    with open(camlpath, encoding="utf-8") as f:
+        caml = f.read()
+    caml = re.sub(r'<animation type="CAMatchMoveAnimation".*?</animation>', "", caml, flags=re.S)
+    with open(camlpath, "w", encoding="utf-8") as f:
+        f.write(caml)
+
+    window.reloadCaml()
+    assert window.currentInspectObject is None
+    assert window.ui.tableWidget.rowCount() == 0
+
+def test_reload_selects_the_same_state_row(window):
+    tree = window.ui.statesTreeWidget
+    item = row(tree, "SetValue")
+    tree.setCurrentItem(item)
+    path = window.treeItemPath(item)
+
+    window.reloadCaml()
+    assert tree.currentItem() is not None and tree.currentItem() is not item
+    assert window.treeItemPath(tree.currentItem()) == path
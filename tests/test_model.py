@@ -0,0 +1,125 @@
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from lib.ca_elements.core import CALayer, CALayerIndex, CANumber, CANumberArray
+from lib.ca_elements.animation import CAKeyframeAnimation
+
+def numbers(*items):
+    array = CANumberArray()
+    for type, text in items:
+        assert array.add(type, text)
+    return array
+
+def saved(array):
+    return [(e.tag, e.get("value")) for e in (item.create() for item in array)]
+
+def test_number_array_items_write_through():
+    array = numbers(("real", "0"), ("real", "0.50"), ("integer", "1"))
+    item = array[1]
+    item.value = "0.75"
+    assert array.numbers[1] == 0.75
+    assert array[1].value == "0.75"
+    array[-1].type = "real"
+    assert array.types[2] == "real"
+    # an item taken earlier reads what it had, a new one what was written
+    array[0].value = "1e-3"
+    assert item.value == "0.75" and array[0].value == "1e-3" and array.numbers[0] == 0.001
+    assert saved(array) == [("real", "1e-3"), ("real", "0.75"), ("real", "1")]
+
+def test_number_array_keeps_the_text_it_was_given():
+    array = numbers(("real", "0.50"), ("real", "1"), ("integer", "2"))
+    assert saved(array) == [("real", "0.50"), ("real", "1"), ("integer", "2")]
+    array[0] = 0.5
+    assert array[0].value == "0.5"
+    array[1] = CANumber(type="real", value="1.000")
+    assert saved(array) == [("real", "0.5"), ("real", "1.000"), ("integer", "2")]
+
+def test_number_array_rejects_what_is_not_a_number():
+    array = numbers(("real", "0"), ("real", "1"))
+    with pytest.raises(ValueError):
+        array[0].value = "abc"
+    with pytest.raises(ValueError):
+        array[1] = CANumber(type="CGPoint", value="0 0")
+    with pytest.raises(ValueError):
+        array.append("abc")
+    assert list(array.numbers) == [0, 1] and array.types == ["real", "real"] and len(array) == 2
+
+def test_number_array_insert_and_delete_move_the_text_along():
+    array = numbers(("real", "0.0"), ("real", "1.50"), ("real", "2"))
+    array.insert(0, "-1.0")
+    array.insert(-1, 1.75)
+    del array[2]
+    array.append(3)
+    assert list(array.numbers) == [-1, 0, 1.75, 2, 3]
+    assert saved(array) == [("real", "-1.0"), ("real", "0.0"), ("real", "1.75"), ("real", "2"), ("integer", "3")]
+    with pytest.raises(IndexError):
+        array[5]
+    assert [item.value for item in array[1:3]] == ["0.0", "1.75"]
+
+def test_keyframe_edits_are_saved():
+    ns = "http://www.apple.com/CoreAnimation/1.0"
+    element = ET.fromstring(f'<animation xmlns="{ns}" type="CAKeyframeAnimation" keyPath="opacity">'
+                            '<keyTimes><real value="0"/><real value="1"/></keyTimes>'
+                            '<values><real value="0"/><integer value="1"/></values></animation>')
+    animation = CAKeyframeAnimation(element)
+    animation.keyTimes[1].value = "0.5"
+    animation.values[0].value = "0.25"
+    e = animation.create()
+    assert [k.get("value") for k in e.find("keyTimes")] == ["0", "0.5"]
+    assert [(v.tag, v.get("value")) for v in e.find("values")] == [("real", "0.25"), ("integer", "1")]
+
+def tree():
+    # root -> a -> (b -> dup, c), dup; the first dup in depth first order is the one under b
+    root = CALayer("root")
+    a, b, c = CALayer("a"), CALayer("b"), CALayer("c")
+    inner, outer = CALayer("dup", name="inner"), CALayer("dup", name="outer")
+    b.addlayer(inner)
+    a.addlayer(b)
+    a.addlayer(c)
+    root.addlayer(a)
+    root.addlayer(outer)
+    return root, a, b, c, inner, outer
+
+def test_layer_index_finds_the_first_of_duplicate_ids():
+    root, a, b, c, inner, outer = tree()
+    index = CALayerIndex(root)
+    assert len(index) == 5
+    assert index.find("dup") is inner and index.parent("dup") is b
+    assert index.contains(root, inner) and index.contains(a, inner) and not index.contains(c, inner)
+    assert root.findlayer("dup") is inner
+    assert a.findlayer("dup") is inner and c.findlayer("dup") is None
+
+def test_layer_index_forgets_a_removed_subtree():
+    root, a, b, c, inner, outer = tree()
+    index = CALayerIndex(root)
+    assert root.removelayer("a")
+    assert "a" not in index and "b" not in index and "c" not in index
+    # the duplicate that was hidden behind the removed one is found now
+    assert index.find("dup") is outer and index.parent("dup") is root
+    assert len(index) == 2
+    assert inner._index is None and b._index is None
+    assert not root.removelayer("b")
+
+def test_layer_index_removes_duplicate_ids_one_at_a_time():
+    root, a, b, c, inner, outer = tree()
+    index = CALayerIndex(root)
+    assert root.removelayer("dup")
+    assert "dup" not in b.sublayers and "dup" in root.sublayers
+    assert index.find("dup") is outer and index.parent("dup") is root
+    assert root.removelayer("dup")
+    assert "dup" not in index and "dup" not in root.sublayers
+    assert not root.removelayer("dup")
+
+def test_layer_index_picks_up_added_subtrees():
+    root, a, b, c, inner, outer = tree()
+    index = CALayerIndex(root)
+    d, e, dup = CALayer("d"), CALayer("e"), CALayer("dup")
+    d.addlayer(e)
+    d.addlayer(dup)
+    c.addlayer(d)
+    assert index.find("e") is e and index.parent("e") is d
+    assert index.contains(a, e) and not index.contains(b, e)
+    assert index.find("dup") is inner
+    assert not c.removelayer("b")
+    assert a.removelayer("e") and "e" not in index and "e" not in d.sublayers
@@ -0,0 +1,93 @@
+import os
+import time
+
+import pytest
+
+pytest.importorskip("PySide6")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QPointF
+from PySide6.QtWidgets import QApplication
+
+from gui._framesequence import FrameSequence
+from gui.headless_renderer import HeadlessRenderer
+
+BUNDLE = os.path.join(os.path.dirname(__file__), os.pardir, "lib", "main", "test2.ca")
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+def imagelayer(renderer):
+    for layer in renderer.cafile.layerindex.layers.values():
+        if getattr(layer, 'name', None) == "KANYE WEST":
+            return layer
+    return None
+
+def store(renderer, layer):
+    # what MainWindow.onItemMoved does
+    for key, value in renderer.preview.edited_values(layer, renderer.preview.items[layer.id]).items():
+        setattr(layer, key, value)
+
+# below 1 the pixmap comes from a smaller mip level, so the item's transform carries a fit scale
+@pytest.mark.parametrize("scale", [1.0, 0.25])
+def test_dragged_image_keeps_its_size(app, scale):
+    renderer = HeadlessRenderer(scale=scale)
+    renderer.open(BUNDLE)
+    renderer.show_state()
+    layer = imagelayer(renderer)
+    transform = layer.transform
+    before = renderer.preview.items[layer.id].sceneBoundingRect()
+
+    for step in range(1, 4):
+        item = renderer.preview.items[layer.id]
+        item.setPos(item.pos() + QPointF(30, 20))
+        store(renderer, layer)
+        renderer.show_state()
+        after = renderer.preview.items[layer.id].sceneBoundingRect()
+        assert after.size() == before.size()
+        assert after.topLeft() == before.topLeft() + QPointF(30, 20) * step
+    assert layer.transform == transform
+
+@pytest.mark.parametrize("scale", [1.0, 0.25])
+def test_rotated_image_stays_put(app, scale):
+    renderer = HeadlessRenderer(scale=scale)
+    renderer.open(BUNDLE)
+    renderer.show_state()
+    layer = imagelayer(renderer)
+    item = renderer.preview.items[layer.id]
+    center = item.boundingRect().center()
+    rotated = item.transform().translate(center.x(), center.y()).rotate(30).translate(-center.x(), -center.y())
+    item.setTransform(rotated)
+    expected = item.sceneBoundingRect()
+
+    for _ in range(3):
+        store(renderer, layer)
+        renderer.show_state()
+        after = renderer.preview.items[layer.id].sceneBoundingRect()
+        assert abs(after.width() - expected.width()) < 1e-6
+        assert abs(after.height() - expected.height()) < 1e-6
+        assert abs(after.x() - expected.x()) < 1e-6 and abs(after.y() - expected.y()) < 1e-6
+
+def test_frames_decode_after_reopening(app):
+    renderer = HeadlessRenderer()
+    renderer.open(BUNDLE)
+    renderer.show_state()
+    preview = renderer.preview
+    preview.sync_frames = False
+    srcs = ["assets/83593.png", "assets/1810440.jpg", "assets/KANYE WEST.png"]
+
+    preview.sequences["frames"] = FrameSequence(srcs, preview.request_frame, 1, 2)
+    preview.sequences["frames"].show(srcs[0])
+    # reopened while the sequence was still prefetching
+    preview.reset_loaders()
+    assert preview.sequences == {} and preview.frame_loader.pending == set()
+
+    sequence = FrameSequence(srcs, preview.request_frame, 1, 2)
+    preview.sequences["frames"] = sequence
+    sequence.show(srcs[0])
+    deadline = time.monotonic() + 10
+    while len(sequence.frames) < len(srcs) and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+    assert set(sequence.frames) == set(srcs)